@@ -1,6 +1,7 @@
 # backend/config/celery.py
 import os
 from celery import Celery
+from django.conf import settings
 
 # Django 설정 모듈 설정
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
@@ -19,6 +20,7 @@ app.conf.update(
     # Task 라우팅
     task_routes={
         'locations.tasks.generate_sido_topojson': {'queue': 'topojson'},
+        'locations.tasks.rebuild_sido_topojson': {'queue': 'topojson'},
         'locations.tasks.clear_topojson_cache': {'queue': 'cache'},
     },
     
@@ -49,6 +51,21 @@ app.conf.update(
     
     # Beat 스케줄러 설정 (필요시)
     beat_schedule={
+        # 매물 조회수 Redis → DB 반영
+        'flush-listing-view-counts': {
+            'task': 'listings.flush_listing_view_counts',
+            'schedule': settings.LISTING_VIEW_FLUSH_INTERVAL,
+        },
+        # 매물 인근 버스정류장 증분 갱신 (1시간마다)
+        'refresh-listing-bus-stops': {
+            'task': 'listings.refresh_listing_bus_stops',
+            'schedule': 60 * 60,
+        },
+        # 매물 대중교통점수/노선다양성점수 전체 재계산 (하루 1번)
+        'recompute-listing-transit-scores': {
+            'task': 'listings.recompute_listing_transit_scores',
+            'schedule': 24 * 60 * 60,
+        },
         # 주기적 캐시 정리 (선택사항)
         # 'cleanup-topojson-cache': {
         #     'task': 'locations.tasks.cleanup_old_topojson',
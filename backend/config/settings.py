@@ -47,6 +47,7 @@ DJANGO_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.gis",  # GeoDjango 지원
+    "django.contrib.postgres",  # pg_trgm 등 PostgreSQL 전용 기능
 ]
 THIRD_PARTY_APPS = [
     "rest_framework",  # Django REST Framework
@@ -144,6 +145,13 @@ CORS_ALLOW_HEADERS = [
     'x-requested-with',
 ]
 
+# 프론트엔드에서 읽을 수 있는 응답 헤더 (TopoJSON 메타데이터)
+CORS_EXPOSE_HEADERS = [
+    'etag',
+    'x-topojson-generated-at',
+    'x-topojson-feature-count',
+]
+
 # 인증 정보 포함 허용
 CORS_ALLOW_CREDENTIALS = True
 
@@ -239,6 +247,16 @@ CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # 25분
 CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 CELERY_WORKER_MAX_TASKS_PER_CHILD = 1000
 
+# 매물 조회수 Redis → DB 반영 주기 (초)
+LISTING_VIEW_FLUSH_INTERVAL = int(os.environ.get("LISTING_VIEW_FLUSH_INTERVAL", "60"))
+
+# 버스정류장 인메모리 격자 인덱스 스냅샷 위치 (build_bus_stop_index 명령어로 생성)
+BUS_STOP_INDEX_DIR = Path(os.environ.get("BUS_STOP_INDEX_DIR", BASE_DIR / "data" / "bus_stop_index"))
+
+# 시도 변경 후 TopoJSON 재생성까지 기다리는 조용한 시간 / 변경이 이어질 때 최대 지연 (초)
+SIDO_TOPOJSON_QUIET_SECONDS = int(os.environ.get("SIDO_TOPOJSON_QUIET_SECONDS", "30"))
+SIDO_TOPOJSON_MAX_DELAY_SECONDS = int(os.environ.get("SIDO_TOPOJSON_MAX_DELAY_SECONDS", "300"))
+
 # 패스워드 검증
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -2,6 +2,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from locations.urls import bus_stop_urlpatterns
 
 url = [
     path("admin/", admin.site.urls),
@@ -10,6 +11,7 @@ url = [
     path("api/", include("listings.urls")),  # Listings API
     path("api/", include("inspections.urls")),  # Inspections API
     path("api/", include("notices.urls")),  # Notices API
+    path("api/", include(bus_stop_urlpatterns)),  # Bus stops API
 ]
 
 swagger_ui = [
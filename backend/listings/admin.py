@@ -7,6 +7,14 @@ class ListingAdmin(admin.ModelAdmin):
     list_filter = ['매물타입', '주택종류', '매물상태', '활성화여부', '생성일시']
     search_fields = ['주소', '도로명주소', '지번주소', '상세설명']
     readonly_fields = ['조회수', '찜수', '생성일시', '수정일시']
+
+    def get_queryset(self, request):
+        # 목록 화면에는 상세 전용 JSON 컬럼이 필요 없음 (수정 화면은 get_object에서 전체 조회)
+        queryset = super().get_queryset(request)
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        if url_name and url_name.endswith('_changelist'):
+            queryset = queryset.without_payloads()
+        return queryset
     
     fieldsets = (
         ('기본 정보', {
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ListingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'listings'
+
+    def ready(self):
+        """
+        앱이 준비되면 signals를 import하여 등록
+        """
+        import listings.signals
@@ -0,0 +1,170 @@
+# backend/listings/bbox_cache.py
+"""
+지도 범위(bounds) 목록 응답용 격자 셀 캐시
+
+- 요청 bounds를 고정 격자(CELL_SIZE_DEG)로 스냅하여 셀 단위로 Redis에 캐시
+- 응답은 캐시된 셀들을 모아 정확한 bounds로 잘라내어 조립
+- 캐시에 없는 셀들은 한 번의 쿼리로 채움
+- 셀을 채울 때 내용 해시(digest)를 함께 저장하여, 응답 ETag를 직렬화 없이 셀 digest들로 만듦
+- 매물 저장/삭제 시 해당 좌표가 속한 셀만 무효화 (signals 참고),
+  신호 없는 일괄 변경은 타일과 같은 매물 지도 데이터 버전으로 무효화 (tiles 참고)
+"""
+import hashlib
+import math
+
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from .geo import filter_by_bounds
+from .serializers import listing_list_rows, serialize_listing_rows
+from .tiles import get_listing_data_version
+
+CELL_SIZE_DEG = 0.01  # 약 1.1km
+CELL_CACHE_PREFIX = "listing_cell"
+# 셀에 저장하는 데이터 구조가 바뀌면 올려서 기존 캐시를 모두 무시
+CELL_CACHE_VERSION = 2
+CELL_CACHE_TIMEOUT_SECONDS = 10 * 60
+# 화면이 너무 넓으면(셀이 너무 많으면) 캐시를 쓰지 않고 바로 조회
+MAX_CELLS_PER_REQUEST = 400
+# 이 파라미터 외의 필터/검색/정렬/페이지네이션이 있으면 캐시를 우회
+CACHEABLE_QUERY_PARAMS = {'bounds', 'zoom', 'format'}
+# 셀 경계에서 부동소수점 오차로 누락되지 않도록 쿼리 범위를 살짝 넓힘
+_EPSILON = 1e-9
+
+
+def is_cacheable_request(request):
+    return set(request.query_params.keys()) <= CACHEABLE_QUERY_PARAMS
+
+
+def cell_for_point(lat, lng):
+    return math.floor(float(lat) / CELL_SIZE_DEG), math.floor(float(lng) / CELL_SIZE_DEG)
+
+
+def cell_cache_key(cell, data_version=None):
+    if data_version is None:
+        data_version = get_listing_data_version()
+    return f"{CELL_CACHE_PREFIX}:v{CELL_CACHE_VERSION}:d{data_version}:{cell[0]}:{cell[1]}"
+
+
+def cells_for_bounds(bounds, max_cells=MAX_CELLS_PER_REQUEST):
+    """
+    bounds를 덮는 모든 셀 (row, col) 목록
+
+    Returns:
+        list | None: 셀이 없거나 max_cells를 넘으면 None (목록을 만들기 전에 개수로 판단)
+    """
+    sw_lat, sw_lng, ne_lat, ne_lng = bounds
+    min_row, min_col = cell_for_point(sw_lat, sw_lng)
+    max_row, max_col = cell_for_point(ne_lat, ne_lng)
+    rows = max_row - min_row + 1
+    cols = max_col - min_col + 1
+    if rows <= 0 or cols <= 0 or rows * cols > max_cells:
+        return None
+    return [
+        (row, col)
+        for row in range(min_row, max_row + 1)
+        for col in range(min_col, max_col + 1)
+    ]
+
+
+def _load_cells(queryset, cells):
+    """
+    캐시에 없는 셀들을 한 번의 bounds 쿼리로 조회하여 셀별로 분배
+
+    Returns:
+        dict: {cell: {'digest': 내용 해시, 'entries': [(lat, lng, created_ts, id, payload), ...]}}
+    """
+    rows_min = min(row for row, _ in cells)
+    rows_max = max(row for row, _ in cells)
+    cols_min = min(col for _, col in cells)
+    cols_max = max(col for _, col in cells)
+    query_bounds = (
+        rows_min * CELL_SIZE_DEG - _EPSILON,
+        cols_min * CELL_SIZE_DEG - _EPSILON,
+        (rows_max + 1) * CELL_SIZE_DEG + _EPSILON,
+        (cols_max + 1) * CELL_SIZE_DEG + _EPSILON,
+    )
+
+    entries_by_cell = {cell: [] for cell in cells}
+    rows = list(listing_list_rows(filter_by_bounds(queryset, query_bounds), extra_fields=('생성일시',)))
+    for row, payload in zip(rows, serialize_listing_rows(rows)):
+        if row.위도 is None or row.경도 is None:
+            continue
+        cell = cell_for_point(row.위도, row.경도)
+        if cell in entries_by_cell:
+            entries_by_cell[cell].append((
+                float(row.위도), float(row.경도), row.생성일시.timestamp(), row.id, payload,
+            ))
+
+    renderer = JSONRenderer()
+    return {
+        cell: {'digest': hashlib.md5(renderer.render(entries)).hexdigest(), 'entries': entries}
+        for cell, entries in entries_by_cell.items()
+    }
+
+
+def cached_cells_for_bounds(queryset, bounds):
+    """
+    bounds를 덮는 셀 캐시 (없는 셀은 한 번의 쿼리로 채움)
+
+    Returns:
+        list[dict] | None: 셀 순서대로 {'digest', 'entries'},
+            셀 수가 MAX_CELLS_PER_REQUEST를 넘으면 None (호출측에서 직접 조회)
+    """
+    cells = cells_for_bounds(bounds)
+    if cells is None:
+        return None
+
+    data_version = get_listing_data_version()
+    keys = {cell: cell_cache_key(cell, data_version) for cell in cells}
+    cached = cache.get_many(list(keys.values()))
+    cells_data = {cell: cached[key] for cell, key in keys.items() if key in cached}
+
+    missing = [cell for cell in cells if cell not in cells_data]
+    if missing:
+        loaded = _load_cells(queryset, missing)
+        cache.set_many(
+            {keys[cell]: data for cell, data in loaded.items()},
+            CELL_CACHE_TIMEOUT_SECONDS
+        )
+        cells_data.update(loaded)
+    return [cells_data[cell] for cell in cells]
+
+
+def cells_digest(cells_data):
+    """셀 digest들을 합친 값 (셀 하나라도 다시 채워지면 바뀜, ETag용)"""
+    return ":".join(data['digest'] for data in cells_data)
+
+
+def listings_from_cells(cells_data, bounds):
+    """
+    셀 캐시에서 bounds 내 매물 목록(지도 핀 형식)을 조립
+    """
+    # 가장자리 셀은 요청 bounds 밖의 매물을 포함하므로 잘라냄
+    sw_lat, sw_lng, ne_lat, ne_lng = bounds
+    entries = [
+        entry
+        for data in cells_data
+        for entry in data['entries']
+        if sw_lat <= entry[0] <= ne_lat and sw_lng <= entry[1] <= ne_lng
+    ]
+    # 기본 정렬(-생성일시)과 동일하게, 같은 시각이면 id 역순
+    entries.sort(key=lambda entry: (entry[2], entry[3]), reverse=True)
+    return [entry[4] for entry in entries]
+
+
+def invalidate_cells_for_points(points):
+    """
+    좌표 목록이 속한 셀 캐시 삭제
+
+    Args:
+        points: [(위도, 경도), ...] - None 좌표는 무시
+    """
+    data_version = get_listing_data_version()
+    keys = {
+        cell_cache_key(cell_for_point(lat, lng), data_version)
+        for lat, lng in points
+        if lat is not None and lng is not None
+    }
+    if keys:
+        cache.delete_many(list(keys))
@@ -0,0 +1,153 @@
+# backend/listings/bus_stops.py
+"""
+매물별 인근 버스정류장(버스정류장정보) 일괄 계산
+
+- bus_stops.위치 GiST 인덱스 + KNN(<->) 연산자로 매물마다 가까운 정류장을 찾고
+  id 구간 단위의 UPDATE ... FROM 한 문장으로 반영 (매물별 Python 루프 없음)
+- 증분 갱신: 좌표가 바뀐 매물(버스정류장갱신일시 = NULL)과
+  마지막 갱신 이후 반경 내 정류장이 바뀐(bus_stops.수정일시) 매물만 다시 계산
+- 삭제된 정류장은 수정일시로 찾을 수 없으므로, 삭제 전에 반경 내 매물의
+  버스정류장갱신일시를 NULL로 만들어 다음 증분 갱신에서 다시 계산되게 함
+"""
+from django.db import connection
+
+DEFAULT_STOP_LIMIT = 5
+DEFAULT_RADIUS_M = 500
+BATCH_SIZE = 5000
+# 한국 최북단(약 39°)에서 경도 1도 ≈ 86km → 미터 반경을 덮는 보수적인 도 단위 반경
+METERS_PER_DEGREE_MIN = 86000.0
+# KNN은 도(degree) 단위 거리 순이므로 여유 있게 후보를 뽑은 뒤 실제 거리(m)로 재정렬
+CANDIDATE_FACTOR = 3
+
+REFRESH_SQL = """
+    WITH targets AS (
+        SELECT l.id, l."위치"
+        FROM listings l
+        WHERE l.id >= %(start)s AND l.id < %(end)s
+          AND l."위치" IS NOT NULL
+          AND (
+              %(full)s
+              OR l."버스정류장갱신일시" IS NULL
+              OR EXISTS (
+                  SELECT 1 FROM bus_stops b
+                  WHERE b."수정일시" > l."버스정류장갱신일시"
+                    AND b."위치" && ST_Expand(l."위치", %(radius_deg)s)
+              )
+          )
+    ),
+    nearest AS (
+        SELECT
+            t.id,
+            COALESCE(
+                jsonb_agg(
+                    jsonb_build_object(
+                        'stop_id', s."정류장번호",
+                        'stop_name', s."정류장명",
+                        'distance_m', s.distance_m
+                    )
+                    ORDER BY s.distance_m
+                ) FILTER (WHERE s."정류장번호" IS NOT NULL),
+                '[]'::jsonb
+            ) AS stops
+        FROM targets t
+        LEFT JOIN LATERAL (
+            SELECT c.*
+            FROM (
+                SELECT
+                    b."정류장번호",
+                    b."정류장명",
+                    round(ST_Distance(b."위치"::geography, t."위치"::geography))::int AS distance_m
+                FROM bus_stops b
+                WHERE b."위치" && ST_Expand(t."위치", %(radius_deg)s)
+                ORDER BY b."위치" <-> t."위치"
+                LIMIT %(candidates)s
+            ) c
+            WHERE c.distance_m <= %(radius_m)s
+            ORDER BY c.distance_m
+            LIMIT %(stop_limit)s
+        ) s ON TRUE
+        GROUP BY t.id
+    )
+    UPDATE listings l
+    SET "버스정류장정보" = n.stops,
+        "버스정류장갱신일시" = now(),
+        -- 상세 ETag/Last-Modified가 수정일시 기준이므로 정류장 정보가 실제로 바뀐 매물만 갱신
+        "수정일시" = CASE
+            WHEN l."버스정류장정보" IS DISTINCT FROM n.stops THEN now()
+            ELSE l."수정일시"
+        END
+    FROM nearest n
+    WHERE l.id = n.id
+"""
+
+STALE_NEAR_STOPS_SQL = """
+    UPDATE listings l
+    SET "버스정류장갱신일시" = NULL
+    FROM (
+        SELECT DISTINCT nl.id
+        FROM bus_stops b
+        JOIN listings nl ON nl."위치" && ST_Expand(b."위치", %(radius_deg)s)
+        WHERE b."정류장번호" = ANY(%(stop_ids)s)
+    ) t
+    WHERE l.id = t.id
+      AND l."버스정류장갱신일시" IS NOT NULL
+"""
+
+
+def mark_listings_near_stops_stale(stop_ids, radius_m=DEFAULT_RADIUS_M):
+    """
+    정류장 삭제 전에 호출: 반경 내 매물을 다음 증분 갱신 대상으로 표시
+
+    Args:
+        stop_ids: 삭제할 정류장번호 목록
+        radius_m: 검색 반경(m) - refresh_nearby_bus_stops와 같은 값
+
+    Returns:
+        int: 표시된 매물 수
+    """
+    if not stop_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(STALE_NEAR_STOPS_SQL, {
+            'stop_ids': list(stop_ids),
+            'radius_deg': radius_m / METERS_PER_DEGREE_MIN,
+        })
+        return cursor.rowcount
+
+
+def refresh_nearby_bus_stops(full=False, stop_limit=DEFAULT_STOP_LIMIT, radius_m=DEFAULT_RADIUS_M,
+                             batch_size=BATCH_SIZE, progress=None):
+    """
+    매물 버스정류장정보를 인근 정류장 [{"stop_id", "stop_name", "distance_m"}, ...]로 갱신
+
+    Args:
+        full: True면 모든 매물 재계산, False면 증분 갱신
+        stop_limit: 매물당 최대 정류장 수
+        radius_m: 검색 반경(m)
+        batch_size: 한 UPDATE 문이 다루는 매물 id 구간 크기
+        progress: 배치마다 호출되는 콜백 (처리한 id 상한, 갱신 행 수)
+
+    Returns:
+        int: 갱신된 매물 수
+    """
+    params = {
+        'full': bool(full),
+        'radius_m': radius_m,
+        'radius_deg': radius_m / METERS_PER_DEGREE_MIN,
+        'stop_limit': stop_limit,
+        'candidates': stop_limit * CANDIDATE_FACTOR,
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM listings")
+        min_id, max_id = cursor.fetchone()
+        if min_id is None:
+            return 0
+
+        updated = 0
+        for start in range(min_id, max_id + 1, batch_size):
+            cursor.execute(REFRESH_SQL, {**params, 'start': start, 'end': start + batch_size})
+            updated += cursor.rowcount
+            if progress is not None:
+                progress(start + batch_size, updated)
+    return updated
@@ -0,0 +1,70 @@
+# backend/listings/conditional.py
+"""
+매물 API 조건부 GET (ETag / Last-Modified)
+
+- 직렬화 전에 가벼운 메타데이터 쿼리(수정일시, 개수)로 검증값을 만들고
+  If-None-Match / If-Modified-Since가 일치하면 304 Not Modified 반환
+- 격자 셀 캐시에서 조립한 목록은 DB 조회/직렬화 없이 셀을 채울 때 저장한 내용 해시로 ETag 생성
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def detail_validators(queryset, pk):
+    """
+    상세 조회용 검증값 (ETag, Last-Modified 타임스탬프)
+
+    Returns:
+        tuple | None: 매물이 없으면 None
+    """
+    modified = queryset.filter(pk=pk).values_list('수정일시', flat=True).first()
+    if modified is None:
+        return None
+    return f'"listing-{pk}-{int(modified.timestamp() * 1000000)}"', int(modified.timestamp())
+
+
+def list_validators(queryset, request):
+    """
+    목록 조회용 검증값: 필터링된 범위 내 max(수정일시) + 개수 + 쿼리 파라미터
+
+    Returns:
+        tuple: (ETag, Last-Modified 타임스탬프 또는 None)
+    """
+    meta = queryset.order_by().aggregate(modified=Max('수정일시'), count=Count('id'))
+    modified = meta['modified']
+    modified_us = int(modified.timestamp() * 1000000) if modified else 0
+    digest = hashlib.md5(
+        f"{_params_signature(request)}:{modified_us}:{meta['count']}".encode('utf-8')
+    ).hexdigest()
+    return f'"listings-{digest}"', int(modified.timestamp()) if modified else None
+
+
+def content_etag(request, content_digest):
+    """
+    격자 셀 캐시 응답의 ETag (쿼리 파라미터 + 셀들의 내용 해시)
+    셀 캐시는 매물 저장/삭제 시 무효화되므로 digest가 같으면 응답도 같음 (Last-Modified 없음)
+    """
+    digest = hashlib.md5(f"{_params_signature(request)}:{content_digest}".encode('utf-8')).hexdigest()
+    return f'"listings-c-{digest}"'
+
+
+def _params_signature(request):
+    return "&".join(
+        f"{key}={'|'.join(sorted(values))}"
+        for key, values in sorted(request.query_params.lists())
+    )
+
+
+def not_modified_response(request, etag, last_modified):
+    """검증값이 일치하면 304 응답, 아니면 None"""
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
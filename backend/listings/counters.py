@@ -0,0 +1,91 @@
+# backend/listings/counters.py
+"""
+매물 조회수 write-behind 카운터
+
+- 상세 조회 시 Redis 해시에 HINCRBY로 원자적으로 누적 (DB 쓰기 없음)
+- Celery beat 작업(flush_listing_view_counts)이 주기적으로 listings 테이블에 반영
+- 배치 UPDATE가 커밋되면 바로 그 id들을 flushing 해시에서 HDEL하므로,
+  중간에 실패해도 다음 실행은 아직 반영되지 않은 조회수만 다시 반영 (이중 집계 방지)
+"""
+import uuid
+from collections import defaultdict
+
+from django.db.models import F
+from django_redis import get_redis_connection
+
+VIEW_COUNTS_PENDING_KEY = "listing_views:pending"
+VIEW_COUNTS_FLUSHING_KEY = "listing_views:flushing"
+VIEW_COUNTS_LOCK_KEY = "listing_views:flush_lock"
+VIEW_COUNTS_LOCK_TIMEOUT = 5 * 60
+FLUSH_BATCH_SIZE = 1000
+
+
+def record_listing_view(listing_id):
+    """
+    조회수 1 증가를 Redis에 기록
+    Redis 장애 시에만 DB에 직접 원자적 증가로 대체
+    """
+    try:
+        get_redis_connection("default").hincrby(VIEW_COUNTS_PENDING_KEY, listing_id, 1)
+    except Exception as e:
+        print(f"Redis view counter unavailable, writing to DB: {e}")
+        from .models import Listing
+        Listing.objects.filter(pk=listing_id).update(조회수=F('조회수') + 1)
+
+
+def flush_view_counts():
+    """
+    Redis에 누적된 조회수를 DB에 일괄 반영
+
+    pending 해시를 flushing 키로 RENAME한 뒤 반영하므로, 반영 중 들어온 조회는
+    새 pending 해시에 쌓여 다음 주기에 처리된다. 이전 실행이 중간에 죽어
+    flushing 키가 남아 있으면 그것부터 반영한다 (이미 커밋된 배치는 HDEL되어 남아 있지 않음).
+    반영이 길어지면 배치마다 lock 만료 시간을 연장한다.
+
+    Returns:
+        int: 반영된 매물 수
+    """
+    from .models import Listing
+
+    conn = get_redis_connection("default")
+    token = uuid.uuid4().hex
+    if not conn.set(VIEW_COUNTS_LOCK_KEY, token, nx=True, ex=VIEW_COUNTS_LOCK_TIMEOUT):
+        return 0
+
+    try:
+        if not conn.exists(VIEW_COUNTS_FLUSHING_KEY):
+            if not conn.exists(VIEW_COUNTS_PENDING_KEY):
+                return 0
+            conn.rename(VIEW_COUNTS_PENDING_KEY, VIEW_COUNTS_FLUSHING_KEY)
+
+        # 증가량별로 id를 묶어 UPDATE ... SET 조회수 = 조회수 + n WHERE id IN (...)
+        ids_by_increment = defaultdict(list)
+        for listing_id, increment in conn.hgetall(VIEW_COUNTS_FLUSHING_KEY).items():
+            ids_by_increment[int(increment)].append(int(listing_id))
+
+        flushed = 0
+        for increment, ids in ids_by_increment.items():
+            for start in range(0, len(ids), FLUSH_BATCH_SIZE):
+                if not _refresh_lock(conn, token):
+                    # lock이 만료되어 다른 실행이 가져감 → 남은 배치는 그쪽에서 반영
+                    return flushed
+                batch = ids[start:start + FLUSH_BATCH_SIZE]
+                Listing.objects.filter(id__in=batch).update(조회수=F('조회수') + increment)
+                # 커밋된 배치만 해시에서 제거 (다음 실행이 다시 반영하지 않도록)
+                conn.hdel(VIEW_COUNTS_FLUSHING_KEY, *batch)
+                flushed += len(batch)
+
+        conn.delete(VIEW_COUNTS_FLUSHING_KEY)
+        return flushed
+    finally:
+        # 다른 실행이 잡은 lock은 지우지 않음
+        if conn.get(VIEW_COUNTS_LOCK_KEY) == token.encode():
+            conn.delete(VIEW_COUNTS_LOCK_KEY)
+
+
+def _refresh_lock(conn, token):
+    """flush lock을 아직 보유 중이면 만료 시간을 연장하고 True"""
+    if conn.get(VIEW_COUNTS_LOCK_KEY) != token.encode():
+        return False
+    conn.expire(VIEW_COUNTS_LOCK_KEY, VIEW_COUNTS_LOCK_TIMEOUT)
+    return True
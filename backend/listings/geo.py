@@ -0,0 +1,132 @@
+# backend/listings/geo.py
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.db.models.functions import SnapToGrid
+from django.db import connections
+from django.db.models import (
+    Avg, Case, Count, ExpressionWrapper, F, FloatField, Func, Max, Min, Value, When
+)
+from django.db.models.functions import Floor
+
+# 이 줌 레벨 미만에서는 개별 매물 대신 클러스터를 반환
+CLUSTER_MAX_ZOOM = 14
+# 화면상 클러스터 한 칸의 크기(px) - 256px 타일 기준
+CLUSTER_CELL_PIXELS = 60
+
+
+# ✅ PostGIS ST_MakeEnvelope 직접 래퍼
+class MakeEnvelope(Func):
+    function = "ST_MakeEnvelope"
+    output_field = GeometryField(srid=4326)
+
+    def __init__(self, sw_lng, sw_lat, ne_lng, ne_lat, srid=4326, **extra):
+        super().__init__(
+            Value(sw_lng), Value(sw_lat), Value(ne_lng), Value(ne_lat), Value(srid),
+            **extra
+        )
+
+
+def parse_bounds(raw_bounds):
+    """
+    bounds 쿼리 파라미터 파싱
+
+    Args:
+        raw_bounds: "sw_lat,sw_lng,ne_lat,ne_lng" 형식 문자열
+
+    Returns:
+        tuple: (sw_lat, sw_lng, ne_lat, ne_lng)
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 nan/inf, 위도 ±90/경도 ±180 범위를 벗어난 경우
+    """
+    sw_lat, sw_lng, ne_lat, ne_lng = map(float, raw_bounds.split(','))
+    for lat in (sw_lat, ne_lat):
+        if not -90.0 <= lat <= 90.0:
+            raise ValueError(f"위도 범위 오류: {lat}")
+    for lng in (sw_lng, ne_lng):
+        if not -180.0 <= lng <= 180.0:
+            raise ValueError(f"경도 범위 오류: {lng}")
+    return sw_lat, sw_lng, ne_lat, ne_lng
+
+
+def filter_by_bounds(queryset, bounds):
+    """
+    지도 범위(bounds) 내 매물만 필터링
+
+    PostGIS에서는 위치 && ST_MakeEnvelope(...) 로 GiST 인덱스를 타고,
+    공간 기능이 없는 DB(SQLite 개발 환경)에서는 위도/경도 범위 비교로 대체한다.
+    """
+    sw_lat, sw_lng, ne_lat, ne_lng = bounds
+    if connections[queryset.db].features.gis_enabled:
+        return queryset.filter(
+            위치__bboverlaps=MakeEnvelope(sw_lng, sw_lat, ne_lng, ne_lat)
+        )
+    return queryset.filter(
+        위도__gte=sw_lat,
+        위도__lte=ne_lat,
+        경도__gte=sw_lng,
+        경도__lte=ne_lng
+    )
+
+
+def cluster_cell_size(zoom):
+    """줌 레벨에 대응하는 클러스터 격자 크기(도 단위)"""
+    return 360.0 / (256 * 2 ** zoom) * CLUSTER_CELL_PIXELS
+
+
+def representative_price():
+    """
+    클러스터 가격 범위 계산용 대표 가격
+    매매 → 매매가, 전세 → 전세보증금, 월세 → 월세보증금
+    """
+    return Case(
+        When(매물타입='sale', then=F('매매가')),
+        When(매물타입='jeonse', then=F('전세보증금')),
+        When(매물타입='monthly', then=F('월세보증금')),
+    )
+
+
+def cluster_listings(queryset, zoom):
+    """
+    격자(ST_SnapToGrid) 단위로 매물을 집계하여 클러스터 목록 반환
+
+    집계는 모두 SQL에서 수행되므로 결과 크기는 매물 수가 아니라
+    화면 면적(격자 칸 수)에 비례한다.
+
+    Returns:
+        list[dict]: [{"count", "lat", "lng", "min_price", "max_price"}, ...]
+    """
+    cell_size = cluster_cell_size(zoom)
+    queryset = queryset.filter(위도__isnull=False, 경도__isnull=False).order_by()
+
+    if connections[queryset.db].features.gis_enabled:
+        cell_fields = {'cell': SnapToGrid('위치', cell_size)}
+    else:
+        cell_fields = {
+            'cell_lat': Floor(ExpressionWrapper(F('위도') / cell_size, output_field=FloatField())),
+            'cell_lng': Floor(ExpressionWrapper(F('경도') / cell_size, output_field=FloatField())),
+        }
+
+    price = representative_price()
+    rows = (
+        queryset
+        .annotate(**cell_fields)
+        .values(*cell_fields)
+        .annotate(
+            count=Count('id'),
+            center_lat=Avg('위도'),
+            center_lng=Avg('경도'),
+            min_price=Min(price),
+            max_price=Max(price),
+        )
+    )
+
+    return [
+        {
+            'count': row['count'],
+            'lat': round(float(row['center_lat']), 8),
+            'lng': round(float(row['center_lng']), 8),
+            'min_price': row['min_price'],
+            'max_price': row['max_price'],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,69 @@
+"""
+매물 좌표로 지역ID를 일괄 배정하는 관리 명령어 (프로세스 풀 병렬 처리)
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from listings.regions import CHUNK_SIZE, assign_regions_for_range, init_region_worker
+from listings.transit_score import listing_id_chunks
+from locations.resolver import get_region_resolver
+
+
+class Command(BaseCommand):
+    help = '매물 좌표(위도/경도)와 주소로 시도/지역을 판별하여 지역ID를 일괄 배정합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'청크당 매물 id 구간 크기 (기본값: {CHUNK_SIZE})'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='병렬 워커 프로세스 수 (기본값: CPU 수, 1이면 현재 프로세스에서 실행)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        workers = max(options['workers'], 1)
+        chunks = listing_id_chunks(options['chunk_size'])
+
+        # fork 환경에서는 워커가 부모에서 만든 판별기(STRtree)를 그대로 물려받음
+        resolver = get_region_resolver()
+        mode = 'STRtree' if resolver.has_geometry else 'PostGIS ST_Contains'
+        self.stdout.write(f'청크 {len(chunks)}개, 워커 {workers}개로 지역 배정을 시작합니다 ({mode})...')
+
+        updated = unresolved = done = 0
+        if workers == 1:
+            for start, end in chunks:
+                chunk_updated, chunk_unresolved = assign_regions_for_range(start, end, resolver=resolver)
+                updated += chunk_updated
+                unresolved += chunk_unresolved
+                done += 1
+                self.stdout.write(f'처리 중... {done}/{len(chunks)} 청크, {updated}개 매물 갱신됨')
+        else:
+            # fork된 워커가 부모의 DB 연결을 공유하지 않도록 미리 닫음
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_region_worker) as executor:
+                futures = [executor.submit(assign_regions_for_range, start, end) for start, end in chunks]
+                for future in as_completed(futures):
+                    chunk_updated, chunk_unresolved = future.result()
+                    updated += chunk_updated
+                    unresolved += chunk_unresolved
+                    done += 1
+                    self.stdout.write(f'처리 중... {done}/{len(chunks)} 청크, {updated}개 매물 갱신됨')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n지역 배정 완료! 갱신된 매물: {updated}, 판별 실패(기존 값 유지): {unresolved} '
+                f'(소요 시간: {elapsed:.1f}초)'
+            )
+        )
@@ -0,0 +1,103 @@
+"""
+매물 목록 직렬화 벤치마크: ListingListSerializer vs 고속 경로(serialize_listing_rows)
+DB 없이 메모리에서 만든 가상 매물로 비교하며, 두 경로의 JSON 출력이 같은지도 검증한다.
+"""
+import random
+import time
+from collections import namedtuple
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from listings.models import Listing
+from listings.serializers import (
+    LIST_ROW_FIELDS,
+    ListingListSerializer,
+    serialize_listing_rows,
+)
+
+
+class Command(BaseCommand):
+    help = '매물 목록 직렬화 경로 성능을 비교합니다 (기본 50,000건)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=50000,
+            help='생성할 가상 매물 수 (기본값: 50000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='반복 측정 횟수 (기본값: 3, 최솟값 기준으로 출력)'
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        repeat = options['repeat']
+
+        self.stdout.write(f'가상 매물 {count}건 생성 중...')
+        listings, rows = self._build_samples(count)
+        renderer = JSONRenderer()
+
+        def run_serializer():
+            return renderer.render({'listings': ListingListSerializer(listings, many=True).data})
+
+        def run_fast_path():
+            return renderer.render({'listings': serialize_listing_rows(rows)})
+
+        serializer_time, serializer_output = self._measure(run_serializer, repeat)
+        fast_time, fast_output = self._measure(run_fast_path, repeat)
+
+        if serializer_output != fast_output:
+            raise CommandError('두 직렬화 경로의 출력이 다릅니다!')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n출력 일치 확인 ({len(fast_output):,} bytes)\n'
+                f'ListingListSerializer: {serializer_time * 1000:.1f}ms\n'
+                f'serialize_listing_rows: {fast_time * 1000:.1f}ms\n'
+                f'속도 향상: {serializer_time / fast_time:.1f}배'
+            )
+        )
+
+    def _measure(self, func, repeat):
+        best = None
+        output = None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            output = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
+
+    def _build_samples(self, count):
+        """같은 데이터를 모델 인스턴스와 values_list 행 두 가지 형태로 생성"""
+        rng = random.Random(42)
+        Row = namedtuple('Row', LIST_ROW_FIELDS)
+        listing_types = [choice for choice, _ in Listing.LISTING_TYPE_CHOICES]
+        house_types = [choice for choice, _ in Listing.HOUSE_TYPE_CHOICES]
+
+        listings = []
+        rows = []
+        for i in range(1, count + 1):
+            listing_type = rng.choice(listing_types)
+            values = {
+                'id': i,
+                '매물타입': listing_type,
+                '매매가': rng.randrange(1, 200) * 10000000 if listing_type == 'sale' else None,
+                '전세보증금': rng.randrange(1, 100) * 5000000 if listing_type == 'jeonse' else None,
+                '월세보증금': rng.choice([None, 0, 5000000, 10000000]) if listing_type == 'monthly' else None,
+                '월세': rng.randrange(30, 200) * 10000 if listing_type == 'monthly' else None,
+                '주소': f'서울특별시 강남구 테헤란로 {i}',
+                '위도': Decimal(f'{rng.uniform(33.0, 38.6):.8f}'),
+                '경도': Decimal(f'{rng.uniform(124.5, 131.9):.8f}'),
+                '주택종류': rng.choice(house_types),
+            }
+            images = [f'/images/house{rng.randrange(1, 4)}.jpg'] if i % 5 else []
+            listings.append(Listing(이미지URLs=images, **values))
+            rows.append(Row(first_image=images[0] if images else None, **values))
+        return listings, rows
@@ -0,0 +1,57 @@
+"""
+매물 대중교통점수/노선다양성점수를 일괄 재계산하는 관리 명령어
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from listings.tasks import recompute_listing_transit_scores
+from listings.transit_score import (
+    CHUNK_SIZE,
+    listing_id_chunks,
+    load_bus_stop_index,
+    recompute_transit_scores_for_range,
+)
+
+
+class Command(BaseCommand):
+    help = '매물 대중교통점수/노선다양성점수를 일괄 재계산합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'청크당 매물 id 구간 크기 (기본값: {CHUNK_SIZE})'
+        )
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_celery',
+            help='Celery 워커들에 청크를 분배합니다 (기본: 현재 프로세스에서 실행)'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        if options['use_celery']:
+            result = recompute_listing_transit_scores.delay(chunk_size=chunk_size)
+            self.stdout.write(self.style.SUCCESS(f'재계산 Task를 등록했습니다: {result.id}'))
+            return
+
+        started = time.perf_counter()
+        index = load_bus_stop_index()
+        chunks = listing_id_chunks(chunk_size)
+        self.stdout.write(f'정류장 {len(index)}개, 청크 {len(chunks)}개 재계산을 시작합니다...')
+
+        updated = 0
+        for start, end in chunks:
+            updated += recompute_transit_scores_for_range(start, end, index=index)
+            self.stdout.write(f'처리 중... id < {end}, {updated}개 매물 갱신됨')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n대중교통점수 재계산 완료! 갱신된 매물: {updated} (소요 시간: {elapsed:.1f}초)'
+            )
+        )
@@ -0,0 +1,59 @@
+"""
+매물별 인근 버스정류장 정보(버스정류장정보)를 bus_stops 테이블에서 일괄 계산하는 관리 명령어
+"""
+from django.core.management.base import BaseCommand
+
+from listings.bus_stops import (
+    BATCH_SIZE,
+    DEFAULT_RADIUS_M,
+    DEFAULT_STOP_LIMIT,
+    refresh_nearby_bus_stops,
+)
+
+
+class Command(BaseCommand):
+    help = '매물별 인근 버스정류장 정보를 계산합니다 (기본: 증분 갱신)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='변경 여부와 관계없이 모든 매물을 다시 계산합니다'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=DEFAULT_STOP_LIMIT,
+            help=f'매물당 최대 정류장 수 (기본값: {DEFAULT_STOP_LIMIT})'
+        )
+        parser.add_argument(
+            '--radius',
+            type=int,
+            default=DEFAULT_RADIUS_M,
+            help=f'검색 반경(m) (기본값: {DEFAULT_RADIUS_M})'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'한 번에 처리할 매물 id 구간 크기 (기본값: {BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        mode = '전체' if options['full'] else '증분'
+        self.stdout.write(f'인근 버스정류장 {mode} 갱신을 시작합니다...')
+
+        def progress(upper_id, updated):
+            self.stdout.write(f'처리 중... id < {upper_id}, {updated}개 매물 갱신됨')
+
+        updated = refresh_nearby_bus_stops(
+            full=options['full'],
+            stop_limit=options['limit'],
+            radius_m=options['radius'],
+            batch_size=options['batch_size'],
+            progress=progress,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'\n인근 버스정류장 갱신 완료! 갱신된 매물: {updated}')
+        )
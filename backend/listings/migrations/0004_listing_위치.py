@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 10:12
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0003_alter_listing_qa정보_alter_listing_버스정류장정보_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='위치',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, null=True, spatial_index=False, srid=4326, verbose_name='매물 위치'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+"""
+기존 매물의 위도/경도로 위치(PointField)를 채우는 데이터 마이그레이션
+
+- 수백만 행에서도 테이블 잠금 없이 돌 수 있도록 id 구간 단위로 나눠 UPDATE
+- atomic = False 이므로 배치마다 커밋되어 행 잠금이 짧게 유지됨
+"""
+from django.contrib.gis.geos import Point
+from django.db import migrations
+
+BATCH_SIZE = 10000
+
+BACKFILL_SQL = """
+    UPDATE listings
+    SET "위치" = ST_SetSRID(ST_MakePoint("경도", "위도"), 4326)
+    WHERE id >= %s AND id < %s
+      AND "위치" IS NULL
+      AND "위도" IS NOT NULL
+      AND "경도" IS NOT NULL
+"""
+
+
+def backfill_location(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        # 로컬 개발 DB는 데이터가 적으므로 ORM으로 처리
+        Listing = apps.get_model('listings', 'Listing')
+        queryset = Listing.objects.filter(
+            위치__isnull=True, 위도__isnull=False, 경도__isnull=False
+        )
+        for listing in queryset.iterator(chunk_size=BATCH_SIZE):
+            listing.위치 = Point(float(listing.경도), float(listing.위도), srid=4326)
+            listing.save(update_fields=['위치'])
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM listings")
+        min_id, max_id = cursor.fetchone()
+        if min_id is None:
+            return
+        for start in range(min_id, max_id + 1, BATCH_SIZE):
+            cursor.execute(BACKFILL_SQL, [start, start + BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('listings', '0004_listing_위치'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_location, migrations.RunPython.noop),
+    ]
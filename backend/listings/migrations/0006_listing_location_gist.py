@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-17 10:14
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음
+    atomic = False
+
+    dependencies = [
+        ('listings', '0005_backfill_listing_위치'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='listing',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['위치'], name='listings_location_gist'),
+        ),
+    ]
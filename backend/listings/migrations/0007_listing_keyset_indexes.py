@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 11:02
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음
+    atomic = False
+
+    dependencies = [
+        ('listings', '0006_listing_location_gist'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='listing',
+            index=models.Index(fields=['-생성일시', '-id'], name='listings_created_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='listing',
+            index=models.Index(fields=['-조회수', '-id'], name='listings_views_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='listing',
+            index=models.Index(fields=['-찜수', '-id'], name='listings_likes_id_idx'),
+        ),
+    ]
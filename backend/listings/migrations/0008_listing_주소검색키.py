@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-17 11:40
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0007_listing_keyset_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='listing',
+            name='주소검색키',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='주소 검색 키 (정규화된 주소, trigram 인덱스)'),
+        ),
+    ]
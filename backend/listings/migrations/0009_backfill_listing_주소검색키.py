@@ -0,0 +1,81 @@
+"""
+기존 매물의 주소검색키를 채우는 데이터 마이그레이션
+
+- 정규화 규칙은 작성 시점의 listings.search.build_address_search_key를 복사하여 사용
+  (이후 listings.search를 고쳐도 이 마이그레이션의 결과가 바뀌지 않도록)
+- atomic = False + id 구간 배치로 처리하여 긴 잠금 없이 실행
+"""
+import re
+
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+SIDO_SUFFIXES = ('특별자치시', '특별자치도', '특별시', '광역시', '시', '도', '군', '구')
+SIGUNGU_SUFFIXES = ('시', '군', '구')
+MIN_STEM_LENGTH = 2
+ADDRESS_SEPARATOR = '|'
+_TOKEN_SPLIT = re.compile(r'[\s,()]+')
+_HANGUL_ONLY = re.compile(r'^[가-힣]+$')
+
+
+def _strip_admin_suffix(token, suffixes):
+    for suffix in suffixes:
+        if token.endswith(suffix) and len(token) > len(suffix):
+            if len(token) - len(suffix) < MIN_STEM_LENGTH:
+                return token, True
+            return token[:-len(suffix)], True
+    return token, False
+
+
+def normalize_address(text):
+    if not text:
+        return ''
+    tokens = [token for token in _TOKEN_SPLIT.split(text.replace('번지', ' ')) if token]
+    normalized = []
+    in_admin_prefix = True
+    for position, token in enumerate(tokens):
+        if in_admin_prefix and _HANGUL_ONLY.match(token):
+            suffixes = SIDO_SUFFIXES if position == 0 else SIGUNGU_SUFFIXES
+            token, is_admin = _strip_admin_suffix(token, suffixes)
+            in_admin_prefix = is_admin or position == 0
+        else:
+            in_admin_prefix = False
+        normalized.append(token)
+    return ''.join(normalized)
+
+
+def build_address_search_key(*addresses):
+    return ADDRESS_SEPARATOR.join(normalize_address(address) for address in addresses if address)
+
+
+def backfill_address_search_key(apps, schema_editor):
+    Listing = apps.get_model('listings', 'Listing')
+    last_id = 0
+    while True:
+        batch = list(
+            Listing.objects.filter(id__gt=last_id)
+            .order_by('id')
+            .only('id', '주소', '도로명주소', '지번주소')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for listing in batch:
+            listing.주소검색키 = build_address_search_key(
+                listing.주소, listing.도로명주소, listing.지번주소
+            )
+        Listing.objects.bulk_update(batch, ['주소검색키'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('listings', '0008_listing_주소검색키'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_address_search_key, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-17 11:42
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음
+    atomic = False
+
+    dependencies = [
+        ('listings', '0009_backfill_listing_주소검색키'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='listing',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['주소검색키'], name='listings_addr_trgm_gin', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0010_listing_addr_trgm_gin'),
+        ('locations', '0005_busstop_수정일시'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='버스정류장갱신일시',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='버스 정류장 정보 갱신 일시'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+"""
+주소검색키 재계산 데이터 마이그레이션
+
+- 행정구역 접미사 제거 규칙 변경(한 글자 이름 유지, 주소 앞부분의 시/도·시/군/구만 제거)을
+  이미 0009로 채워진 매물에도 반영
+- 0009에 복사해 둔 정규화 규칙과 배치 처리를 그대로 사용
+"""
+from importlib import import_module
+
+from django.db import migrations
+
+backfill = import_module('listings.migrations.0009_backfill_listing_주소검색키')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('listings', '0011_listing_버스정류장갱신일시'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill.backfill_address_search_key, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,33 @@
-from django.db import models
+from django.contrib.gis.db import models  # GeoDjango GIS 모델 사용
+from django.contrib.gis.geos import Point
+from django.contrib.postgres.indexes import GinIndex, GistIndex
 from django.conf import settings
+from django.db import transaction
+
+from .search import build_address_search_key
+from .tiles import MAP_DATA_FIELDS, bump_listing_data_version
+
+# 상세 화면에서만 쓰는 큰 JSON 컬럼 (TOAST 저장) - 목록 조회에서는 읽지 않음
+DETAIL_PAYLOAD_FIELDS = ('QA정보', '버스정류장정보', '지하철역정보', '이미지URLs')
+
+
+class ListingQuerySet(models.QuerySet):
+    def without_payloads(self):
+        """목록용: 상세 전용 JSON 컬럼을 제외한 좁은 행만 조회"""
+        return self.defer(*DETAIL_PAYLOAD_FIELDS)
+
+    def update(self, **kwargs):
+        """신호 없는 일괄 변경이 지도 필드를 바꾸면 타일/격자 셀 캐시 데이터 버전을 올림"""
+        rows = super().update(**kwargs)
+        if rows and MAP_DATA_FIELDS & kwargs.keys():
+            bump_listing_data_version()
+        return rows
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        if rows and MAP_DATA_FIELDS & set(fields):
+            bump_listing_data_version()
+        return rows
 
 
 class Listing(models.Model):
@@ -102,6 +130,12 @@ class Listing(models.Model):
         blank=True,
         verbose_name='지번 주소'
     )
+    주소검색키 = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='주소 검색 키 (정규화된 주소, trigram 인덱스)'
+    )
     상세주소 = models.CharField(
         max_length=200,
         null=True,
@@ -122,6 +156,14 @@ class Listing(models.Model):
         blank=True,
         verbose_name='경도 좌표'
     )
+    # 위도/경도와 동기화되는 공간 좌표 (지도 범위 검색용, GiST 인덱스는 Meta.indexes 참고)
+    위치 = models.PointField(
+        srid=4326,  # WGS84 좌표계
+        null=True,
+        blank=True,
+        spatial_index=False,
+        verbose_name='매물 위치'
+    )
 
     # 관리비 및 주차 정보
     월관리비 = models.IntegerField(
@@ -252,53 +294,6 @@ class Listing(models.Model):
         verbose_name='재계약 가능 여부'
     )
 
-    # 교통 정보 (JSON 필드)
-    대중교통점수 = models.IntegerField(
-        null=True,
-        blank=True,
-        verbose_name='대중교통 편의성 점수(0-10)'
-    )
-    노선다양성점수 = models.IntegerField(
-        null=True,
-        blank=True,
-        verbose_name='노선 다양성 점수(0-5)'
-    )
-    버스정류장정보 = models.JSONField(
-        null=True,
-        blank=True,
-        default=list,
-        verbose_name='버스 정류장 정보'
-    )
-    지하철역정보 = models.JSONField(
-        null=True,
-        blank=True,
-        default=list,
-        verbose_name='지하철역 정보'
-    )
-
-    # 편의시설 정보
-    편의시설요약 = models.TextField(
-        null=True,
-        blank=True,
-        verbose_name='편의시설 및 상권 요약'
-    )
-
-    # 이미지 (JSONField로 여러 이미지 URL 저장)
-    이미지URLs = models.JSONField(
-        null=True,
-        blank=True,
-        default=list,
-        verbose_name='매물 이미지 URL 목록'
-    )
-
-    # Q&A (별도 모델로 분리하는 것이 권장되지만 일단 JSON으로)
-    QA정보 = models.JSONField(
-        null=True,
-        blank=True,
-        default=list,
-        verbose_name='Q&A 정보'
-    )
-
     # 상태 및 통계
     매물상태 = models.CharField(
         max_length=20,
@@ -335,12 +330,20 @@ class Listing(models.Model):
         blank=True,
         verbose_name='노선 다양성 점수(0-5)'
     )
+    # 두 점수는 listings.transit_score 가 bus_stops 격자 인덱스로 일괄 계산
     버스정류장정보 = models.JSONField(
         null=True,
         blank=True,
         verbose_name='버스 정류장 정보'
     )
-    # 예시: [{"stop_name": "선릉역", "distance_m": 180, "bus_numbers": ["146", "341"]}]
+    # 예시: [{"stop_id": "23285", "stop_name": "선릉역", "distance_m": 180}]
+    # listings.bus_stops.refresh_nearby_bus_stops 가 bus_stops 테이블에서 계산
+    버스정류장갱신일시 = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='버스 정류장 정보 갱신 일시'
+    )
 
     지하철역정보 = models.JSONField(
         null=True,
@@ -381,11 +384,81 @@ class Listing(models.Model):
         verbose_name='수정 일시'
     )
 
+    objects = ListingQuerySet.as_manager()
+
     class Meta:
         verbose_name = '매물'
         verbose_name_plural = '매물'
         db_table = 'listings'
         ordering = ['-생성일시']
+        indexes = [
+            GistIndex(fields=['위치'], name='listings_location_gist'),
+            # keyset 페이지네이션용 (정렬필드, id) 복합 인덱스
+            models.Index(fields=['-생성일시', '-id'], name='listings_created_id_idx'),
+            models.Index(fields=['-조회수', '-id'], name='listings_views_id_idx'),
+            models.Index(fields=['-찜수', '-id'], name='listings_likes_id_idx'),
+            # 주소 부분 검색(LIKE '%...%')용 pg_trgm GIN 인덱스
+            GinIndex(fields=['주소검색키'], opclasses=['gin_trgm_ops'], name='listings_addr_trgm_gin'),
+        ]
 
     def __str__(self):
         return f"{self.get_매물타입_display()} - {self.주소}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 저장 시 좌표 이동 여부를 판단하기 위해 DB에서 읽은 좌표 보관
+        instance._loaded_coordinates = (
+            instance.__dict__.get('위도'),
+            instance.__dict__.get('경도'),
+        )
+        return instance
+
+    @property
+    def loaded_coordinates(self):
+        """DB에서 마지막으로 읽은(또는 저장한) (위도, 경도). 새 객체는 (None, None)"""
+        return getattr(self, '_loaded_coordinates', (None, None))
+
+    def save(self, *args, **kwargs):
+        """
+        위도/경도가 바뀌면 위치(PointField)와 버스정류장갱신일시,
+        주소가 바뀌면 주소검색키도 함께 저장
+        좌표가 바뀌었으면 커밋 후 지역ID를 비동기로 다시 판별
+        """
+        self.위치 = self.build_location()
+        self.주소검색키 = build_address_search_key(self.주소, self.도로명주소, self.지번주소)
+        moved = self.loaded_coordinates != (self.위도, self.경도)
+        if moved:
+            # 좌표가 바뀐 매물은 다음 증분 갱신 때 인근 정류장을 다시 계산
+            self.버스정류장갱신일시 = None
+        update_fields = kwargs.get('update_fields')
+        # 좌표를 저장하는 경우에만 지역 판별 (조회수 등 부분 저장에서는 생략)
+        saves_coordinates = update_fields is None or bool({'위도', '경도'} & set(update_fields))
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if {'위도', '경도'} & update_fields:
+                update_fields.add('위치')
+                if moved:
+                    update_fields.add('버스정류장갱신일시')
+            if {'주소', '도로명주소', '지번주소'} & update_fields:
+                update_fields.add('주소검색키')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        if saves_coordinates and moved and self.위도 is not None and self.경도 is not None:
+            self.schedule_region_assignment()
+
+    def schedule_region_assignment(self):
+        """
+        커밋 후 Celery Task로 지역ID 판별 (listings.regions)
+        시도 경계 판별기(locations.resolver)는 워커에서만 메모리에 올리고 요청 안에서는 로드하지 않음
+        """
+        from .tasks import assign_listing_region
+
+        listing_id = self.pk
+        transaction.on_commit(lambda: assign_listing_region.delay(listing_id))
+
+    def build_location(self):
+        """위도/경도로 Point 생성 (좌표가 없으면 None)"""
+        if self.위도 is None or self.경도 is None:
+            return None
+        return Point(float(self.경도), float(self.위도), srid=4326)  # 경도, 위도 순서 주의
@@ -0,0 +1,143 @@
+# backend/listings/pagination.py
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class ListingKeysetPagination(BasePagination):
+    """
+    매물 목록 keyset(cursor) 페이지네이션
+
+    - (정렬필드, id) 복합 키 기준으로 다음 페이지를 조회하므로
+      깊은 페이지도 첫 페이지와 같은 비용 (OFFSET 없음)
+    - 정렬필드: 생성일시(기본), 조회수, 찜수 - 각각 (필드, id) 복합 인덱스 사용
+    - 같은 정렬값은 id로 순서를 정하므로 값이 바뀌지 않는 한 누락/중복 없음
+    - 목록은 항상 페이지 단위로 응답 (요청당 최대 max_page_size건),
+      단 bounds 지도 요청에 cursor/page_size가 없으면 뷰가 자체 상한(MAP_LISTING_LIMIT)으로 응답
+    - 조회수(Redis 카운터 flush로 갱신)/찜수는 페이지를 넘기는 사이에 바뀔 수 있음: cursor에는 이전 페이지
+      마지막 행의 당시 값이 들어가므로, 그 사이 값이 바뀐 행은 다음 페이지에서 누락되거나
+      다시 나올 수 있음 (생성일시 정렬은 값이 바뀌지 않아 안정적)
+
+    GET /api/listings?page_size=100&ordering=-조회수
+    GET /api/listings?cursor=<next 링크의 cursor>
+    """
+    page_size = 200
+    max_page_size = 1000
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    ordering_fields = ('생성일시', '조회수', '찜수')
+    default_ordering = '-생성일시'
+
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(request)
+
+        sign = '-' if self.descending else ''
+        queryset = queryset.order_by(f'{sign}{self.field}', f'{sign}id')
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.get_cursor_filter(*cursor))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        self.next_position = None
+        if self.has_next and results:
+            last = results[-1]
+            self.next_position = (getattr(last, self.field), last.id)
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'listings': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['listings'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'listings': schema,
+            },
+        }
+
+    def is_requested(self, request):
+        """cursor/page_size 파라미터로 페이지를 명시적으로 요청했는지"""
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        """ordering 파라미터의 첫 번째 유효한 항목 → (필드명, 내림차순 여부)"""
+        raw = request.query_params.get(self.ordering_query_param, '')
+        for term in [t.strip() for t in raw.split(',') if t.strip()]:
+            if term.lstrip('-') in self.ordering_fields:
+                return term.lstrip('-'), term.startswith('-')
+        return self.default_ordering.lstrip('-'), self.default_ordering.startswith('-')
+
+    def get_cursor_filter(self, value, pk):
+        """
+        (필드, id) < (value, pk) 조건 (오름차순이면 >)
+        선행 조건 필드 <= value 덕분에 복합 인덱스 범위 스캔이 가능
+        """
+        if self.descending:
+            return Q(**{f'{self.field}__lte': value}) & (
+                Q(**{f'{self.field}__lt': value}) | Q(id__lt=pk)
+            )
+        return Q(**{f'{self.field}__gte': value}) & (
+            Q(**{f'{self.field}__gt': value}) | Q(id__gt=pk)
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            field, value, pk = decoded
+            if field != self.field:
+                raise ValueError
+            if field == '생성일시':
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError
+            else:
+                value = int(value)
+            return value, int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, value, pk):
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        raw = json.dumps([self.field, value, pk]).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(*self.next_position))
@@ -0,0 +1,82 @@
+# backend/listings/regions.py
+"""
+매물 좌표 → 지역ID(locations.Region) 일괄 배정
+
+- id 구간(청크) 단위로 좌표/주소를 읽어 locations.resolver로 한 번에 판별 후, 바뀐 매물만 bulk_update
+- 판별에 실패한 매물(경계 밖, 주소에 읍면동 없음 등)은 기존 지역ID 유지
+- shapely가 없으면 시도 판별을 청크당 쿼리 한 번(ST_Contains 서브쿼리)으로 처리
+- assign_listing_regions 명령어가 프로세스 풀에서 청크별로 병렬 실행
+- 매물 저장 시에는 assign_listing_region Celery Task가 커밋 후 해당 매물 하나만 처리
+"""
+import os
+
+import numpy as np
+from django.db.models import OuterRef, Subquery
+
+from locations.models import Sido
+from locations.resolver import NO_SIDO, get_region_resolver
+
+from .models import Listing
+
+CHUNK_SIZE = 20000
+BULK_UPDATE_BATCH_SIZE = 2000
+
+ADDRESS_FIELDS = ('주소', '도로명주소', '지번주소')
+
+
+def init_region_worker():
+    """
+    프로세스 풀 워커 초기화 (spawn 환경에서 Django 설정 후 판별기 로드)
+    fork 환경에서 DB 연결을 물려받지 않도록 호출측은 풀 생성 전에 connections.close_all() 호출
+    """
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+    get_region_resolver()
+
+
+def assign_regions_for_range(start_id, end_id, resolver=None):
+    """
+    id 구간 [start_id, end_id) 매물의 지역ID를 다시 판별하여 바뀐 매물만 bulk_update
+
+    Returns:
+        tuple: (갱신된 매물 수, 판별하지 못한 매물 수)
+    """
+    if resolver is None:
+        resolver = get_region_resolver()
+
+    queryset = Listing.objects.filter(id__gte=start_id, id__lt=end_id).order_by()
+    fields = ['id', '위도', '경도', '지역ID', *ADDRESS_FIELDS]
+    if not resolver.has_geometry:
+        queryset = queryset.annotate(
+            sido_id=Subquery(
+                Sido.objects.filter(geom__contains=OuterRef('위치')).order_by('id').values('id')[:1]
+            )
+        )
+        fields.append('sido_id')
+    rows = list(queryset.values(*fields))
+    if not rows:
+        return 0, 0
+
+    if resolver.has_geometry:
+        lats = np.array([row['위도'] if row['위도'] is not None else np.nan for row in rows], dtype=np.float64)
+        lngs = np.array([row['경도'] if row['경도'] is not None else np.nan for row in rows], dtype=np.float64)
+        sido_ids = resolver.resolve_sido_ids(lats, lngs)
+    else:
+        sido_ids = [row['sido_id'] if row['sido_id'] is not None else NO_SIDO for row in rows]
+
+    changed = []
+    unresolved = 0
+    for row, sido_id in zip(rows, sido_ids):
+        region_id = None
+        if sido_id != NO_SIDO:
+            region_id = resolver.resolve_region_id(int(sido_id), *(row[field] for field in ADDRESS_FIELDS))
+        if region_id is None:
+            unresolved += 1
+        elif region_id != row['지역ID']:
+            changed.append(Listing(id=row['id'], 지역ID_id=region_id))
+
+    if changed:
+        Listing.objects.bulk_update(changed, ['지역ID'], batch_size=BULK_UPDATE_BATCH_SIZE)
+    return len(changed), unresolved
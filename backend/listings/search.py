@@ -0,0 +1,85 @@
+# backend/listings/search.py
+"""
+한국어 주소 검색
+
+- 주소/도로명주소/지번주소를 정규화하여 Listing.주소검색키 한 컬럼에 저장
+- 주소검색키에 pg_trgm GIN 인덱스가 있어 LIKE '%...%' 검색이 인덱스를 탐
+"""
+import re
+
+from rest_framework import filters
+
+# 긴 접미사부터 검사 (특별시 → 시 순서)
+# 첫 토큰(시/도 자리)은 시도·시군구 접미사 모두, 이어지는 토큰은 시/군/구 접미사만 제거
+SIDO_SUFFIXES = ('특별자치시', '특별자치도', '특별시', '광역시', '시', '도', '군', '구')
+SIGUNGU_SUFFIXES = ('시', '군', '구')
+# 접미사를 뗀 나머지가 이보다 짧으면 그대로 둠 (중구 → 중 이면 trigram 인덱스를 못 쓰고 거의 모든 행과 일치)
+MIN_STEM_LENGTH = 2
+ADDRESS_SEPARATOR = '|'
+_TOKEN_SPLIT = re.compile(r'[\s,()]+')
+_HANGUL_ONLY = re.compile(r'^[가-힣]+$')
+
+
+def _strip_admin_suffix(token, suffixes):
+    """
+    행정구역 접미사 제거
+
+    Returns:
+        tuple: (결과 토큰, 행정구역 토큰인지)
+    """
+    for suffix in suffixes:
+        if token.endswith(suffix) and len(token) > len(suffix):
+            if len(token) - len(suffix) < MIN_STEM_LENGTH:
+                return token, True
+            return token[:-len(suffix)], True
+    return token, False
+
+
+def normalize_address(text):
+    """
+    주소 문자열 정규화
+    - 공백/괄호/쉼표 제거, '번지' 제거
+    - 주소 앞부분의 시/도, 시/군/구 행정구역 접미사 제거 (서울특별시 → 서울, 강남구 → 강남)
+      동/로/길 이후 토큰은 그대로 두고, 남는 이름이 한 글자면 떼지 않음 (중구, 영도 유지)
+
+    예: "서울특별시 강남구 역삼동 123-4번지" → "서울강남역삼동123-4"
+    """
+    if not text:
+        return ''
+    tokens = [token for token in _TOKEN_SPLIT.split(text.replace('번지', ' ')) if token]
+    normalized = []
+    in_admin_prefix = True
+    for position, token in enumerate(tokens):
+        if in_admin_prefix and _HANGUL_ONLY.match(token):
+            suffixes = SIDO_SUFFIXES if position == 0 else SIGUNGU_SUFFIXES
+            token, is_admin = _strip_admin_suffix(token, suffixes)
+            # 첫 토큰은 "서울"처럼 접미사 없는 시도명일 수 있으므로 다음 토큰도 시군구로 검사
+            in_admin_prefix = is_admin or position == 0
+        else:
+            in_admin_prefix = False
+        normalized.append(token)
+    return ''.join(normalized)
+
+
+def build_address_search_key(*addresses):
+    """여러 주소를 정규화하여 하나의 검색 키로 결합 (주소 간 경계를 넘는 매칭 방지)"""
+    return ADDRESS_SEPARATOR.join(normalize_address(address) for address in addresses if address)
+
+
+class AddressSearchFilter(filters.SearchFilter):
+    """
+    ?search= 검색어를 주소 정규화 규칙으로 변환하여 주소검색키에서 검색
+
+    각 검색어는 AND 조건이며, 검색어별로 주소검색키 LIKE '%검색어%' 한 번만 수행
+    (주소 3개 컬럼 ILIKE 대신 trigram 인덱스 사용)
+    """
+    search_key_field = '주소검색키'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = [normalize_address(term) for term in self.get_search_terms(request)]
+        terms = [term for term in terms if term]
+        if not terms:
+            return queryset
+        for term in terms:
+            queryset = queryset.filter(**{f'{self.search_key_field}__contains': term})
+        return queryset
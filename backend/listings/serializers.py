@@ -1,3 +1,6 @@
+from decimal import Decimal
+
+from django.db.models.fields.json import KeyTransform
 from rest_framework import serializers
 from .models import Listing
 
@@ -63,6 +66,91 @@ class ListingListSerializer(serializers.ModelSerializer):
         return None
 
 
+# ============================================================================
+# 지도 핀용 고속 직렬화 경로 (ListingListSerializer와 바이트 단위로 동일한 출력)
+# ============================================================================
+
+# values_list로 가져올 최소 컬럼 (first_image는 이미지URLs->0 어노테이션)
+LIST_ROW_FIELDS = (
+    'id', '매물타입', '매매가', '전세보증금', '월세보증금', '월세',
+    '주소', '위도', '경도', '주택종류', 'first_image',
+)
+LISTING_TYPE_LABELS = dict(Listing.LISTING_TYPE_CHOICES)
+_EIGHT_PLACES = Decimal('0.00000001')
+
+
+def _sale_prices(row):
+    if row.매매가:
+        return f"{row.매매가 / 100000000:.1f}억", f"{row.매매가 / 100000000:.2f}억"
+    return None
+
+
+def _jeonse_prices(row):
+    if row.전세보증금:
+        return f"{row.전세보증금 / 100000000:.1f}억", f"{row.전세보증금 / 100000000:.2f}억"
+    return None
+
+
+def _monthly_prices(row):
+    if row.월세:
+        deposit = f"{row.월세보증금 / 10000:.0f}" if row.월세보증금 else "0"
+        text = f"{deposit}/{row.월세 / 10000:.0f}"
+        return text, text
+    return None
+
+
+# 매물타입 → (제목용 가격, 가격) 포맷터
+PRICE_FORMATTERS = {
+    'sale': _sale_prices,
+    'jeonse': _jeonse_prices,
+    'monthly': _monthly_prices,
+}
+
+
+def _coordinate_text(value):
+    """DRF DecimalField(decimal_places=8)와 동일한 문자열 표현"""
+    if value is None:
+        return None
+    return format(value.quantize(_EIGHT_PLACES), 'f')
+
+
+def listing_list_rows(queryset, extra_fields=()):
+    """
+    목록 응답에 필요한 컬럼만 named tuple 행으로 조회
+    (이미지 목록 JSON 전체 대신 첫 번째 원소만 DB에서 추출)
+    """
+    return queryset.annotate(
+        first_image=KeyTransform(0, '이미지URLs')
+    ).values_list(*LIST_ROW_FIELDS, *extra_fields, named=True)
+
+
+def serialize_listing_rows(rows):
+    """
+    listing_list_rows() 결과를 지도 핀 응답용 dict 목록으로 변환
+
+    DRF 필드 객체/SerializerMethodField를 거치지 않지만
+    ListingListSerializer와 같은 JSON을 만든다.
+    """
+    labels = LISTING_TYPE_LABELS
+    formatters = PRICE_FORMATTERS
+    data = []
+    for row in rows:
+        formatter = formatters.get(row.매물타입)
+        prices = formatter(row) if formatter else None
+        title_price, price = prices or ("-", "-")
+        data.append({
+            'id': str(row.id),
+            'title': f"{labels.get(row.매물타입, row.매물타입)} {title_price}",
+            'price': price,
+            'addr': row.주소,
+            'lat': _coordinate_text(row.위도),
+            'lng': _coordinate_text(row.경도),
+            'img': row.first_image,
+            'type': row.주택종류,
+        })
+    return data
+
+
 class ListingDetailSerializer(serializers.ModelSerializer):
     """
     매물 상세 정보용 Serializer
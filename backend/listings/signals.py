@@ -0,0 +1,36 @@
+# backend/listings/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .bbox_cache import invalidate_cells_for_points
+from .models import Listing
+from .tiles import invalidate_tiles_for_points
+
+
+@receiver(post_save, sender=Listing)
+def listing_post_save(sender, instance, **kwargs):
+    """
+    Listing 저장 후 신호 처리
+    - 이전 좌표와 새 좌표를 포함하는 벡터 타일/격자 셀 캐시만 무효화
+    """
+    points = [instance.loaded_coordinates, (instance.위도, instance.경도)]
+    try:
+        invalidate_tiles_for_points(points)
+        invalidate_cells_for_points(points)
+    except Exception as e:
+        print(f"Error in listing_post_save signal: {e}")
+    instance._loaded_coordinates = (instance.위도, instance.경도)
+
+
+@receiver(post_delete, sender=Listing)
+def listing_post_delete(sender, instance, **kwargs):
+    """
+    Listing 삭제 후 신호 처리
+    - 삭제된 매물 좌표를 포함하는 벡터 타일/격자 셀 캐시 무효화
+    """
+    points = [instance.loaded_coordinates, (instance.위도, instance.경도)]
+    try:
+        invalidate_tiles_for_points(points)
+        invalidate_cells_for_points(points)
+    except Exception as e:
+        print(f"Error in listing_post_delete signal: {e}")
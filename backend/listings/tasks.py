@@ -0,0 +1,131 @@
+# backend/listings/tasks.py
+from typing import Dict, Any
+
+try:
+    from celery import group, shared_task
+except ImportError:
+    # Celery가 설치되지 않은 경우를 위한 대체
+    group = None
+
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+from .bus_stops import DEFAULT_RADIUS_M, DEFAULT_STOP_LIMIT, refresh_nearby_bus_stops
+from .counters import flush_view_counts
+from .regions import assign_regions_for_range
+from .transit_score import CHUNK_SIZE, listing_id_chunks, recompute_transit_scores_for_range
+
+
+@shared_task(name='listings.flush_listing_view_counts')
+def flush_listing_view_counts() -> Dict[str, Any]:
+    """
+    Redis에 누적된 매물 조회수를 listings 테이블에 반영하는 Celery beat Task
+    (주기: settings.LISTING_VIEW_FLUSH_INTERVAL 초)
+    """
+    try:
+        flushed = flush_view_counts()
+        return {
+            'status': 'success',
+            'flushed_listings': flushed,
+        }
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': f'조회수 반영 중 오류 발생: {str(e)}'
+        }
+
+
+@shared_task(name='listings.assign_listing_region')
+def assign_listing_region(listing_id: int) -> Dict[str, Any]:
+    """
+    좌표가 바뀐 매물 하나의 지역ID를 다시 판별하는 Celery Task (Listing.save에서 커밋 후 예약)
+    판별기는 워커 프로세스에 한 번 로드되어 재사용됨
+    """
+    try:
+        updated, unresolved = assign_regions_for_range(listing_id, listing_id + 1)
+        return {
+            'status': 'success',
+            'listing_id': listing_id,
+            'updated': bool(updated),
+            'resolved': not unresolved,
+        }
+    except Exception as e:
+        return {
+            'status': 'error',
+            'listing_id': listing_id,
+            'message': f'지역 판별 중 오류 발생: {str(e)}'
+        }
+
+
+@shared_task(name='listings.refresh_listing_bus_stops')
+def refresh_listing_bus_stops(full: bool = False, stop_limit: int = DEFAULT_STOP_LIMIT,
+                              radius_m: int = DEFAULT_RADIUS_M) -> Dict[str, Any]:
+    """
+    매물별 인근 버스정류장 정보를 갱신하는 Celery Task
+    (기본은 좌표가 바뀐 매물과 주변 정류장이 바뀐 매물만 증분 갱신)
+    """
+    try:
+        updated = refresh_nearby_bus_stops(full=full, stop_limit=stop_limit, radius_m=radius_m)
+        return {
+            'status': 'success',
+            'updated_listings': updated,
+        }
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': f'인근 버스정류장 갱신 중 오류 발생: {str(e)}'
+        }
+
+
+@shared_task(name='listings.recompute_listing_transit_scores_chunk')
+def recompute_listing_transit_scores_chunk(start_id: int, end_id: int) -> Dict[str, Any]:
+    """매물 id 구간 [start_id, end_id)의 대중교통점수/노선다양성점수 재계산"""
+    try:
+        updated = recompute_transit_scores_for_range(start_id, end_id)
+        return {
+            'status': 'success',
+            'start_id': start_id,
+            'end_id': end_id,
+            'updated_listings': updated,
+        }
+    except Exception as e:
+        return {
+            'status': 'error',
+            'start_id': start_id,
+            'end_id': end_id,
+            'message': f'대중교통점수 계산 중 오류 발생: {str(e)}'
+        }
+
+
+@shared_task(name='listings.recompute_listing_transit_scores')
+def recompute_listing_transit_scores(chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    전체 매물 대중교통점수/노선다양성점수 재계산 Celery Task
+    id 구간별 청크 Task를 group으로 분배하여 워커 프로세스들이 병렬 처리
+    """
+    try:
+        chunks = listing_id_chunks(chunk_size)
+        if group is None:
+            # Celery가 없으면 현재 프로세스에서 순서대로 처리
+            updated = sum(recompute_transit_scores_for_range(start, end) for start, end in chunks)
+            return {
+                'status': 'success',
+                'chunks': len(chunks),
+                'updated_listings': updated,
+            }
+
+        result = group(
+            recompute_listing_transit_scores_chunk.s(start, end) for start, end in chunks
+        ).apply_async()
+        return {
+            'status': 'success',
+            'chunks': len(chunks),
+            'group_id': result.id,
+        }
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': f'대중교통점수 재계산 분배 중 오류 발생: {str(e)}'
+        }
@@ -1,3 +1,259 @@
-from django.test import TestCase
+from collections import namedtuple
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from listings.bbox_cache import MAX_CELLS_PER_REQUEST, cell_cache_key, cells_digest, cells_for_bounds, listings_from_cells
+from listings.conditional import content_etag
+from listings.geo import cluster_listings, parse_bounds
+from listings.models import Listing
+from listings.pagination import ListingKeysetPagination
+from listings.search import build_address_search_key, normalize_address
+from listings.serializers import LIST_ROW_FIELDS, ListingListSerializer, serialize_listing_rows
+from listings.tiles import bump_listing_data_version, is_valid_tile, tile_cache_key, tile_for_point
+from listings.transit_score import compute_transit_scores
+from locations.spatial_index import BusStopGridIndex
+from users.models import UserProfile
+
+
+class TileMathTestCase(SimpleTestCase):
+    def test_tile_for_point(self):
+        """서울 시청 좌표의 타일 좌표"""
+        self.assertEqual(tile_for_point(37.5665, 126.9780, 0), (0, 0))
+        self.assertEqual(tile_for_point(37.5665, 126.9780, 10), (873, 396))
+
+    def test_is_valid_tile(self):
+        """줌/타일 좌표 범위 검증"""
+        self.assertTrue(is_valid_tile(10, 873, 396))
+        self.assertFalse(is_valid_tile(1, 2, 0))
+        self.assertFalse(is_valid_tile(25, 0, 0))
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ListingDataVersionTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_rolls_over_tile_and_cell_keys(self):
+        tile_key = tile_cache_key(10, 873, 396)
+        cell_key = cell_cache_key((3750, 12700))
+        self.assertEqual(tile_cache_key(10, 873, 396), tile_key)
+
+        bump_listing_data_version()
+        self.assertNotEqual(tile_cache_key(10, 873, 396), tile_key)
+        self.assertNotEqual(cell_cache_key((3750, 12700)), cell_key)
+
+        bumped = tile_cache_key(10, 873, 396)
+        bump_listing_data_version()
+        self.assertNotEqual(tile_cache_key(10, 873, 396), bumped)
+
+
+class BoundsCellTestCase(SimpleTestCase):
+    def test_parse_bounds_rejects_non_finite_and_out_of_range(self):
+        self.assertEqual(parse_bounds("37.5,127.0,37.6,127.1"), (37.5, 127.0, 37.6, 127.1))
+        for raw in ("nan,127,37.6,127.1", "37.5,-inf,37.6,127.1", "37.5,127,91,127.1", "37.5,127,37.6,181"):
+            with self.assertRaises(ValueError):
+                parse_bounds(raw)
+
+    def test_cells_for_bounds_rejects_wide_bounds_without_building_list(self):
+        self.assertIsNone(cells_for_bounds((-90.0, -180.0, 90.0, 180.0)))
+        self.assertIsNone(cells_for_bounds((37.6, 127.0, 37.5, 127.1)))
+        cells = cells_for_bounds((37.5, 127.0, 37.52, 127.02))
+        self.assertLessEqual(len(cells), MAX_CELLS_PER_REQUEST)
+        self.assertIn((3750, 12700), cells)
+
+
+class ContentETagTestCase(SimpleTestCase):
+    def test_content_etag_follows_payload_and_params(self):
+        request = Request(APIRequestFactory().get('/api/listings/', {'bounds': '37.5,127.0,37.6,127.1'}))
+        other = Request(APIRequestFactory().get('/api/listings/', {'bounds': '37.5,127.0,37.7,127.1'}))
+        cells_data = [{'digest': 'a', 'entries': []}, {'digest': 'b', 'entries': []}]
+        refilled = [{'digest': 'a', 'entries': []}, {'digest': 'c', 'entries': []}]
+        digest = cells_digest(cells_data)
+        self.assertEqual(content_etag(request, digest), content_etag(request, cells_digest(list(cells_data))))
+        self.assertNotEqual(content_etag(request, digest), content_etag(request, cells_digest(refilled)))
+        self.assertNotEqual(content_etag(request, digest), content_etag(other, digest))
+
+    def test_listings_from_cells_clips_and_orders(self):
+        cells_data = [
+            {'digest': 'a', 'entries': [(37.501, 127.001, 10.0, 1, {'id': '1'}), (37.49, 127.001, 30.0, 4, {'id': '4'})]},
+            {'digest': 'b', 'entries': [(37.502, 127.002, 20.0, 2, {'id': '2'}), (37.503, 127.003, 20.0, 3, {'id': '3'})]},
+        ]
+        listings = listings_from_cells(cells_data, (37.5, 127.0, 37.51, 127.01))
+        self.assertEqual([item['id'] for item in listings], ['3', '2', '1'])
+
+
+def _list_request(params):
+    return Request(APIRequestFactory().get('/api/listings/', params))
+
+
+class KeysetCursorTestCase(SimpleTestCase):
+    def test_cursor_round_trip(self):
+        created = timezone.now().replace(microsecond=123456)
+        for ordering, value in (('-생성일시', created), ('조회수', 42)):
+            paginator = ListingKeysetPagination()
+            paginator.field, paginator.descending = paginator.get_ordering(_list_request({'ordering': ordering}))
+            cursor = paginator.encode_cursor(value, 7)
+            request = _list_request({'ordering': ordering, 'cursor': cursor})
+            self.assertEqual(paginator.decode_cursor(request), (value, 7))
+
+    def test_cursor_for_other_ordering_is_rejected(self):
+        paginator = ListingKeysetPagination()
+        paginator.field, paginator.descending = '조회수', True
+        cursor = paginator.encode_cursor(42, 7)
+        paginator.field = '찜수'
+        with self.assertRaises(NotFound):
+            paginator.decode_cursor(_list_request({'cursor': cursor}))
+        with self.assertRaises(NotFound):
+            paginator.decode_cursor(_list_request({'cursor': 'not-a-cursor'}))
+
+
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        profile = UserProfile.objects.create(user=get_user_model().objects.create(username='owner'))
+        self.ids = [
+            Listing.objects.create(
+                등록사용자ID=profile, 매물타입='sale', 주택종류='apartment', 주소=f'테스트 주소 {i}',
+            ).id
+            for i in range(5)
+        ]
+        # 같은 정렬값이면 id로 순서가 정해져야 함
+        Listing.objects.filter(id__in=self.ids[:4]).update(조회수=10)
+        Listing.objects.filter(id=self.ids[4]).update(조회수=3)
+
+    def _walk(self, params):
+        seen = []
+        cursor = None
+        while True:
+            paginator = ListingKeysetPagination()
+            page_params = dict(params, page_size=2, **({'cursor': cursor} if cursor else {}))
+            page = paginator.paginate_queryset(Listing.objects.all(), _list_request(page_params))
+            seen.extend(listing.id for listing in page)
+            if paginator.next_position is None:
+                return seen
+            cursor = paginator.encode_cursor(*paginator.next_position)
+
+    def test_ties_broken_by_id_without_gaps_or_repeats(self):
+        self.assertEqual(self._walk({'ordering': '-조회수'}), sorted(self.ids[:4], reverse=True) + [self.ids[4]])
+        self.assertEqual(self._walk({'ordering': '조회수'}), [self.ids[4]] + sorted(self.ids[:4]))
+
+    def test_request_without_page_params_is_paginated(self):
+        paginator = type('SmallPages', (ListingKeysetPagination,), {'page_size': 2})()
+        page = paginator.paginate_queryset(Listing.objects.all(), _list_request({}))
+        self.assertEqual([listing.id for listing in page], sorted(self.ids, reverse=True)[:2])
+        self.assertIsNotNone(paginator.next_position)
+
+
+class ClusterListingsTestCase(TestCase):
+    def setUp(self):
+        profile = UserProfile.objects.create(user=get_user_model().objects.create(username='owner'))
+        # 줌 10 격자(약 0.082도)에서 서울 두 매물은 같은 칸, 부산 매물은 다른 칸
+        for 매물타입, prices, lat, lng in (
+            ('sale', {'매매가': 300000000}, '37.50000000', '127.00000000'),
+            ('jeonse', {'전세보증금': 200000000}, '37.51000000', '127.01000000'),
+            ('sale', {'매매가': 500000000}, '35.10000000', '129.04000000'),
+        ):
+            Listing.objects.create(
+                등록사용자ID=profile, 매물타입=매물타입, 주택종류='apartment', 주소='테스트 주소',
+                위도=Decimal(lat), 경도=Decimal(lng), **prices,
+            )
+        Listing.objects.create(등록사용자ID=profile, 매물타입='sale', 주택종류='apartment', 주소='좌표 없음')
+
+    def _clusters(self):
+        return sorted(cluster_listings(Listing.objects.all(), 10), key=lambda cluster: cluster['lat'])
+
+    def _assert_clusters(self, clusters):
+        self.assertEqual(clusters, [
+            {'count': 1, 'lat': 35.1, 'lng': 129.04, 'min_price': 500000000, 'max_price': 500000000},
+            {'count': 2, 'lat': 37.505, 'lng': 127.005, 'min_price': 200000000, 'max_price': 300000000},
+        ])
+
+    def test_snap_to_grid_clusters(self):
+        self._assert_clusters(self._clusters())
+
+    def test_floor_fallback_without_gis(self):
+        with mock.patch.object(connection.features, 'gis_enabled', False):
+            self._assert_clusters(self._clusters())
+
+
+class ListingListFastPathTestCase(SimpleTestCase):
+    def _sample(self, **values):
+        Row = namedtuple('Row', LIST_ROW_FIELDS)
+        base = {
+            'id': 1, '매물타입': 'sale', '매매가': None, '전세보증금': None,
+            '월세보증금': None, '월세': None, '주소': '서울특별시 강남구 테헤란로 123',
+            '위도': Decimal('37.50000000'), '경도': Decimal('127.03000000'),
+            '주택종류': 'apartment',
+        }
+        base.update(values)
+        images = base.pop('images', [])
+        listing = Listing(이미지URLs=images, **base)
+        row = Row(first_image=images[0] if images else None, **base)
+        return listing, row
+
+    def test_output_matches_serializer(self):
+        """고속 경로와 ListingListSerializer의 JSON 출력이 바이트 단위로 같아야 함"""
+        samples = [
+            self._sample(id=1, 매물타입='sale', 매매가=255000000, images=['/images/house1.jpg']),
+            self._sample(id=2, 매물타입='jeonse', 전세보증금=320000000),
+            self._sample(id=3, 매물타입='monthly', 월세보증금=10000000, 월세=650000),
+            self._sample(id=4, 매물타입='monthly', 월세보증금=None, 월세=450000),
+            self._sample(id=5, 매물타입='sale', 매매가=None, 위도=None, 경도=None),
+        ]
+        listings = [listing for listing, _ in samples]
+        rows = [row for _, row in samples]
+
+        renderer = JSONRenderer()
+        expected = renderer.render(ListingListSerializer(listings, many=True).data)
+        actual = renderer.render(serialize_listing_rows(rows))
+        self.assertEqual(actual, expected)
+
+
+class AddressNormalizeTestCase(SimpleTestCase):
+    def test_normalize_address(self):
+        """공백, 행정구역 접미사, 번지 제거"""
+        self.assertEqual(normalize_address('서울특별시 강남구 역삼동 123-4번지'), '서울강남역삼동123-4')
+        self.assertEqual(normalize_address('경기도 수원시 팔달구 (인계동)'), '경기수원팔달인계동')
+        self.assertEqual(normalize_address(None), '')
+
+    def test_single_syllable_stems_and_non_admin_tokens_kept(self):
+        """남는 이름이 한 글자인 행정구역과 동/로 이후 토큰은 접미사를 떼지 않음"""
+        self.assertEqual(normalize_address('서울특별시 중구 을지로'), '서울중구을지로')
+        self.assertEqual(normalize_address('부산광역시 영도구'), '부산영도')
+        self.assertEqual(normalize_address('서울 동작구 상도동'), '서울동작상도동')
+        self.assertEqual(normalize_address('중구'), '중구')
+        self.assertEqual(normalize_address('영도'), '영도')
+
+    def test_query_matches_search_key(self):
+        """정규화된 검색어는 정규화된 주소의 부분 문자열이어야 함"""
+        key = build_address_search_key('서울특별시 강남구 테헤란로 123', None, '서울시 강남구 역삼동 737')
+        self.assertIn(normalize_address('강남구 테헤란로'), key)
+        self.assertIn(normalize_address('강남구 역삼동 737번지'), key)
+
+
+class TransitScoreTestCase(SimpleTestCase):
+    def test_scores(self):
+        """정류장이 많고 가까울수록 높은 점수, 같은 이름의 정류장은 다양성에 한 번만 반영"""
+        index = BusStopGridIndex.from_records([
+            ('1', '강남역', 37.4979, 127.0276),
+            ('2', '강남역', 37.4981, 127.0279),
+            ('3', '역삼역', 37.5006, 127.0364),
+            ('4', '신논현역', 37.5045, 127.0250),
+        ])
+        transit, diversity = compute_transit_scores(
+            [37.4980, 37.5000, 36.0], [127.0277, 127.0300, 127.0], index
+        )
+        self.assertGreater(transit[0], transit[1])
+        self.assertEqual((transit[2], diversity[2]), (0, 0))
+        self.assertTrue(all(0 <= score <= 10 for score in transit))
+        self.assertTrue(all(0 <= score <= 5 for score in diversity))
+        self.assertLessEqual(diversity[0], diversity[1])
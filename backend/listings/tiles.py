@@ -0,0 +1,137 @@
+# backend/listings/tiles.py
+"""
+매물 Mapbox Vector Tile(MVT) 생성 및 타일 캐시
+
+- 타일은 PostGIS ST_AsMVT로 생성
+- 캐시 키: listing_tile:v{스키마 버전}:d{데이터 버전}:{z}:{x}:{y}
+- 매물 저장/삭제 시 해당 좌표를 포함하는 타일만 줌 레벨별로 무효화
+- 신호가 없는 일괄 변경(QuerySet.update / bulk_update)이 지도에 보이는 필드를 바꾸면
+  데이터 버전(Redis)을 올려 모든 타일을 한 번에 새로 만듦 (ListingQuerySet 참고)
+"""
+import math
+import time
+
+from django.core.cache import cache
+from django.db import connection
+
+TILE_MIN_ZOOM = 0
+TILE_MAX_ZOOM = 18
+TILE_CACHE_PREFIX = "listing_tile"
+# 타일 스키마(속성 구성)가 바뀌면 올려서 기존 캐시를 모두 무시
+TILE_CACHE_VERSION = 1
+TILE_CACHE_TIMEOUT_SECONDS = 24 * 60 * 60
+LISTING_DATA_VERSION_KEY = "listing_map_data_version"
+# 타일/지도 핀 응답에 쓰이는 필드 - 일괄 변경이 이 필드를 건드리면 데이터 버전을 올림
+# (조회수 flush, 지역ID/대중교통점수 배정 등은 지도 응답과 무관하므로 버전을 올리지 않음)
+MAP_DATA_FIELDS = frozenset({
+    '위도', '경도', '위치', '매물타입', '주택종류', '매매가', '전세보증금', '월세보증금', '월세',
+    '주소', '이미지URLs', '활성화여부', '매물상태', '생성일시',
+})
+TILE_LAYER_NAME = "listings"
+
+TILE_SQL = """
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom
+    ),
+    mvtgeom AS (
+        SELECT
+            ST_AsMVTGeom(ST_Transform(l."위치", 3857), bounds.geom) AS geom,
+            l.id,
+            l."매물타입" AS listing_type,
+            l."주택종류" AS house_type,
+            l."매매가" AS sale_price,
+            l."전세보증금" AS jeonse_price,
+            l."월세보증금" AS monthly_deposit,
+            l."월세" AS monthly_rent
+        FROM listings l, bounds
+        WHERE l."위치" && ST_Transform(bounds.geom, 4326)
+          AND l."활성화여부" = TRUE
+          AND l."매물상태" = 'available'
+    )
+    SELECT ST_AsMVT(mvtgeom.*, %(layer)s) FROM mvtgeom
+"""
+
+
+def is_valid_tile(z, x, y):
+    """줌 범위와 타일 좌표 범위 검증"""
+    if not TILE_MIN_ZOOM <= z <= TILE_MAX_ZOOM:
+        return False
+    n = 2 ** z
+    return 0 <= x < n and 0 <= y < n
+
+
+def tile_for_point(lat, lng, z):
+    """위도/경도를 포함하는 z 레벨 타일 좌표 (x, y) 반환 (Web Mercator slippy map 규칙)"""
+    n = 2 ** z
+    lat = max(min(float(lat), 85.05112878), -85.05112878)
+    lat_rad = math.radians(lat)
+    x = int((float(lng) + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def get_listing_data_version():
+    """매물 지도 데이터 버전 (캐시에 없으면 현재 시각(ms)으로 시작하여 이전 값과 겹치지 않음)"""
+    version = cache.get(LISTING_DATA_VERSION_KEY)
+    if version is None:
+        cache.add(LISTING_DATA_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(LISTING_DATA_VERSION_KEY, 0)
+    return version
+
+
+def bump_listing_data_version():
+    """신호 없이 지도 데이터가 바뀌었음을 기록 (일괄 변경 후 호출)"""
+    version = int(time.time() * 1000)
+    current = cache.get(LISTING_DATA_VERSION_KEY)
+    if current is not None and current >= version:
+        # 같은 밀리초에 여러 번 올려도 값이 바뀌도록
+        version = current + 1
+    cache.set(LISTING_DATA_VERSION_KEY, version, timeout=None)
+    return version
+
+
+def tile_cache_key(z, x, y, data_version=None):
+    if data_version is None:
+        data_version = get_listing_data_version()
+    return f"{TILE_CACHE_PREFIX}:v{TILE_CACHE_VERSION}:d{data_version}:{z}:{x}:{y}"
+
+
+def render_tile(z, x, y):
+    """DB에서 MVT 타일 생성"""
+    with connection.cursor() as cursor:
+        cursor.execute(TILE_SQL, {'z': z, 'x': x, 'y': y, 'layer': TILE_LAYER_NAME})
+        row = cursor.fetchone()
+    if not row or row[0] is None:
+        return b""
+    return bytes(row[0])
+
+
+def get_tile(z, x, y):
+    """캐시된 타일 반환, 없으면 생성 후 캐시"""
+    key = tile_cache_key(z, x, y)
+    tile = cache.get(key)
+    if tile is None:
+        tile = render_tile(z, x, y)
+        cache.set(key, tile, TILE_CACHE_TIMEOUT_SECONDS)
+    return tile
+
+
+def invalidate_tiles_for_points(points):
+    """
+    좌표 목록을 포함하는 모든 줌 레벨의 타일 캐시 삭제
+
+    Args:
+        points: [(위도, 경도), ...] - None 좌표는 무시
+    """
+    keys = set()
+    data_version = None
+    for lat, lng in points:
+        if lat is None or lng is None:
+            continue
+        if data_version is None:
+            data_version = get_listing_data_version()
+        for z in range(TILE_MIN_ZOOM, TILE_MAX_ZOOM + 1):
+            x, y = tile_for_point(lat, lng, z)
+            keys.add(tile_cache_key(z, x, y, data_version))
+    if keys:
+        cache.delete_many(list(keys))
@@ -0,0 +1,138 @@
+# backend/listings/transit_score.py
+"""
+매물 대중교통점수(0-10) / 노선다양성점수(0-5) 일괄 계산
+
+- 정류장 격자 인덱스(locations.spatial_index)의 pairs_within으로
+  매물 묶음 × 인근 정류장 쌍을 한 번에 구하고, 점수는 NumPy 배열 연산으로 계산
+- 대중교통점수: 정류장마다 거리 감쇠 가중치 exp(-거리/DECAY)를 합산 후 0-10으로 포화 변환
+- 노선다양성점수: 반경 내 서로 다른 정류장명 수를 0-5로 포화 변환
+  (노선 데이터가 없어 같은 이름의 상·하행/인접 정류장을 하나로 묶은 개수를 노선 다양성의 대용치로 사용)
+- id 구간(청크) 단위로 계산하여 bulk_update - Celery 워커(prefork 프로세스 풀)에서 청크별로 병렬 실행
+"""
+import numpy as np
+from django.utils import timezone
+
+from locations.nearby import get_bus_stop_data_version
+from locations.spatial_index import (
+    BusStopGridIndex,
+    bus_stop_records_from_db,
+    get_bus_stop_index,
+)
+
+from .models import Listing
+
+SCORE_RADIUS_M = 800
+DISTANCE_DECAY_M = 300.0
+# 가중 정류장 수가 이 값일 때 대중교통점수 약 6.3점 (1 - e^-1)
+TRANSIT_SATURATION = 4.0
+# 서로 다른 정류장명이 이 개수일 때 노선다양성점수 약 3.2점
+DIVERSITY_SATURATION = 6.0
+TRANSIT_SCORE_MAX = 10
+DIVERSITY_SCORE_MAX = 5
+
+CHUNK_SIZE = 20000
+BULK_UPDATE_BATCH_SIZE = 2000
+
+_fallback_index = None
+_fallback_version = None
+
+
+def load_bus_stop_index():
+    """
+    스냅샷 인덱스를 우선 사용하고, 없으면 DB에서 만들어 프로세스에 보관
+    (정류장 데이터 버전이 바뀌면 = 가져오기/정류장 저장·삭제 후 다시 만듦)
+    """
+    global _fallback_index, _fallback_version
+    index = get_bus_stop_index()
+    if index is not None:
+        return index
+    version = get_bus_stop_data_version()
+    if _fallback_index is None or _fallback_version != version:
+        _fallback_index = BusStopGridIndex.from_records(bus_stop_records_from_db())
+        _fallback_version = version
+    return _fallback_index
+
+
+def compute_transit_scores(lats, lngs, index, radius_m=SCORE_RADIUS_M):
+    """
+    좌표 배열에 대한 (대중교통점수, 노선다양성점수) 배열 계산
+
+    Args:
+        lats, lngs: 좌표 배열 (NaN 불가)
+        index: BusStopGridIndex
+
+    Returns:
+        tuple: (int 배열 0-10, int 배열 0-5)
+    """
+    n = len(lats)
+    point_idx, stop_idx, distances = index.pairs_within(lats, lngs, radius_m)
+
+    weights = np.exp(-distances / DISTANCE_DECAY_M)
+    weighted_counts = np.bincount(point_idx, weights=weights, minlength=n)
+    transit = np.rint(TRANSIT_SCORE_MAX * (1.0 - np.exp(-weighted_counts / TRANSIT_SATURATION)))
+
+    # (매물, 정류장명 코드) 쌍을 중복 제거 후 매물별 개수
+    stride = int(index.name_codes.max(initial=0)) + 1
+    pair_keys = np.unique(point_idx * stride + index.name_codes[stop_idx])
+    distinct_points = pair_keys // stride
+    distinct_counts = np.bincount(distinct_points, minlength=n)
+    diversity = np.rint(DIVERSITY_SCORE_MAX * (1.0 - np.exp(-distinct_counts / DIVERSITY_SATURATION)))
+
+    return transit.astype(np.int64), diversity.astype(np.int64)
+
+
+def recompute_transit_scores_for_range(start_id, end_id, index=None):
+    """
+    id 구간 [start_id, end_id) 매물의 점수를 다시 계산하여 값이 바뀐 매물만 bulk_update
+
+    Returns:
+        int: 갱신된 매물 수
+    """
+    rows = list(
+        Listing.objects
+        .filter(id__gte=start_id, id__lt=end_id)
+        .order_by()
+        .values_list('id', '위도', '경도', '대중교통점수', '노선다양성점수')
+    )
+    if not rows:
+        return 0
+
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    lats = np.array([row[1] for row in rows], dtype=np.float64)
+    lngs = np.array([row[2] for row in rows], dtype=np.float64)
+    located = np.isfinite(lats) & np.isfinite(lngs)
+
+    transit = np.full(len(rows), -1, dtype=np.int64)
+    diversity = np.full(len(rows), -1, dtype=np.int64)
+    if located.any():
+        if index is None:
+            index = load_bus_stop_index()
+        transit[located], diversity[located] = compute_transit_scores(lats[located], lngs[located], index)
+
+    changed = []
+    # bulk_update는 auto_now를 적용하지 않으므로 ETag/Last-Modified용 수정일시를 직접 지정
+    now = timezone.now()
+    for i, (_, _, _, old_transit, old_diversity) in enumerate(rows):
+        # 좌표가 없는 매물은 점수 없음(None)
+        new_transit = int(transit[i]) if located[i] else None
+        new_diversity = int(diversity[i]) if located[i] else None
+        if (new_transit, new_diversity) != (old_transit, old_diversity):
+            changed.append(Listing(
+                id=int(ids[i]), 대중교통점수=new_transit, 노선다양성점수=new_diversity, 수정일시=now,
+            ))
+
+    if changed:
+        Listing.objects.bulk_update(
+            changed, ['대중교통점수', '노선다양성점수', '수정일시'], batch_size=BULK_UPDATE_BATCH_SIZE
+        )
+    return len(changed)
+
+
+def listing_id_chunks(chunk_size=CHUNK_SIZE):
+    """전체 매물 id 범위를 [start, end) 구간 목록으로 분할"""
+    bounds = Listing.objects.order_by().values_list('id', flat=True)
+    min_id = bounds.order_by('id').first()
+    if min_id is None:
+        return []
+    max_id = bounds.order_by('-id').first()
+    return [(start, start + chunk_size) for start in range(min_id, max_id + 1, chunk_size)]
@@ -1,11 +1,13 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
-from .views import ListingViewSet
+from .views import ListingViewSet, listing_tile_api
 
 router = DefaultRouter()
 router.register(r'listings', ListingViewSet, basename='listing')
 
 urlpatterns = [
+    # 벡터 타일은 라우터의 listings/{pk}/ 패턴보다 먼저 매칭되어야 함
+    re_path(r'^listings/tiles/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)\.mvt$', listing_tile_api, name='listing_tile'),
     path('', include(router.urls)),
 ]
 
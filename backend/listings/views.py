@@ -1,9 +1,34 @@
+from django.http import HttpResponse, JsonResponse
+from django.contrib.postgres.search import TrigramSimilarity
 from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
+from .bbox_cache import cached_cells_for_bounds, cells_digest, is_cacheable_request, listings_from_cells
+from .conditional import (
+    content_etag,
+    detail_validators,
+    list_validators,
+    not_modified_response,
+    set_validators,
+)
+from .counters import record_listing_view
+from .geo import CLUSTER_MAX_ZOOM, cluster_listings, parse_bounds, filter_by_bounds
 from .models import Listing
-from .serializers import ListingListSerializer, ListingDetailSerializer
+from .pagination import ListingKeysetPagination
+from .search import AddressSearchFilter, normalize_address
+from .serializers import (
+    ListingListSerializer,
+    ListingDetailSerializer,
+    listing_list_rows,
+    serialize_listing_rows,
+)
+from .tiles import get_tile, is_valid_tile
+
+# 페이지네이션 파라미터 없는 지도(bounds) 요청의 최대 매물 수 (최신순으로 자름)
+MAP_LISTING_LIMIT = 2000
 
 
 class ListingViewSet(viewsets.ModelViewSet):
@@ -17,10 +42,19 @@ class ListingViewSet(viewsets.ModelViewSet):
     queryset = Listing.objects.filter(활성화여부=True, 매물상태='available')
     serializer_class = ListingDetailSerializer
     permission_classes = [AllowAny]  # 공개 API
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, AddressSearchFilter, filters.OrderingFilter]
     filterset_fields = ['매물타입', '주택종류', '지역ID']
+    # AddressSearchFilter는 세 주소를 정규화해 합친 주소검색키(trigram 인덱스)에서 검색
     search_fields = ['주소', '도로명주소', '지번주소']
     ordering_fields = ['생성일시', '조회수', '찜수']
+    pagination_class = ListingKeysetPagination
+    
+    def get_queryset(self):
+        """목록 조회에서는 상세 전용 JSON 컬럼(QA정보 등)을 읽지 않음"""
+        queryset = super().get_queryset()
+        if self.action in {'list', 'autocomplete'}:
+            queryset = queryset.without_payloads()
+        return queryset
     
     def get_serializer_class(self):
         """액션에 따라 다른 Serializer 사용"""
@@ -30,12 +64,24 @@ class ListingViewSet(viewsets.ModelViewSet):
     
     def list(self, request, *args, **kwargs):
         """
-        GET /api/listings?bounds=sw_lat,sw_lng,ne_lat,ne_lng
+        GET /api/listings?bounds=sw_lat,sw_lng,ne_lat,ne_lng[&zoom=10]
         
         지도 범위 내 매물 목록 조회
         
         Query Parameters:
             - bounds: 지도 남서-북동 좌표 (예: 34.999,126.999,35.002,127.001)
+            - page_size / cursor: keyset 페이지네이션 (ListingKeysetPagination 참고)
+              bounds 없는 목록은 항상 페이지 단위로 응답 ({"next": ..., "listings": [...]}),
+              bounds 지도 요청에 페이지 파라미터가 없으면 최신순 MAP_LISTING_LIMIT건까지
+              ({"listings": [...], "truncated": true/false})
+            - zoom: 지도 줌 레벨. CLUSTER_MAX_ZOOM 미만이면 클러스터 응답을 반환
+                {
+                    "zoom": 10,
+                    "clusters": [
+                        {"count": 42, "lat": 37.5, "lng": 127.0,
+                         "min_price": 150000000, "max_price": 820000000}
+                    ]
+                }
         
         Response:
             {
@@ -53,33 +99,107 @@ class ListingViewSet(viewsets.ModelViewSet):
             }
         """
         bounds = request.query_params.get('bounds')
+        zoom = request.query_params.get('zoom')
         
         queryset = self.filter_queryset(self.get_queryset())
         
-        # 지도 범위 필터링
+        # 지도 범위 필터링 (위치 && ST_MakeEnvelope → GiST 인덱스 스캔)
         if bounds:
             try:
-                sw_lat, sw_lng, ne_lat, ne_lng = map(float, bounds.split(','))
-                queryset = queryset.filter(
-                    위도__gte=sw_lat,
-                    위도__lte=ne_lat,
-                    경도__gte=sw_lng,
-                    경도__lte=ne_lng
-                )
+                bounds = parse_bounds(bounds)
+                queryset = filter_by_bounds(queryset, bounds)
             except (ValueError, TypeError):
                 return Response(
                     {'error': 'Invalid bounds format. Expected: sw_lat,sw_lng,ne_lat,ne_lng'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        # 페이지네이션
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        if zoom is not None:
+            try:
+                zoom = int(zoom)
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid zoom. Expected an integer zoom level'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        # 다른 필터 없이 bounds만 있는 지도 요청은 격자 셀 캐시에서 조립
+        # (검증값은 셀에 저장된 내용 해시로 만들어 캐시 적중 시 DB 조회/직렬화 없이 304)
+        clustered = zoom is not None and zoom < CLUSTER_MAX_ZOOM
+        if bounds and not clustered and is_cacheable_request(request):
+            cells_data = cached_cells_for_bounds(self.get_queryset(), bounds)
+            if cells_data is not None:
+                etag = content_etag(request, cells_digest(cells_data))
+                not_modified = not_modified_response(request, etag, None)
+                if not_modified is not None:
+                    return not_modified
+                listings = listings_from_cells(cells_data, bounds)
+                return set_validators(Response({
+                    'listings': listings[:MAP_LISTING_LIMIT],
+                    'truncated': len(listings) > MAP_LISTING_LIMIT,
+                }), etag, None)
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({'listings': serializer.data})
+        # 조건부 GET: max(수정일시) + 개수만 조회하여 변경 없으면 직렬화 없이 304
+        etag, last_modified = list_validators(queryset, request)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        
+        response = self._build_list_response(request, queryset, zoom, bounds)
+        return set_validators(response, etag, last_modified)
+    
+    def _build_list_response(self, request, queryset, zoom, bounds):
+        # 낮은 줌 레벨에서는 서버에서 클러스터링
+        if zoom is not None and zoom < CLUSTER_MAX_ZOOM:
+            return Response({
+                'zoom': zoom,
+                'clusters': cluster_listings(queryset, max(zoom, 0)),
+            })
+        
+        # 필요한 컬럼만 조회하는 고속 직렬화 경로 (ListingListSerializer와 동일한 출력)
+        if bounds and not self.paginator.is_requested(request):
+            # 지도 요청: 화면 범위 안에서 최신순 MAP_LISTING_LIMIT건까지
+            rows = list(listing_list_rows(
+                queryset.order_by('-생성일시', '-id')[:MAP_LISTING_LIMIT + 1]
+            ))
+            return Response({
+                'listings': serialize_listing_rows(rows[:MAP_LISTING_LIMIT]),
+                'truncated': len(rows) > MAP_LISTING_LIMIT,
+            })
+        
+        # 그 외 목록은 항상 keyset 페이지 단위로 (요청당 메모리 상한)
+        rows = listing_list_rows(queryset, extra_fields=self.paginator.ordering_fields)
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(serialize_listing_rows(page))
+    
+    @action(detail=False, methods=['get'], url_path='autocomplete')
+    def autocomplete(self, request):
+        """
+        GET /api/listings/autocomplete?q=강남구 테헤란로&limit=10
+        
+        주소 자동완성 (주소검색키 trigram 인덱스 + 유사도 순 정렬)
+        
+        Response:
+            {"results": [{"id": "1", "address": "서울특별시 강남구 테헤란로 123"}]}
+        """
+        query = normalize_address(request.query_params.get('q', ''))
+        if not query:
+            return Response({'results': []})
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            limit = 10
+        
+        rows = (
+            self.get_queryset()
+            .filter(주소검색키__contains=query)
+            .annotate(similarity=TrigramSimilarity('주소검색키', query))
+            .order_by('-similarity', 'id')
+            .values_list('id', '주소')[:limit]
+        )
+        return Response({
+            'results': [{'id': str(pk), 'address': address} for pk, address in rows]
+        })
     
     def retrieve(self, request, *args, **kwargs):
         """
@@ -103,11 +223,40 @@ class ListingViewSet(viewsets.ModelViewSet):
                 ...
             }
         """
-        instance = self.get_object()
+        pk = kwargs.get(self.lookup_field)
+        try:
+            validators = detail_validators(self.get_queryset(), pk)
+        except (TypeError, ValueError):
+            validators = None
+        if validators is None:
+            raise NotFound()
+        etag, last_modified = validators
+        
+        # 조회수 증가 (Redis에 누적 → Celery beat가 주기적으로 DB 반영)
+        record_listing_view(pk)
         
-        # 조회수 증가
-        instance.조회수 += 1
-        instance.save(update_fields=['조회수'])
+        # 조건부 GET: 수정일시만 조회하여 변경 없으면 직렬화 없이 304
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
         
+        instance = self.get_object()
         serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        return set_validators(Response(serializer.data), etag, last_modified)
+
+
+def listing_tile_api(request, z, x, y):
+    """
+    매물 벡터 타일 API
+    GET /api/listings/tiles/{z}/{x}/{y}.mvt
+
+    ST_AsMVT로 만든 Mapbox Vector Tile을 반환 (타일 단위 캐시)
+    """
+    z, x, y = int(z), int(x), int(y)
+    if not is_valid_tile(z, x, y):
+        return JsonResponse({'error': 'Invalid tile coordinates'}, status=404)
+
+    response = HttpResponse(get_tile(z, x, y), content_type='application/vnd.mapbox-vector-tile')
+    response['Cache-Control'] = 'public, max-age=60'
+    return response
+
@@ -0,0 +1,464 @@
+# backend/locations/bus_stop_loader.py
+"""
+버스정류장 CSV 고속 적재 (PostGIS 전용, import_bus_stops --fast)
+
+- 검증된 행을 탭 구분 텍스트로 모아 COPY ... FROM STDIN 으로 임시 스테이징 테이블에 스트리밍
+- 위치는 SQL에서 ST_SetSRID(ST_MakePoint(경도, 위도), 4326)로 생성 (행마다 Point/모델 객체를 만들지 않음)
+- 스테이징 → bus_stops 병합은 INSERT ... SELECT ... ON CONFLICT 한 문장
+- 전체 재적재(--clear) 시 보조 인덱스를 삭제했다가 적재 후 다시 생성
+- 행 해시(원본해시)도 함께 저장하여 이후 --incremental 갱신의 기준으로 사용
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+
+from django.db import connection, transaction
+
+STAGING_TABLE = 'bus_stops_staging'
+# 한 번의 COPY로 보내는 행 수 (메모리에 올라가는 버퍼 크기)
+COPY_CHUNK_ROWS = 50000
+
+# 행 해시에 포함되는 값 (순서 고정 - 바꾸면 모든 정류장이 변경된 것으로 판단됨)
+HASHED_COLUMNS = (
+    '정류장번호', '정류장명', '위도', '경도', '정보수집일',
+    '모바일단축번호', '도시코드', '도시명', '관리도시명',
+)
+STAGING_COLUMNS = HASHED_COLUMNS + ('원본해시',)
+
+CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE {STAGING_TABLE} (
+        "정류장번호" varchar(20),
+        "정류장명" varchar(100),
+        "위도" double precision,
+        "경도" double precision,
+        "정보수집일" date,
+        "모바일단축번호" varchar(20),
+        "도시코드" varchar(20),
+        "도시명" varchar(100),
+        "관리도시명" varchar(100),
+        "원본해시" varchar(32)
+    ) ON COMMIT DROP
+"""
+
+MERGE_SQL = f"""
+    INSERT INTO bus_stops (
+        "정류장번호", "정류장명", "위치", "정보수집일",
+        "모바일단축번호", "도시코드", "도시명", "관리도시명", "원본해시", "수정일시"
+    )
+    SELECT DISTINCT ON (s."정류장번호")
+        s."정류장번호",
+        s."정류장명",
+        CASE
+            WHEN s."위도" IS NOT NULL AND s."경도" IS NOT NULL
+            THEN ST_SetSRID(ST_MakePoint(s."경도", s."위도"), 4326)
+        END,
+        s."정보수집일",
+        s."모바일단축번호",
+        s."도시코드",
+        s."도시명",
+        s."관리도시명",
+        s."원본해시",
+        now()
+    FROM {STAGING_TABLE} s
+    ORDER BY s."정류장번호"
+    ON CONFLICT ("정류장번호") DO NOTHING
+"""
+
+# 기본키 제약조건이 사용하는 인덱스를 제외한 bus_stops 보조 인덱스
+SECONDARY_INDEXES_SQL = """
+    SELECT i.indexname, i.indexdef
+    FROM pg_indexes i
+    WHERE i.schemaname = current_schema()
+      AND i.tablename = 'bus_stops'
+      AND NOT EXISTS (
+          SELECT 1 FROM pg_constraint c
+          WHERE c.conindid = (quote_ident(i.schemaname) || '.' || quote_ident(i.indexname))::regclass
+      )
+"""
+
+
+class BusStopRowError(ValueError):
+    """CSV 행을 정류장으로 변환할 수 없음 (메시지 = 사유)"""
+
+
+def parse_bus_stop_row(row, warn=None):
+    """
+    CSV 행(dict) 검증 및 변환
+
+    Args:
+        row: csv.DictReader 행
+        warn: 행은 유지하되 알릴 문제(날짜 형식 등)를 받는 콜백
+
+    Returns:
+        dict: STAGING_COLUMNS 키를 가진 값
+
+    Raises:
+        BusStopRowError: 필수 값 누락, 잘못된 좌표 등
+    """
+    정류장번호 = (row.get('정류장번호') or '').strip()
+    정류장명 = (row.get('정류장명') or '').strip()
+    위도_str = (row.get('위도') or '').strip()
+    경도_str = (row.get('경도') or '').strip()
+
+    # 필수 필드 검증
+    if not 정류장번호 or not 정류장명:
+        raise BusStopRowError('정류장번호 또는 정류장명이 비어있습니다.')
+
+    # 좌표 변환
+    try:
+        위도 = float(위도_str) if 위도_str else None
+        경도 = float(경도_str) if 경도_str else None
+    except (ValueError, TypeError):
+        raise BusStopRowError(f'유효하지 않은 좌표입니다 ({위도_str}, {경도_str})')
+
+    # 유효한 좌표 범위 검증 (한국 영역)
+    if 위도 and 경도:
+        if not (33 <= 위도 <= 39 and 124 <= 경도 <= 132):
+            raise BusStopRowError(f'좌표가 한국 영역을 벗어납니다 ({위도}, {경도})')
+    else:
+        위도 = 경도 = None
+
+    # 날짜 변환
+    정보수집일 = None
+    정보수집일_str = (row.get('정보수집일') or '').strip()
+    if 정보수집일_str:
+        try:
+            정보수집일 = datetime.strptime(정보수집일_str, '%Y-%m-%d').date()
+        except ValueError:
+            if warn is not None:
+                warn(f'유효하지 않은 날짜 형식입니다: {정보수집일_str}')
+
+    values = {
+        '정류장번호': 정류장번호,
+        '정류장명': 정류장명,
+        '위도': 위도,
+        '경도': 경도,
+        '정보수집일': 정보수집일,
+        '모바일단축번호': (row.get('모바일단축번호') or '').strip() or None,
+        '도시코드': (row.get('도시코드') or '').strip() or None,
+        '도시명': (row.get('도시명') or '').strip() or None,
+        '관리도시명': (row.get('관리도시명') or '').strip() or None,
+    }
+    values['원본해시'] = bus_stop_row_hash(values)
+    return values
+
+
+def build_bus_stop(values):
+    """검증된 값으로 BusStop 인스턴스 생성"""
+    from django.contrib.gis.geos import Point
+
+    from .models import BusStop
+
+    위도 = values['위도']
+    경도 = values['경도']
+    return BusStop(
+        정류장번호=values['정류장번호'],
+        정류장명=values['정류장명'],
+        위치=Point(경도, 위도, srid=4326) if 위도 and 경도 else None,  # 경도, 위도 순서 주의
+        정보수집일=values['정보수집일'],
+        모바일단축번호=values['모바일단축번호'],
+        도시코드=values['도시코드'],
+        도시명=values['도시명'],
+        관리도시명=values['관리도시명'],
+        원본해시=values['원본해시'],
+    )
+
+
+def bus_stop_row_hash(values):
+    """
+    검증/변환된 정류장 행 값의 MD5 해시 (변경 감지용)
+
+    Args:
+        values: HASHED_COLUMNS 키를 가진 dict
+    """
+    raw = '\x1f'.join('' if values[column] is None else str(values[column]) for column in HASHED_COLUMNS)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def _copy_value(value):
+    """COPY text 형식 값 (None → \\N, 탭/개행/역슬래시 이스케이프)"""
+    if value is None:
+        return '\\N'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def _copy_chunk(cursor, rows):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    columns = ', '.join(f'"{column}"' for column in STAGING_COLUMNS)
+    cursor.copy_expert(f'COPY {STAGING_TABLE} ({columns}) FROM STDIN', buffer)
+
+
+def _drop_secondary_indexes(cursor):
+    cursor.execute(SECONDARY_INDEXES_SQL)
+    indexes = cursor.fetchall()
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    return [definition for _, definition in indexes]
+
+
+def fast_load_bus_stops(rows, clear=False, progress=None):
+    """
+    정류장 행들을 COPY로 적재한 뒤 bus_stops에 한 번에 병합
+
+    Args:
+        rows: STAGING_COLUMNS 순서의 튜플을 내는 이터러블 (검증 완료된 값)
+        clear: True면 bus_stops를 비우고 보조 인덱스를 적재 후에 다시 생성
+        progress: COPY 청크마다 호출되는 콜백 (누적 적재 행 수)
+
+    Returns:
+        tuple: (스테이징에 적재한 행 수, bus_stops에 새로 추가된 행 수)
+    """
+    staged = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        index_definitions = []
+        if clear:
+            cursor.execute('TRUNCATE bus_stops')
+            index_definitions = _drop_secondary_indexes(cursor)
+
+        cursor.execute(CREATE_STAGING_SQL)
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= COPY_CHUNK_ROWS:
+                _copy_chunk(cursor, chunk)
+                staged += len(chunk)
+                chunk = []
+                if progress is not None:
+                    progress(staged)
+        if chunk:
+            _copy_chunk(cursor, chunk)
+            staged += len(chunk)
+            if progress is not None:
+                progress(staged)
+
+        cursor.execute(MERGE_SQL)
+        inserted = cursor.rowcount
+
+        for definition in index_definitions:
+            cursor.execute(definition)
+        if clear:
+            cursor.execute('ANALYZE bus_stops')
+
+    return staged, inserted
+
+
+# ----------------------------------------------------------------------
+# 병렬 청크 적재 (import_bus_stops --parallel)
+# - 파일을 줄 경계에 맞춘 바이트 구간(청크)으로 나누어 프로세스 풀에서 파싱/저장
+# - 청크가 끝날 때마다 체크포인트에 기록 → --resume 시 끝난 청크는 건너뜀
+# - 변환 실패 행과 저장 실패 행은 리젝트 파일로 (배치 저장 실패 시 행 단위로 재시도)
+# - 전제: 필드 안에 줄바꿈이 없는 CSV (국토부 정류장 파일 형식)
+# ----------------------------------------------------------------------
+CHUNK_BYTES = 4 * 1024 * 1024
+CHECKPOINT_VERSION = 1
+REJECT_EXTRA_COLUMNS = ('사유', '청크', '청크내행')
+
+
+def split_csv_chunks(csv_file, chunk_count):
+    """
+    헤더를 제외한 본문을 줄 경계에 맞춘 바이트 구간으로 분할
+
+    Returns:
+        tuple: (헤더 필드명 목록, [(시작 오프셋, 끝 오프셋), ...])
+    """
+    size = os.path.getsize(csv_file)
+    with open(csv_file, 'rb') as f:
+        header = f.readline()
+        body_start = f.tell()
+        fieldnames = next(csv.reader([header.decode('utf-8-sig')]))
+
+        span = max((size - body_start) // max(chunk_count, 1), 1)
+        boundaries = [body_start]
+        for i in range(1, chunk_count):
+            f.seek(body_start + i * span)
+            f.readline()  # 줄 중간이면 다음 줄 시작으로
+            position = min(f.tell(), size)
+            if position > boundaries[-1]:
+                boundaries.append(position)
+        if size > boundaries[-1]:
+            boundaries.append(size)
+
+    return fieldnames, list(zip(boundaries, boundaries[1:]))
+
+
+def init_import_worker():
+    """
+    프로세스 풀 워커 초기화 (spawn 환경에서 Django 설정)
+    fork 환경에서 DB 연결을 물려받지 않도록 호출측은 풀 생성 전에 connections.close_all() 호출
+    """
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+
+
+def save_bus_stops_resilient(objects):
+    """
+    배치 저장, 실패 시 행 단위로 다시 저장하여 실패한 행만 골라냄
+
+    Returns:
+        tuple: (저장 시도 성공 행 수, [(인덱스, 사유), ...])
+    """
+    from .models import BusStop
+
+    try:
+        with transaction.atomic():
+            BusStop.objects.bulk_create(objects, ignore_conflicts=True, batch_size=500)
+        return len(objects), []
+    except Exception:
+        pass
+
+    saved = 0
+    failures = []
+    for i, obj in enumerate(objects):
+        try:
+            with transaction.atomic():
+                BusStop.objects.bulk_create([obj], ignore_conflicts=True)
+            saved += 1
+        except Exception as e:
+            failures.append((i, f'저장 실패: {e}'))
+    return saved, failures
+
+
+def import_csv_chunk(csv_file, fieldnames, chunk_index, start, end, batch_size):
+    """
+    청크 하나를 파싱하여 저장 (프로세스 풀 워커에서 실행)
+
+    Returns:
+        dict: {'chunk', 'rows', 'saved', 'warnings', 'rejects': [[필드..., 사유, 청크, 청크내행], ...]}
+    """
+    with open(csv_file, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+
+    reader = csv.DictReader(io.StringIO(text), fieldnames=fieldnames)
+    result = {'chunk': chunk_index, 'rows': 0, 'saved': 0, 'warnings': 0, 'rejects': []}
+
+    def reject(row, reason, line):
+        raw = [row.get(name) or '' for name in fieldnames]
+        result['rejects'].append(raw + [reason, chunk_index, line])
+
+    def warn(_message):
+        result['warnings'] += 1
+
+    batch = []
+
+    def flush():
+        saved, failures = save_bus_stops_resilient([build_bus_stop(values) for _, _, values in batch])
+        result['saved'] += saved
+        for i, reason in failures:
+            row, line, _ = batch[i]
+            reject(row, reason, line)
+
+    for row in reader:
+        result['rows'] += 1
+        line = reader.line_num
+        try:
+            values = parse_bus_stop_row(row, warn=warn)
+        except BusStopRowError as e:
+            reject(row, str(e), line)
+            continue
+        except Exception as e:
+            reject(row, f'처리 오류: {e}', line)
+            continue
+
+        batch.append((row, line, values))
+        if len(batch) >= batch_size:
+            flush()
+            batch = []
+    if batch:
+        flush()
+
+    return result
+
+
+class ImportCheckpoint:
+    """
+    청크 단위 진행 상황 기록 (JSON 파일)
+    원본 파일의 크기/수정시각이 바뀌면 이어받지 않음
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = None
+
+    @staticmethod
+    def _file_signature(csv_file):
+        stat = os.stat(csv_file)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def load(self, csv_file):
+        """이어받을 수 있는 체크포인트면 True"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != CHECKPOINT_VERSION or data.get('file') != self._file_signature(csv_file):
+            return False
+        self.data = data
+        return True
+
+    def start(self, csv_file, fieldnames, chunks):
+        self.data = {
+            'version': CHECKPOINT_VERSION,
+            'file': self._file_signature(csv_file),
+            'fieldnames': fieldnames,
+            'chunks': [list(chunk) for chunk in chunks],
+            'done': {},
+        }
+        self.save()
+
+    @property
+    def fieldnames(self):
+        return self.data['fieldnames']
+
+    @property
+    def chunks(self):
+        return [tuple(chunk) for chunk in self.data['chunks']]
+
+    @property
+    def done(self):
+        return self.data['done']
+
+    def pending(self):
+        return [
+            (index, start, end)
+            for index, (start, end) in enumerate(self.chunks)
+            if str(index) not in self.done
+        ]
+
+    def mark_done(self, result):
+        self.done[str(result['chunk'])] = {
+            'rows': result['rows'],
+            'saved': result['saved'],
+            'rejected': len(result['rejects']),
+            'warnings': result['warnings'],
+        }
+        self.save()
+
+    def save(self):
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,141 @@
+# backend/locations/caching.py
+"""
+시도 API 응답 캐시 - 세대(generation) 번호 기반 무효화
+
+- cache.clear()는 Redis DB 전체(다른 앱 캐시 포함)를 지우므로 사용하지 않음
+- 캐시 키에 세대 번호를 포함하고, 쓰기 시 세대 번호만 올림 (cache.incr, 원자적)
+  → 이전 세대 키는 더 이상 조회되지 않고 timeout으로 자연히 만료됨
+- 목록(sido_list_cache)은 세대 번호 하나, 상세(sido_detail_cache)는 시도 id별 세대 번호
+- 세대 번호가 캐시에서 사라지면 현재 시각(ms)으로 다시 시작하여 이전 세대와 겹치지 않음
+
+캐시 스탬피드 방지 (get_or_compute)
+- 값과 함께 계산 소요 시간(delta)/논리 만료 시각을 저장하고, 실제 캐시 timeout은 STALE_GRACE_SECONDS만큼 더 길게
+- 확률적 조기 갱신(XFetch): now - delta × beta × ln(rand) >= 만료 시각이면 만료 전에 미리 재계산
+  → 계산이 오래 걸리는 키일수록, 만료가 가까울수록 먼저 갱신됨
+- 재계산은 키별 lock(cache.add = Redis SET NX)을 잡은 요청 하나만 수행,
+  나머지는 기존(만료된) 값을 그대로 응답하거나 값이 없으면 잠시 기다림
+"""
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import cache
+
+CACHE_DETAIL_PREFIX = "sido_detail_cache"
+CACHE_LIST_PREFIX = "sido_list_cache"
+CACHE_TIMEOUT_SECONDS = 60 * 60
+# 논리 만료 후에도 재계산되는 동안 응답할 수 있도록 값을 더 보관하는 시간
+STALE_GRACE_SECONDS = 10 * 60
+# XFetch beta (1보다 크면 더 일찍 갱신)
+EARLY_REFRESH_BETA = 1.0
+RECOMPUTE_LOCK_TIMEOUT_SECONDS = 60
+# 값이 전혀 없을 때 다른 요청의 계산 결과를 기다리는 최대 시간
+WAIT_TIMEOUT_SECONDS = 5.0
+WAIT_INTERVAL_SECONDS = 0.05
+
+
+def _generation_key(prefix, identifier=None):
+    if identifier is None:
+        return f"{prefix}:generation"
+    return f"{prefix}:generation:{identifier}"
+
+
+def _get_generation(key):
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        generation = cache.get(key, 0)
+    return generation
+
+
+def _bump_generation(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # 세대 번호가 없으면 새로 시작 (동시에 add한 쪽이 있으면 그 값에서 증가)
+        if cache.add(key, int(time.time() * 1000), timeout=None):
+            return cache.get(key)
+        return cache.incr(key)
+
+
+def list_cache_key(signature):
+    """목록 응답 캐시 키"""
+    generation = _get_generation(_generation_key(CACHE_LIST_PREFIX))
+    return f"{CACHE_LIST_PREFIX}:g{generation}:params_{signature}"
+
+
+def detail_cache_key(sido_id, signature):
+    """상세 응답 캐시 키 (시도 id별 세대 번호)"""
+    generation = _get_generation(_generation_key(CACHE_DETAIL_PREFIX, sido_id))
+    return f"{CACHE_DETAIL_PREFIX}:g{generation}:id_{sido_id}:params_{signature}"
+
+
+def sido_data_generation():
+    """시도 데이터 세대 번호 (시도 저장/삭제마다 바뀜, 메모리에 올린 시도 경계 재로드 판단용)"""
+    return _get_generation(_generation_key(CACHE_LIST_PREFIX))
+
+
+def invalidate_sido_cache(sido_id=None):
+    """
+    시도 저장/삭제 후 응답 캐시 무효화
+
+    Args:
+        sido_id: 변경된 시도 id (None이면 목록만 무효화)
+    """
+    _bump_generation(_generation_key(CACHE_LIST_PREFIX))
+    if sido_id is not None:
+        _bump_generation(_generation_key(CACHE_DETAIL_PREFIX, sido_id))
+
+
+def _should_recompute(entry, now, beta=EARLY_REFRESH_BETA):
+    """XFetch: 만료가 가까울수록, 계산이 오래 걸릴수록 높은 확률로 True"""
+    return now - entry['delta'] * beta * math.log(1.0 - random.random()) >= entry['expires_at']
+
+
+def _compute_and_store(key, compute, timeout):
+    started = time.time()
+    value = compute()
+    now = time.time()
+    entry = {'value': value, 'delta': now - started, 'expires_at': now + timeout}
+    cache.set(key, entry, timeout + STALE_GRACE_SECONDS)
+    return value
+
+
+def get_or_compute(key, compute, timeout=CACHE_TIMEOUT_SECONDS):
+    """
+    캐시 조회, 없거나 갱신 시점이면 한 요청만 compute()로 재계산 (single-flight)
+
+    Args:
+        key: 캐시 키
+        compute: 값을 계산하는 함수 (예외는 그대로 전달되며 캐시하지 않음)
+        timeout: 논리 만료 시간(초)
+    """
+    entry = cache.get(key)
+    if entry is not None and not _should_recompute(entry, time.time()):
+        return entry['value']
+
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, RECOMPUTE_LOCK_TIMEOUT_SECONDS):
+        try:
+            return _compute_and_store(key, compute, timeout)
+        finally:
+            # lock이 만료되어 다른 요청이 잡은 경우 지우지 않음
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    # 다른 요청이 재계산 중: 기존 값이 있으면 (만료되었더라도) 그대로 응답
+    if entry is not None:
+        return entry['value']
+
+    deadline = time.monotonic() + WAIT_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value']
+        if cache.get(lock_key) is None:
+            # 계산하던 요청이 실패했으면 더 기다리지 않음
+            break
+    return _compute_and_store(key, compute, timeout)
@@ -0,0 +1,9 @@
+# backend/locations/geo.py
+from django.contrib.gis.db.models import GeometryField
+from django.db.models import Func
+
+
+# ✅ PostGIS ST_SimplifyPreserveTopology 직접 래퍼
+class SimplifyPreserveTopology(Func):
+    function = "ST_SimplifyPreserveTopology"
+    output_field = GeometryField()
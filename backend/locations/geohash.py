@@ -0,0 +1,56 @@
+# backend/locations/geohash.py
+"""
+Geohash 인코딩 / 셀 범위 계산 (외부 의존성 없는 최소 구현)
+"""
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_DECODE = {char: i for i, char in enumerate(_BASE32)}
+
+
+def encode(lat, lng, precision=6):
+    """위도/경도 → geohash 문자열"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # 짝수 번째 비트는 경도
+
+    while len(chars) < precision:
+        value_range, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            value_range[0] = mid
+        else:
+            bits <<= 1
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def bounds(geohash):
+    """
+    geohash 셀 범위
+
+    Returns:
+        tuple: (min_lat, min_lng, max_lat, max_lng)
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            value_range = lng_range if even else lat_range
+            mid = (value_range[0] + value_range[1]) / 2
+            if (value >> shift) & 1:
+                value_range[0] = mid
+            else:
+                value_range[1] = mid
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
@@ -0,0 +1,98 @@
+"""
+버스정류장 인메모리 격자 인덱스와 PostGIS 쿼리의 반경/k-최근접 검색 성능 비교
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from locations.spatial_index import get_bus_stop_index
+
+# 한국 최북단(약 39°)에서 경도 1도 ≈ 86km → 미터 반경을 덮는 보수적인 도 단위 반경
+METERS_PER_DEGREE_MIN = 86000.0
+
+# "위치" && ST_Expand(...)로 geometry GiST 인덱스를 먼저 타고, 후보만 geography 거리로 확인
+# (geography로 캐스팅한 ST_DWithin만 쓰면 인덱스를 쓰지 못해 순차 스캔이 됨)
+RADIUS_SQL = """
+    SELECT "정류장번호"
+    FROM bus_stops
+    WHERE "위치" && ST_Expand(ST_SetSRID(ST_MakePoint(%(lng)s, %(lat)s), 4326), %(radius_deg)s)
+      AND ST_DWithin("위치"::geography, ST_SetSRID(ST_MakePoint(%(lng)s, %(lat)s), 4326)::geography, %(radius_m)s)
+"""
+
+KNN_SQL = """
+    SELECT "정류장번호"
+    FROM bus_stops
+    WHERE "위치" IS NOT NULL
+    ORDER BY "위치" <-> ST_SetSRID(ST_MakePoint(%s, %s), 4326)
+    LIMIT %s
+"""
+
+
+class Command(BaseCommand):
+    help = '버스정류장 인메모리 인덱스와 PostGIS의 반경/k-최근접 검색 성능을 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=1000, help='검색 횟수 (기본값: 1000)')
+        parser.add_argument('--radius', type=int, default=500, help='반경 검색 거리(m) (기본값: 500)')
+        parser.add_argument('--k', type=int, default=5, help='k-최근접 개수 (기본값: 5)')
+        parser.add_argument('--seed', type=int, default=42, help='검색 지점 난수 시드')
+        parser.add_argument(
+            '--skip-postgis',
+            action='store_true',
+            help='PostGIS 비교 없이 인메모리 인덱스만 측정합니다'
+        )
+
+    def handle(self, *args, **options):
+        if options['queries'] <= 0:
+            raise CommandError('--queries 는 1 이상이어야 합니다.')
+
+        index = get_bus_stop_index()
+        if index is None or len(index) == 0:
+            raise CommandError('인덱스 스냅샷이 없습니다. 먼저 build_bus_stop_index를 실행하세요.')
+
+        # 실제 정류장 주변(±약 1km)에서 검색 지점을 뽑아 빈 영역 검색만 측정되지 않도록 함
+        rng = random.Random(options['seed'])
+        points = []
+        for _ in range(options['queries']):
+            i = rng.randrange(len(index))
+            points.append((
+                float(index.lat[i]) + rng.uniform(-0.01, 0.01),
+                float(index.lng[i]) + rng.uniform(-0.01, 0.01),
+            ))
+
+        radius = options['radius']
+        k = options['k']
+        self.stdout.write(f'정류장 {len(index)}개, 검색 {len(points)}회, 반경 {radius}m, k={k}')
+
+        self._report('인덱스 반경 검색', points, lambda lat, lng: index.query_radius(lat, lng, radius))
+        self._report('인덱스 k-최근접', points, lambda lat, lng: index.query_knn(lat, lng, k))
+
+        if options['skip_postgis']:
+            return
+        if not connection.features.gis_enabled:
+            self.stdout.write(self.style.WARNING('PostGIS가 아니므로 DB 비교를 생략합니다.'))
+            return
+
+        with connection.cursor() as cursor:
+            def radius_query(lat, lng):
+                cursor.execute(RADIUS_SQL, {
+                    'lng': lng, 'lat': lat, 'radius_m': radius, 'radius_deg': radius / METERS_PER_DEGREE_MIN,
+                })
+                return cursor.fetchall()
+
+            def knn_query(lat, lng):
+                cursor.execute(KNN_SQL, [lng, lat, k])
+                return cursor.fetchall()
+
+            self._report('PostGIS 반경 검색', points, radius_query)
+            self._report('PostGIS k-최근접', points, knn_query)
+
+    def _report(self, label, points, query):
+        started = time.perf_counter()
+        for lat, lng in points:
+            query(lat, lng)
+        elapsed = time.perf_counter() - started
+        per_query_us = elapsed / len(points) * 1_000_000
+        self.stdout.write(f'{label}: 총 {elapsed:.3f}초, 평균 {per_query_us:.1f}µs/회')
@@ -0,0 +1,76 @@
+"""
+버스정류장 인메모리 격자 인덱스 스냅샷을 생성하는 관리 명령어
+"""
+import csv
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from locations.spatial_index import (
+    BusStopGridIndex,
+    bus_stop_records_from_db,
+    get_bus_stop_index_dir,
+)
+
+
+class Command(BaseCommand):
+    help = '버스정류장 좌표로 인메모리 격자 인덱스 스냅샷을 생성합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--csv',
+            type=str,
+            help='DB 대신 CSV 파일에서 정류장을 읽습니다 (import_bus_stops와 같은 형식)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='스냅샷 디렉토리 (기본값: settings.BUS_STOP_INDEX_DIR)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        if options['csv']:
+            records = self._records_from_csv(options['csv'])
+        else:
+            records = self._records_from_db()
+
+        index = BusStopGridIndex.from_records(records)
+        output = options['output'] or get_bus_stop_index_dir()
+        index.save(output)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n인덱스 생성 완료!\n'
+                f'입력 정류장: {len(records)}\n'
+                f'인덱스 정류장: {len(index)}\n'
+                f'저장 위치: {output}\n'
+                f'소요 시간: {elapsed:.2f}초'
+            )
+        )
+
+    def _records_from_db(self):
+        self.stdout.write('DB에서 버스정류장 좌표를 읽습니다...')
+        return bus_stop_records_from_db()
+
+    def _records_from_csv(self, csv_file):
+        if not os.path.exists(csv_file):
+            raise CommandError(f'CSV 파일을 찾을 수 없습니다: {csv_file}')
+
+        self.stdout.write(f'CSV 파일에서 버스정류장 좌표를 읽습니다: {csv_file}')
+        records = []
+        with open(csv_file, 'r', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                정류장번호 = (row.get('정류장번호') or '').strip()
+                정류장명 = (row.get('정류장명') or '').strip()
+                try:
+                    위도 = float((row.get('위도') or '').strip())
+                    경도 = float((row.get('경도') or '').strip())
+                except ValueError:
+                    continue
+                if 정류장번호 and 정류장명:
+                    records.append((정류장번호, 정류장명, 위도, 경도))
+        return records
@@ -0,0 +1,34 @@
+"""
+시도 경계 단계별 단순화 데이터(sido_geometries)를 생성하는 관리 명령어
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from locations.tasks import build_sido_geometries
+
+
+class Command(BaseCommand):
+    help = '시도 경계를 단계별로 단순화하여 sido_geometries 테이블에 저장합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_celery',
+            help='Celery 워커에서 실행합니다 (기본: 현재 프로세스에서 실행)'
+        )
+
+    def handle(self, *args, **options):
+        if options['use_celery']:
+            result = build_sido_geometries.delay()
+            self.stdout.write(self.style.SUCCESS(f'생성 Task를 등록했습니다: {result.id}'))
+            return
+
+        result = build_sido_geometries()
+        if result['status'] != 'success':
+            raise CommandError(result['message'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"시도 경계 단순화 완료! 저장된 경계: {result['saved_geometries']} "
+                f"(단계: {', '.join(str(level) for level in result['levels'])})"
+            )
+        )
@@ -2,12 +2,28 @@
 버스정류장 CSV 데이터를 가져오는 Django 관리 명령어
 """
 import csv
+import math
 import os
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from django.core.management.base import BaseCommand, CommandError
-from django.contrib.gis.geos import Point
-from django.db import transaction
+from django.db import connection, connections, transaction
+from listings.bus_stops import mark_listings_near_stops_stale
+from locations.bus_stop_loader import (
+    CHUNK_BYTES,
+    REJECT_EXTRA_COLUMNS,
+    STAGING_COLUMNS,
+    BusStopRowError,
+    ImportCheckpoint,
+    build_bus_stop,
+    fast_load_bus_stops,
+    import_csv_chunk,
+    init_import_worker,
+    parse_bus_stop_row,
+    save_bus_stops_resilient,
+    split_csv_chunks,
+)
 from locations.models import BusStop
+from locations.nearby import bump_bus_stop_data_version
 
 
 class Command(BaseCommand):
@@ -30,8 +46,56 @@ class Command(BaseCommand):
             action='store_true',
             help='기존 데이터를 모두 삭제하고 새로 가져옵니다'
         )
+        parser.add_argument(
+            '--fast',
+            action='store_true',
+            help='PostGIS COPY로 스테이징 테이블에 적재 후 한 번에 병합합니다 (대용량 전국 파일용)'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='행 해시를 비교하여 바뀐 정류장만 갱신하고, 파일에 없는 정류장은 삭제합니다'
+        )
+        parser.add_argument(
+            '--keep-missing',
+            action='store_true',
+            help='--incremental 에서 파일에 없는 정류장을 삭제하지 않습니다'
+        )
+        parser.add_argument(
+            '--parallel',
+            action='store_true',
+            help='파일을 청크로 나누어 여러 프로세스에서 파싱/저장합니다 (청크별 체크포인트 기록)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='--parallel 프로세스 수 (기본값: CPU 코어 수)'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='--parallel 체크포인트에서 끝나지 않은 청크만 이어서 처리합니다'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            help='체크포인트 파일 경로 (기본값: <csv_file>.checkpoint.json)'
+        )
+        parser.add_argument(
+            '--reject-file',
+            type=str,
+            help='실패한 행을 기록할 CSV 경로 (기본값: <csv_file>.rejects.csv)'
+        )
 
     def handle(self, *args, **options):
+        try:
+            self._handle_import(options)
+        finally:
+            # 일부만 반영되고 실패했더라도 인근 정류장 캐시는 새 데이터 기준으로 다시 채워지도록 함
+            bump_bus_stop_data_version()
+
+    def _handle_import(self, options):
         csv_file = options['csv_file']
         batch_size = options['batch_size']
         clear_existing = options['clear']
@@ -40,6 +104,26 @@ class Command(BaseCommand):
         if not os.path.exists(csv_file):
             raise CommandError(f'CSV 파일을 찾을 수 없습니다: {csv_file}')
 
+        if options['parallel']:
+            if options['incremental'] or options['fast']:
+                raise CommandError('--parallel 옵션은 --incremental, --fast 와 함께 사용할 수 없습니다')
+            if options['resume'] and clear_existing:
+                raise CommandError('--resume 과 --clear 는 함께 사용할 수 없습니다')
+            self._handle_parallel(csv_file, batch_size, clear_existing, options)
+            return
+
+        if options['incremental']:
+            if clear_existing or options['fast']:
+                raise CommandError('--incremental 옵션은 --clear, --fast 와 함께 사용할 수 없습니다')
+            self._handle_incremental(csv_file, batch_size, delete_missing=not options['keep_missing'])
+            return
+
+        if options['fast']:
+            if not connection.features.gis_enabled or connection.vendor != 'postgresql':
+                raise CommandError('--fast 옵션은 PostGIS(PostgreSQL) 데이터베이스에서만 사용할 수 있습니다')
+            self._handle_fast(csv_file, clear_existing)
+            return
+
         # 기존 데이터 삭제 옵션
         if clear_existing:
             self.stdout.write('기존 버스정류장 데이터를 삭제합니다...')
@@ -49,103 +133,29 @@ class Command(BaseCommand):
             )
 
         self.stdout.write(f'CSV 파일에서 데이터를 가져옵니다: {csv_file}')
-        
-        total_count = 0
+
+        self.total_count = 0
         success_count = 0
-        error_count = 0
+        self.error_count = 0
 
         try:
-            with open(csv_file, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                
-                batch_objects = []
-                
-                for row_num, row in enumerate(reader, start=2):  # 헤더 제외하고 2부터 시작
-                    total_count += 1
-                    
-                    try:
-                        # CSV 행 데이터 검증 및 변환
-                        정류장번호 = row.get('정류장번호', '').strip()
-                        정류장명 = row.get('정류장명', '').strip()
-                        위도_str = row.get('위도', '').strip()
-                        경도_str = row.get('경도', '').strip()
-                        
-                        # 필수 필드 검증
-                        if not 정류장번호 or not 정류장명:
-                            self.stdout.write(
-                                self.style.WARNING(f'행 {row_num}: 정류장번호 또는 정류장명이 비어있습니다.')
-                            )
-                            error_count += 1
-                            continue
-                        
-                        # 좌표 변환
-                        try:
-                            위도 = float(위도_str) if 위도_str else None
-                            경도 = float(경도_str) if 경도_str else None
-                            
-                            # 유효한 좌표 범위 검증 (한국 영역)
-                            if 위도 and 경도:
-                                if not (33 <= 위도 <= 39 and 124 <= 경도 <= 132):
-                                    self.stdout.write(
-                                        self.style.WARNING(f'행 {row_num}: 좌표가 한국 영역을 벗어납니다 ({위도}, {경도})')
-                                    )
-                                    error_count += 1
-                                    continue
-                                
-                                위치 = Point(경도, 위도, srid=4326)  # 경도, 위도 순서 주의
-                            else:
-                                위치 = None
-                                
-                        except (ValueError, TypeError):
-                            self.stdout.write(
-                                self.style.WARNING(f'행 {row_num}: 유효하지 않은 좌표입니다 ({위도_str}, {경도_str})')
-                            )
-                            error_count += 1
-                            continue
-                        
-                        # 날짜 변환
-                        정보수집일 = None
-                        정보수집일_str = row.get('정보수집일', '').strip()
-                        if 정보수집일_str:
-                            try:
-                                정보수집일 = datetime.strptime(정보수집일_str, '%Y-%m-%d').date()
-                            except ValueError:
-                                self.stdout.write(
-                                    self.style.WARNING(f'행 {row_num}: 유효하지 않은 날짜 형식입니다: {정보수집일_str}')
-                                )
-                        
-                        # BusStop 객체 생성
-                        bus_stop = BusStop(
-                            정류장번호=정류장번호,
-                            정류장명=정류장명,
-                            위치=위치,
-                            정보수집일=정보수집일,
-                            모바일단축번호=row.get('모바일단축번호', '').strip() or None,
-                            도시코드=row.get('도시코드', '').strip() or None,
-                            도시명=row.get('도시명', '').strip() or None,
-                            관리도시명=row.get('관리도시명', '').strip() or None,
-                        )
-                        
-                        batch_objects.append(bus_stop)
-                        
-                        # 배치 크기에 도달하면 저장
-                        if len(batch_objects) >= batch_size:
-                            success_count += self._save_batch(batch_objects)
-                            batch_objects = []
-                            
-                            if total_count % 10000 == 0:
-                                self.stdout.write(f'처리 중... {total_count}개 행 처리됨')
-                        
-                    except Exception as e:
-                        self.stdout.write(
-                            self.style.ERROR(f'행 {row_num} 처리 오류: {str(e)}')
-                        )
-                        error_count += 1
-                        continue
-                
-                # 마지막 배치 저장
-                if batch_objects:
+            batch_objects = []
+
+            for values in self._iter_valid_rows(csv_file):
+                # BusStop 객체 생성
+                batch_objects.append(build_bus_stop(values))
+
+                # 배치 크기에 도달하면 저장
+                if len(batch_objects) >= batch_size:
                     success_count += self._save_batch(batch_objects)
+                    batch_objects = []
+
+                    if self.total_count % 10000 == 0:
+                        self.stdout.write(f'처리 중... {self.total_count}개 행 처리됨')
+
+            # 마지막 배치 저장
+            if batch_objects:
+                success_count += self._save_batch(batch_objects)
 
         except Exception as e:
             raise CommandError(f'CSV 파일 읽기 오류: {str(e)}')
@@ -154,25 +164,233 @@ class Command(BaseCommand):
         self.stdout.write(
             self.style.SUCCESS(
                 f'\n데이터 가져오기 완료!\n'
-                f'총 처리된 행: {total_count}\n'
+                f'총 처리된 행: {self.total_count}\n'
                 f'성공적으로 저장된 정류장: {success_count}\n'
-                f'오류 발생: {error_count}'
+                f'오류 발생: {self.error_count}'
             )
         )
 
-    def _save_batch(self, batch_objects):
-        """배치 객체들을 데이터베이스에 저장"""
-        try:
-            with transaction.atomic():
-                # bulk_create를 사용하여 성능 최적화
-                created_objects = BusStop.objects.bulk_create(
-                    batch_objects, 
-                    ignore_conflicts=True,  # 중복 시 무시
-                    batch_size=500
+    def _handle_parallel(self, csv_file, batch_size, clear_existing, options):
+        """청크 단위 병렬 파싱/저장 + 체크포인트"""
+        workers = max(options['workers'], 1)
+        checkpoint = ImportCheckpoint(options['checkpoint'] or f'{csv_file}.checkpoint.json')
+        reject_path = options['reject_file'] or f'{csv_file}.rejects.csv'
+
+        resumed = options['resume'] and checkpoint.load(csv_file)
+        if options['resume'] and not resumed:
+            self.stdout.write(self.style.WARNING('이어받을 체크포인트가 없거나 파일이 바뀌어 처음부터 시작합니다'))
+
+        if not resumed:
+            if clear_existing:
+                self.stdout.write('기존 버스정류장 데이터를 삭제합니다...')
+                BusStop.objects.all().delete()
+            chunk_count = max(workers, math.ceil(os.path.getsize(csv_file) / CHUNK_BYTES))
+            fieldnames, chunks = split_csv_chunks(csv_file, chunk_count)
+            checkpoint.start(csv_file, fieldnames, chunks)
+            with open(reject_path, 'w', encoding='utf-8', newline='') as f:
+                csv.writer(f).writerow(list(fieldnames) + list(REJECT_EXTRA_COLUMNS))
+
+        pending = checkpoint.pending()
+        self.stdout.write(
+            f'CSV 파일을 병렬로 가져옵니다: {csv_file}\n'
+            f'청크 {len(checkpoint.chunks)}개 중 {len(pending)}개 처리, 프로세스 {workers}개'
+        )
+
+        # fork된 워커가 부모의 DB 연결을 공유하지 않도록 미리 닫음
+        connections.close_all()
+        interrupted = None
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_import_worker) as executor, \
+                open(reject_path, 'a', encoding='utf-8', newline='') as reject_file:
+            reject_writer = csv.writer(reject_file)
+            futures = {
+                executor.submit(import_csv_chunk, csv_file, checkpoint.fieldnames, index, start, end, batch_size): index
+                for index, start, end in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # 실패한 청크는 체크포인트에 남지 않으므로 --resume 으로 다시 처리됨
+                    interrupted = e
+                    self.stdout.write(self.style.ERROR(f'청크 {futures[future]} 처리 실패: {e}'))
+                    continue
+
+                # 리젝트를 먼저 기록한 뒤 체크포인트를 남겨야 재개 시 유실이 없음
+                reject_writer.writerows(result['rejects'])
+                reject_file.flush()
+                checkpoint.mark_done(result)
+                self.stdout.write(
+                    f'청크 {result["chunk"]} 완료: {result["rows"]}행, 저장 {result["saved"]}, '
+                    f'실패 {len(result["rejects"])} ({len(checkpoint.done)}/{len(checkpoint.chunks)})'
                 )
-                return len(created_objects)
+
+        done = checkpoint.done.values()
+        summary = (
+            f'총 처리된 행: {sum(d["rows"] for d in done)}\n'
+            f'성공적으로 저장된 정류장: {sum(d["saved"] for d in done)}\n'
+            f'실패한 행: {sum(d["rejected"] for d in done)} (리젝트 파일: {reject_path})\n'
+            f'날짜 형식 경고: {sum(d["warnings"] for d in done)}'
+        )
+        if interrupted is not None:
+            raise CommandError(
+                f'일부 청크가 실패했습니다. --resume 으로 이어서 처리할 수 있습니다.\n{summary}'
+            )
+
+        checkpoint.remove()
+        self.stdout.write(self.style.SUCCESS(f'\n데이터 가져오기 완료!\n{summary}'))
+
+    def _handle_incremental(self, csv_file, batch_size, delete_missing):
+        """행 해시 비교 기반 증분 갱신 (바뀐 정류장만 upsert)"""
+        self.stdout.write(f'CSV 파일과 기존 데이터를 비교하여 증분 갱신합니다: {csv_file}')
+
+        stored_hashes = dict(BusStop.objects.values_list('정류장번호', '원본해시'))
+        self.stdout.write(f'기존 정류장: {len(stored_hashes)}개')
+
+        self.total_count = 0
+        self.error_count = 0
+        seen = set()
+        created_count = 0
+        updated_count = 0
+        unchanged_count = 0
+
+        try:
+            batch_objects = []
+            for values in self._iter_valid_rows(csv_file):
+                정류장번호 = values['정류장번호']
+                if 정류장번호 in seen:
+                    continue
+                seen.add(정류장번호)
+
+                if 정류장번호 not in stored_hashes:
+                    created_count += 1
+                elif stored_hashes[정류장번호] != values['원본해시']:
+                    updated_count += 1
+                else:
+                    unchanged_count += 1
+                    continue
+
+                batch_objects.append(build_bus_stop(values))
+                if len(batch_objects) >= batch_size:
+                    self._upsert_batch(batch_objects)
+                    batch_objects = []
+
+            if batch_objects:
+                self._upsert_batch(batch_objects)
         except Exception as e:
+            raise CommandError(f'증분 갱신 오류: {str(e)}')
+
+        deleted_count = 0
+        stale_count = 0
+        missing = [정류장번호 for 정류장번호 in stored_hashes if 정류장번호 not in seen]
+        if missing and delete_missing:
+            if not seen:
+                # 빈 파일/전부 오류인 파일로 전체 삭제되는 것을 막음
+                self.stdout.write(self.style.WARNING('유효한 행이 없어 정류장 삭제를 건너뜁니다'))
+            else:
+                for start in range(0, len(missing), batch_size):
+                    batch = missing[start:start + batch_size]
+                    with transaction.atomic():
+                        # 삭제는 bus_stops.수정일시로 감지되지 않으므로 인근 매물을 먼저 재계산 대상으로 표시
+                        stale_count += mark_listings_near_stops_stale(batch)
+                        deleted_count += BusStop.objects.filter(정류장번호__in=batch).delete()[0]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n증분 갱신 완료!\n'
+                f'총 처리된 행: {self.total_count}\n'
+                f'추가된 정류장: {created_count}\n'
+                f'변경된 정류장: {updated_count}\n'
+                f'변경 없음: {unchanged_count}\n'
+                f'삭제된 정류장: {deleted_count}'
+                + (f' (인근 매물 {stale_count}개 정류장 정보 재계산 예정)' if stale_count else '')
+                + (f' (파일에 없는 정류장 {len(missing)}개 유지)' if missing and not delete_missing else '')
+                + f'\n오류 발생: {self.error_count}'
+            )
+        )
+
+    def _upsert_batch(self, batch_objects):
+        """정류장번호 충돌 시 나머지 필드를 갱신 (수정일시도 갱신되어 매물 인근 정류장 증분 계산에 반영)"""
+        with transaction.atomic():
+            BusStop.objects.bulk_create(
+                batch_objects,
+                update_conflicts=True,
+                unique_fields=['정류장번호'],
+                update_fields=[
+                    '정류장명', '위치', '정보수집일', '모바일단축번호',
+                    '도시코드', '도시명', '관리도시명', '원본해시', '수정일시',
+                ],
+                batch_size=500
+            )
+
+    def _handle_fast(self, csv_file, clear_existing):
+        """COPY 기반 고속 적재"""
+        self.stdout.write(f'CSV 파일에서 데이터를 고속 적재합니다 (COPY): {csv_file}')
+        if clear_existing:
+            self.stdout.write('기존 데이터를 비우고 보조 인덱스는 적재 후에 다시 생성합니다')
+
+        self.total_count = 0
+        self.error_count = 0
+
+        rows = (
+            tuple(values[column] for column in STAGING_COLUMNS)
+            for values in self._iter_valid_rows(csv_file)
+        )
+
+        def progress(staged):
+            self.stdout.write(f'처리 중... {staged}개 행 스테이징 적재됨')
+
+        try:
+            staged, inserted = fast_load_bus_stops(rows, clear=clear_existing, progress=progress)
+        except Exception as e:
+            raise CommandError(f'고속 적재 오류: {str(e)}')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n데이터 가져오기 완료!\n'
+                f'총 처리된 행: {self.total_count}\n'
+                f'스테이징 적재 행: {staged}\n'
+                f'성공적으로 저장된 정류장: {inserted}\n'
+                f'오류 발생: {self.error_count}'
+            )
+        )
+
+    def _iter_valid_rows(self, csv_file):
+        """CSV를 읽어 검증/변환된 행 dict를 차례로 반환 (잘못된 행은 경고 후 건너뜀)"""
+        with open(csv_file, 'r', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+
+            for row_num, row in enumerate(reader, start=2):  # 헤더 제외하고 2부터 시작
+                self.total_count += 1
+
+                try:
+                    values = self._parse_row(row, row_num)
+                except Exception as e:
+                    self.stdout.write(
+                        self.style.ERROR(f'행 {row_num} 처리 오류: {str(e)}')
+                    )
+                    values = None
+
+                if values is None:
+                    self.error_count += 1
+                    continue
+                yield values
+
+    def _parse_row(self, row, row_num):
+        """CSV 행 데이터 검증 및 변환 (잘못된 행이면 None)"""
+        def warn(message):
+            self.stdout.write(self.style.WARNING(f'행 {row_num}: {message}'))
+
+        try:
+            return parse_bus_stop_row(row, warn=warn)
+        except BusStopRowError as e:
+            warn(str(e))
+            return None
+
+    def _save_batch(self, batch_objects):
+        """배치 객체들을 데이터베이스에 저장 (배치 실패 시 행 단위로 재시도하여 실패한 행만 제외)"""
+        saved, failures = save_bus_stops_resilient(batch_objects)
+        for i, reason in failures:
             self.stdout.write(
-                self.style.ERROR(f'배치 저장 오류: {str(e)}')
+                self.style.ERROR(f'정류장 {batch_objects[i].정류장번호} {reason}')
             )
-            return 0
+        return saved
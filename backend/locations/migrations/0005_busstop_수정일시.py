@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_region'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='busstop',
+            name='수정일시',
+            field=models.DateTimeField(auto_now=True, null=True, verbose_name='수정 일시'),
+        ),
+    ]
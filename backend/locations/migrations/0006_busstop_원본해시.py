@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0005_busstop_수정일시'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='busstop',
+            name='원본해시',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True, verbose_name='원본 행 해시'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0006_busstop_원본해시'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SidoGeometry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tolerance', models.FloatField(verbose_name='단순화 tolerance')),
+                ('geojson', models.TextField(verbose_name='GeoJSON')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+                ('sido', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='geometries', to='locations.sido', verbose_name='시도')),
+            ],
+            options={
+                'verbose_name': '시도 경계(단순화)',
+                'verbose_name_plural': '시도 경계(단순화)',
+                'db_table': 'sido_geometries',
+                'constraints': [models.UniqueConstraint(fields=('sido', 'tolerance'), name='sido_geometry_unique_level')],
+            },
+        ),
+    ]
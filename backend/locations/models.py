@@ -26,6 +26,43 @@ class Sido(models.Model):
         return self.name or str(self.id)
 
 
+# 시도 경계 단순화 단계 (도 단위 tolerance, 0 = 원본 해상도)
+SIDO_SIMPLIFY_TOLERANCES = (0.0, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+
+def snap_simplify_tolerance(tolerance):
+    """요청 tolerance를 가장 가까운 사전 계산 단계로 맞춤"""
+    return min(SIDO_SIMPLIFY_TOLERANCES, key=lambda level: (abs(level - tolerance), level))
+
+
+class SidoGeometry(models.Model):
+    """
+    시도 경계의 사전 계산 GeoJSON (EPSG:4326 변환 + 단계별 단순화)
+    locations.tasks.build_sido_geometries 가 채움
+    """
+    sido = models.ForeignKey(
+        Sido,
+        on_delete=models.CASCADE,
+        related_name='geometries',
+        db_constraint=False,  # Sido는 다른 스키마의 unmanaged 테이블
+        verbose_name='시도'
+    )
+    tolerance = models.FloatField(verbose_name='단순화 tolerance')
+    geojson = models.TextField(verbose_name='GeoJSON')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
+
+    class Meta:
+        verbose_name = '시도 경계(단순화)'
+        verbose_name_plural = '시도 경계(단순화)'
+        db_table = 'sido_geometries'
+        constraints = [
+            models.UniqueConstraint(fields=['sido', 'tolerance'], name='sido_geometry_unique_level'),
+        ]
+
+    def __str__(self):
+        return f"{self.sido_id} @ {self.tolerance}"
+
+
 class BusStop(models.Model):
     """
     전국 버스정류장 모델
@@ -74,6 +111,19 @@ class BusStop(models.Model):
         blank=True,
         verbose_name='관리 도시 이름'
     )
+    수정일시 = models.DateTimeField(
+        auto_now=True,
+        null=True,
+        verbose_name='수정 일시'
+    )
+    # 원본 CSV 행(검증/변환 후 값)의 해시 - import_bus_stops --incremental 변경 감지용
+    원본해시 = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='원본 행 해시'
+    )
 
     # GeoDjango 설정 (최신 Django에서는 기본 Manager 사용)
     # objects = models.GeoManager()  # 더 이상 사용되지 않음
@@ -0,0 +1,147 @@
+# backend/locations/nearby.py
+"""
+인근 버스정류장 반경 검색 + geohash 셀 캐시
+
+- 검색 지점이 속한 geohash 셀(정밀도 6, 약 1.2km × 0.6km)을 캐시 단위로 사용
+- 셀 캐시에는 "셀 범위 + 최대 검색 반경" 안의 정류장 후보를 저장
+  → 셀 안의 어느 지점에서, 최대 반경 이하로 검색해도 후보가 빠지지 않음
+- 정확한 거리 계산/정렬/개수 제한은 캐시된 후보로 Python에서 처리 (반복 조회 시 DB 접근 없음)
+- 캐시 키에 정류장 데이터 버전(마지막 가져오기 시각, ms)을 포함하여, 새로 가져오면 이전 캐시는 자연히 무시됨
+- 캐시 timeout은 마지막 가져오기 시각 + 가져오기 주기(다음 가져오기 예정 시각)까지
+"""
+import math
+import time
+
+from django.contrib.gis.geos import Polygon
+from django.core.cache import cache
+from django.db.models import Max
+
+from . import geohash
+from .models import BusStop
+
+NEARBY_GEOHASH_PRECISION = 6
+NEARBY_CACHE_PREFIX = "bus_stop_nearby"
+# 셀에 저장하는 데이터 구조가 바뀌면 올려서 기존 캐시를 모두 무시
+NEARBY_CACHE_VERSION = 1
+# 정류장 데이터는 하루 한 번 가져옴 - 셀 캐시는 다음 가져오기 예정 시각까지 보관
+# (가져오기 시 버전이 바뀌어 즉시 무효화되므로 timeout은 메모리 회수용)
+BUS_STOP_IMPORT_INTERVAL_SECONDS = 24 * 60 * 60
+# 예정 시각이 지났는데 아직 가져오지 않은 경우 등의 최소 보관 시간
+NEARBY_CACHE_MIN_TIMEOUT_SECONDS = 10 * 60
+BUS_STOP_DATA_VERSION_KEY = "bus_stop_data_version"
+
+DEFAULT_RADIUS_M = 500
+MAX_RADIUS_M = 1000
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_M / 180.0
+
+
+def get_bus_stop_data_version():
+    """
+    정류장 데이터 버전 (캐시에 없으면 bus_stops 최종 수정일시로 초기화)
+    """
+    version = cache.get(BUS_STOP_DATA_VERSION_KEY)
+    if version is None:
+        latest = BusStop.objects.aggregate(latest=Max('수정일시'))['latest']
+        version = int(latest.timestamp() * 1000) if latest else 0
+        cache.add(BUS_STOP_DATA_VERSION_KEY, version, timeout=None)
+        version = cache.get(BUS_STOP_DATA_VERSION_KEY, version)
+    return version
+
+
+def bump_bus_stop_data_version():
+    """정류장 데이터가 바뀌었음을 기록 (가져오기 명령어 / 정류장 저장·삭제 시 호출)"""
+    version = int(time.time() * 1000)
+    current = cache.get(BUS_STOP_DATA_VERSION_KEY)
+    if current is not None and current >= version:
+        # 같은 밀리초에 여러 번 올려도 값이 바뀌도록
+        version = current + 1
+    cache.set(BUS_STOP_DATA_VERSION_KEY, version, timeout=None)
+    return version
+
+
+def nearby_cache_timeout(version, now=None):
+    """셀 캐시 timeout(초): 데이터 버전(마지막 가져오기 시각) + 가져오기 주기까지, 최소 NEARBY_CACHE_MIN_TIMEOUT_SECONDS"""
+    if now is None:
+        now = time.time()
+    remaining = version / 1000 + BUS_STOP_IMPORT_INTERVAL_SECONDS - now
+    return int(max(remaining, NEARBY_CACHE_MIN_TIMEOUT_SECONDS))
+
+
+def nearby_cache_key(cell, version):
+    return f"{NEARBY_CACHE_PREFIX}:v{NEARBY_CACHE_VERSION}:{version}:{cell}"
+
+
+def _distance_m(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def _load_cell_candidates(cell):
+    """
+    셀 범위를 최대 검색 반경만큼 넓힌 영역의 정류장 (bus_stops.위치 GiST 인덱스 사용)
+
+    Returns:
+        list[tuple]: [(정류장번호, 정류장명, 위도, 경도), ...]
+    """
+    min_lat, min_lng, max_lat, max_lng = geohash.bounds(cell)
+    lat_margin = MAX_RADIUS_M / METERS_PER_DEGREE_LAT
+    lng_margin = lat_margin / math.cos(math.radians(max(abs(min_lat), abs(max_lat)) + lat_margin))
+    envelope = Polygon.from_bbox((
+        min_lng - lng_margin, min_lat - lat_margin,
+        max_lng + lng_margin, max_lat + lat_margin,
+    ))
+    envelope.srid = 4326
+
+    rows = (
+        BusStop.objects
+        .filter(위치__bboverlaps=envelope)
+        .order_by()
+        .values_list('정류장번호', '정류장명', '위치')
+    )
+    return [(번호, 이름, 위치.y, 위치.x) for 번호, 이름, 위치 in rows]
+
+
+def find_nearby_bus_stops(lat, lng, radius_m=DEFAULT_RADIUS_M, limit=DEFAULT_LIMIT):
+    """
+    반경 내 버스정류장 (가까운 순)
+
+    Args:
+        radius_m: MAX_RADIUS_M 이하
+        limit: 최대 개수
+
+    Returns:
+        list[dict]: [{"stop_id", "stop_name", "lat", "lng", "distance_m"}, ...]
+    """
+    cell = geohash.encode(lat, lng, NEARBY_GEOHASH_PRECISION)
+    version = get_bus_stop_data_version()
+    key = nearby_cache_key(cell, version)
+    candidates = cache.get(key)
+    if candidates is None:
+        candidates = _load_cell_candidates(cell)
+        cache.set(key, candidates, nearby_cache_timeout(version))
+
+    matches = []
+    for stop_id, stop_name, stop_lat, stop_lng in candidates:
+        distance = _distance_m(lat, lng, stop_lat, stop_lng)
+        if distance <= radius_m:
+            matches.append((distance, stop_id, stop_name, stop_lat, stop_lng))
+    matches.sort()
+
+    return [
+        {
+            'stop_id': stop_id,
+            'stop_name': stop_name,
+            'lat': round(stop_lat, 8),
+            'lng': round(stop_lng, 8),
+            'distance_m': round(distance),
+        }
+        for distance, stop_id, stop_name, stop_lat, stop_lng in matches[:limit]
+    ]
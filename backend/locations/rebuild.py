@@ -0,0 +1,81 @@
+# backend/locations/rebuild.py
+"""
+시도 TopoJSON 재생성 요청 병합(debounce) 상태 - Redis
+
+- 시도 저장/삭제마다 재생성하지 않고, 변경 묶음(burst)마다 한 번만 재생성
+- last_change: 마지막 변경 시각 / dirty_since: 마지막 재생성 이후 첫 변경 시각
+- pending: 예약된 재생성 Task가 있음 (SET NX로 처음 세운 쪽만 예약 → 대기 중 최대 1개)
+- lock: 재생성 실행 중 (SET NX → 실행 중 최대 1개)
+- 재생성은 마지막 변경 후 QUIET 초가 지나야 시작, 단 dirty_since 후 MAX_DELAY 초가 지나면 바로 시작
+"""
+import time
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+LAST_CHANGE_KEY = "sido_topojson:last_change"
+DIRTY_SINCE_KEY = "sido_topojson:dirty_since"
+PENDING_KEY = "sido_topojson:rebuild_pending"
+LOCK_KEY = "sido_topojson:rebuild_lock"
+
+QUIET_SECONDS = getattr(settings, "SIDO_TOPOJSON_QUIET_SECONDS", 30)
+MAX_DELAY_SECONDS = getattr(settings, "SIDO_TOPOJSON_MAX_DELAY_SECONDS", 5 * 60)
+LOCK_TIMEOUT = 30 * 60  # CELERY_TASK_TIME_LIMIT와 동일
+# 예약된 Task가 유실되어도 pending이 영원히 남지 않도록
+PENDING_TIMEOUT = MAX_DELAY_SECONDS + LOCK_TIMEOUT
+
+
+def mark_changed():
+    """
+    변경 기록 후, 예약된 재생성이 없을 때만 True (호출측이 Task 예약)
+    """
+    now = time.time()
+    conn = get_redis_connection("default")
+    pipe = conn.pipeline()
+    pipe.set(LAST_CHANGE_KEY, now)
+    pipe.set(DIRTY_SINCE_KEY, now, nx=True)
+    pipe.set(PENDING_KEY, 1, nx=True, ex=PENDING_TIMEOUT)
+    return bool(pipe.execute()[2])
+
+
+def seconds_until_due(force=False):
+    """
+    재생성 시작까지 더 기다려야 하는 시간(초), 0이면 지금 시작 가능
+    """
+    if force:
+        return 0
+    conn = get_redis_connection("default")
+    last_change, dirty_since = conn.mget(LAST_CHANGE_KEY, DIRTY_SINCE_KEY)
+    if last_change is None:
+        return 0
+    now = time.time()
+    quiet_wait = float(last_change) + QUIET_SECONDS - now
+    if dirty_since is not None:
+        # 변경이 계속 이어져도 MAX_DELAY 이상 미루지 않음
+        quiet_wait = min(quiet_wait, float(dirty_since) + MAX_DELAY_SECONDS - now)
+    return max(quiet_wait, 0)
+
+
+def acquire_rebuild(clear_pending=True):
+    """
+    재생성 lock 획득, 성공하면 pending/dirty 상태를 비움
+    (이후 들어온 변경은 새 pending 하나로 모여 이번 재생성 뒤에 다시 반영됨)
+
+    Args:
+        clear_pending: 예약된 Task가 직접 실행될 때만 True
+    """
+    conn = get_redis_connection("default")
+    if not conn.set(LOCK_KEY, 1, nx=True, ex=LOCK_TIMEOUT):
+        return False
+    if clear_pending:
+        conn.delete(PENDING_KEY, DIRTY_SINCE_KEY)
+    return True
+
+
+def clear_pending():
+    """예약된 Task가 재생성 없이 끝난 경우 pending 해제 (다음 변경이 새 Task를 예약하도록)"""
+    get_redis_connection("default").delete(PENDING_KEY)
+
+
+def release_rebuild():
+    get_redis_connection("default").delete(LOCK_KEY)
@@ -0,0 +1,93 @@
+# backend/locations/renderers.py
+"""
+orjson 기반 JSON 렌더링 + DB가 만든 GeoJSON 문자열 그대로 삽입
+
+- AsGeoJSON 결과를 json.loads → 다시 인코딩하지 않고 orjson.Fragment로 출력 바이트에 그대로 삽입
+  (수 MB 경계 좌표를 Python 객체로 만들지 않아 지연 시간/최대 메모리 감소)
+- 캐시에는 렌더링된 바이트를 저장하고, 응답 시 다시 Fragment로 감싸 그대로 출력
+- orjson이 설치되지 않은 경우 기존처럼 json.loads 후 DRF JSONRenderer로 인코딩
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    # orjson이 없으면 표준 json으로 파싱/인코딩
+    orjson = None
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+
+def raw_json(text):
+    """
+    이미 JSON인 문자열/바이트를 출력에 그대로 삽입할 값으로 변환 (orjson이 없으면 파싱한 Python 객체)
+    orjson.Fragment는 내용을 검증하지 않으므로 DB(AsGeoJSON)처럼 신뢰할 수 있는 출처에만 사용
+    외부 프로그램 출력 등은 checked_raw_json 사용
+    """
+    if orjson is not None:
+        return orjson.Fragment(text)
+    return json.loads(text)
+
+
+def checked_raw_json(content):
+    """
+    신뢰할 수 없는 JSON을 한 번 파싱하여 검증한 뒤 그대로 삽입할 값으로 변환
+
+    Returns:
+        (raw_json과 동일, 파싱한 객체)
+
+    Raises:
+        ValueError: 잘못된 JSON인 경우
+    """
+    if orjson is not None:
+        parsed = orjson.loads(content)
+        return orjson.Fragment(content), parsed
+    parsed = json.loads(content)
+    return parsed, parsed
+
+
+def dumps_json(data):
+    """공백 없는 UTF-8 JSON 바이트 (orjson.Fragment는 그대로 삽입)"""
+    if orjson is not None:
+        # datetime/UUID 등은 orjson이, Decimal/지연 번역 문자열 등은 DRF 인코더가 처리
+        return orjson.dumps(data, default=_encoder.default)
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def parse_fragments(data):
+    """Fragment를 포함한 값을 일반 Python 객체로 (좌표를 직접 다뤄야 할 때만 사용)"""
+    if orjson is not None:
+        return orjson.loads(dumps_json(data))
+    return data
+
+
+def render_cacheable(data):
+    """
+    캐시에 저장할 응답 값 (Fragment는 pickle할 수 없으므로 렌더링된 바이트로)
+    prerendered()로 다시 응답 데이터로 만듦
+    """
+    if orjson is not None:
+        return dumps_json(data)
+    return data
+
+
+def prerendered(value):
+    """render_cacheable() 결과를 Response 데이터로 (바이트면 다시 인코딩하지 않고 그대로 출력)"""
+    if orjson is not None and isinstance(value, bytes):
+        return orjson.Fragment(value)
+    return value
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    orjson 기반 JSON 렌더러 (orjson이 없으면 DRF JSONRenderer와 동일)
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return dumps_json(data)
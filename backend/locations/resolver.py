@@ -0,0 +1,209 @@
+# backend/locations/resolver.py
+"""
+좌표(위도, 경도) → 시도(Sido) / 지역(Region) 판별
+
+- 시도: 시도 경계(EPSG:4326 변환)를 폴리곤 조각(섬 포함) 단위로 나눠 STRtree에 넣고,
+  bbox 후보만 prepared geometry로 포함 판정 (좌표 배열 단위로 한 번에 처리)
+- shapely가 설치되지 않은 경우 PostGIS ST_Contains 쿼리로 대체
+- 지역: Region에는 경계가 없으므로, 판별된 시도 안에서 주소에 시군구와 읍면동 이름이
+  모두 들어있는 행을 선택 (도로명주소의 "(역삼동)" 같은 참고항목 포함)
+- 프로세스마다 한 번 메모리에 올리고, 시도가 바뀌거나(세대 번호) RESOLVER_MAX_AGE_SECONDS가 지나면 다시 로드
+"""
+import re
+import time
+from collections import defaultdict
+
+import numpy as np
+
+try:
+    import shapely
+    from shapely import STRtree
+except ImportError:
+    # shapely가 없으면 시도 판별은 PostGIS 쿼리로 처리
+    shapely = None
+    STRtree = None
+from django.contrib.gis.db.models.functions import AsWKB, Transform
+from django.contrib.gis.geos import Point
+
+from .caching import sido_data_generation
+from .models import Region, Sido
+
+# Region 관리 화면 수정은 세대 번호를 바꾸지 않으므로 주기적으로도 다시 로드
+RESOLVER_MAX_AGE_SECONDS = 60 * 60
+NO_SIDO = -1
+
+# 시도 정식 명칭 → 약칭 (Region.시도가 약칭/구 명칭이어도 Sido.name과 맞추기 위함)
+SIDO_SHORT_NAMES = {
+    '서울특별시': '서울',
+    '부산광역시': '부산',
+    '대구광역시': '대구',
+    '인천광역시': '인천',
+    '광주광역시': '광주',
+    '대전광역시': '대전',
+    '울산광역시': '울산',
+    '세종특별자치시': '세종',
+    '경기도': '경기',
+    '강원도': '강원',
+    '강원특별자치도': '강원',
+    '충청북도': '충북',
+    '충청남도': '충남',
+    '전라북도': '전북',
+    '전북특별자치도': '전북',
+    '전라남도': '전남',
+    '경상북도': '경북',
+    '경상남도': '경남',
+    '제주도': '제주',
+    '제주특별자치도': '제주',
+}
+
+_ADDRESS_SEPARATORS = re.compile(r'[\s(),]+')
+
+
+def sido_key(name):
+    """시도 명칭 비교용 키 (정식 명칭/약칭 모두 약칭으로)"""
+    name = (name or '').strip()
+    return SIDO_SHORT_NAMES.get(name, name)
+
+
+def address_tokens(*addresses):
+    """주소 문자열들을 공백/괄호/쉼표 기준 토큰 목록으로"""
+    tokens = []
+    for address in addresses:
+        if address:
+            tokens.extend(token for token in _ADDRESS_SEPARATORS.split(address) if token)
+    return tokens
+
+
+def resolve_sido_id_db(lat, lng):
+    """PostGIS ST_Contains로 시도 판별 (shapely가 없을 때)"""
+    point = Point(float(lng), float(lat), srid=4326)  # 경도, 위도 순서 주의
+    return Sido.objects.filter(geom__contains=point).values_list('id', flat=True).first()
+
+
+class RegionResolver:
+    """
+    메모리 시도 경계 STRtree + 지역(Region) 이름 색인
+
+    Args:
+        sido_rows: [(시도 id, 시도명, EPSG:4326 WKB 또는 None), ...]
+        region_rows: [(지역 id, 시도, 시군구, 읍면동), ...]
+    """
+
+    def __init__(self, sido_rows, region_rows):
+        self.sido_keys = {sido_id: sido_key(name) for sido_id, name, _ in sido_rows}
+
+        # (시도 키, 읍면동) → [(시군구, 지역 id), ...]
+        self.regions_by_dong = defaultdict(list)
+        for region_id, region_sido, sigungu, dong in region_rows:
+            self.regions_by_dong[(sido_key(region_sido), dong)].append((sigungu, region_id))
+
+        self.tree = None
+        if shapely is not None:
+            rows = [(sido_id, bytes(wkb)) for sido_id, _, wkb in sido_rows if wkb]
+            geometries = shapely.from_wkb([wkb for _, wkb in rows])
+            # MultiPolygon을 조각으로 나눠 bbox가 작아지도록 (섬이 많은 시도)
+            parts, owner = shapely.get_parts(geometries, return_index=True)
+            shapely.prepare(parts)
+            self.parts = parts
+            self.part_sido_ids = np.array([sido_id for sido_id, _ in rows], dtype=np.int64)[owner]
+            self.tree = STRtree(parts)
+
+    @classmethod
+    def from_db(cls):
+        sido_rows = list(
+            Sido.objects
+            .annotate(wkb=AsWKB(Transform('geom', 4326)))
+            .order_by('id')
+            .values_list('id', 'name', 'wkb')
+        )
+        region_rows = list(
+            Region.objects
+            .filter(활성화여부=True)
+            .order_by()
+            .values_list('id', '시도', '시군구', '읍면동')
+        )
+        return cls(sido_rows, region_rows)
+
+    @property
+    def has_geometry(self):
+        return self.tree is not None
+
+    def resolve_sido_ids(self, lats, lngs):
+        """
+        좌표 배열 → 시도 id 배열 (경계 밖/좌표 없음은 NO_SIDO)
+        경계선 위의 점은 id가 가장 작은 시도로 판별
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        result = np.full(len(lats), NO_SIDO, dtype=np.int64)
+        located = np.flatnonzero(np.isfinite(lats) & np.isfinite(lngs))
+        if len(located) == 0:
+            return result
+
+        if self.tree is None:
+            for i in located:
+                sido_id = resolve_sido_id_db(lats[i], lngs[i])
+                if sido_id is not None:
+                    result[i] = sido_id
+            return result
+
+        # 1. bbox 후보 (점, 조각) 쌍 / 2. prepared geometry로 실제 포함 판정
+        point_index, part_index = self.tree.query(shapely.points(lngs[located], lats[located]))
+        hit = shapely.intersects_xy(
+            self.parts[part_index], lngs[located][point_index], lats[located][point_index]
+        )
+        point_index, part_index = point_index[hit], part_index[hit]
+        # 같은 점에 여러 시도가 걸리면 작은 id가 남도록 큰 id부터 기록
+        sido_ids = self.part_sido_ids[part_index]
+        order = np.argsort(-sido_ids, kind='stable')
+        result[located[point_index[order]]] = sido_ids[order]
+        return result
+
+    def resolve_region_id(self, sido_id, *addresses):
+        """
+        시도 안에서 주소에 시군구/읍면동 이름이 모두 들어있는 지역 id (없으면 None)
+        """
+        key = self.sido_keys.get(sido_id)
+        if key is None:
+            return None
+        tokens = address_tokens(*addresses)
+        padded = f" {' '.join(tokens)} "
+        for token in dict.fromkeys(tokens):
+            for sigungu, region_id in self.regions_by_dong.get((key, token), ()):
+                # "수원시 장안구"처럼 여러 단어인 시군구도 연속된 토큰으로 비교
+                if f" {sigungu} " in padded:
+                    return region_id
+        return None
+
+    def resolve(self, lat, lng, *addresses):
+        """
+        단일 좌표 판별
+
+        Returns:
+            tuple: (시도 id 또는 None, 지역 id 또는 None)
+        """
+        if lat is None or lng is None:
+            return None, None
+        sido_id = int(self.resolve_sido_ids([float(lat)], [float(lng)])[0])
+        if sido_id == NO_SIDO:
+            return None, None
+        return sido_id, self.resolve_region_id(sido_id, *addresses)
+
+
+_resolver = None
+_resolver_generation = None
+_resolver_loaded_at = 0.0
+
+
+def get_region_resolver():
+    """
+    프로세스에 보관된 RegionResolver (시도 세대 번호가 바뀌었거나 오래되면 다시 로드)
+    """
+    global _resolver, _resolver_generation, _resolver_loaded_at
+    generation = sido_data_generation()
+    expired = time.monotonic() - _resolver_loaded_at > RESOLVER_MAX_AGE_SECONDS
+    if _resolver is None or generation != _resolver_generation or expired:
+        _resolver = RegionResolver.from_db()
+        _resolver_generation = generation
+        _resolver_loaded_at = time.monotonic()
+    return _resolver
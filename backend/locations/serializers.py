@@ -1,11 +1,10 @@
 # backend/locations/serializers.py
-import json
-
 from django.contrib.gis.geos import GEOSException
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_field
 
 from .models import Sido
+from .renderers import raw_json
 
 DEFAULT_SIMPLIFY_TOLERANCE = 0.001
 
@@ -28,12 +27,10 @@ class SidoSerializer(serializers.ModelSerializer):
         def get_geometry(self, obj):
             return obj.geom_geojson
     def get_geometry(self, obj):
+        # DB가 만든 GeoJSON 문자열은 파싱하지 않고 ORJSONRenderer 출력에 그대로 삽입
         annotated_geojson = getattr(obj, "geom_geojson", None)
         if annotated_geojson:
-            try:
-                return json.loads(annotated_geojson)
-            except json.JSONDecodeError:
-                return None
+            return raw_json(annotated_geojson)
 
         tolerance = DEFAULT_SIMPLIFY_TOLERANCE
         request = self.context.get("request")
@@ -55,7 +52,7 @@ class SidoSerializer(serializers.ModelSerializer):
             geom = obj.geom.transform(4326, clone=True)
             if tolerance > 0:
                 geom = geom.simplify(tolerance, preserve_topology=True)
-            return json.loads(geom.geojson)
+            return raw_json(geom.geojson)
         except GEOSException:
             return None
 
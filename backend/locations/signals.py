@@ -1,4 +1,5 @@
 # backend/locations/signals.py
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.cache import cache
@@ -11,26 +12,36 @@ except ImportError:
             return None
     current_app = MockCelery()
 
-from .models import Sido
-from .tasks import generate_sido_topojson, clear_topojson_cache
+from .caching import invalidate_sido_cache
+from .models import BusStop, Sido
+from .nearby import bump_bus_stop_data_version
+from .tasks import build_sido_geometries, schedule_sido_topojson_rebuild, clear_topojson_cache
 
 
 @receiver(post_save, sender=Sido)
 def sido_post_save(sender, instance, created, **kwargs):
     """
     Sido 모델 저장 후 신호 처리
-    - 캐시 무효화
-    - TopoJSON 재생성 Task 실행
+    - 시도 목록/상세 응답 캐시 무효화 (세대 번호 증가)
+    - TopoJSON 재생성 예약 (변경 묶음마다 한 번, 조용한 시간 후 실행)
+      재생성 전까지는 기존 파일을 계속 제공하고, 완료 시 _update_topojson_cache가 캐시 상태를 갱신
     """
     try:
         print(f"Sido post_save signal triggered - ID: {instance.id}, Created: {created}")
         
-        # 1. TopoJSON 관련 캐시 무효화
-        _invalidate_topojson_cache()
+        # 1. 응답 캐시 무효화 (커밋 전에 세대를 올리면 그 사이 요청이 커밋 전 데이터를
+        #    새 세대로 캐시하므로 커밋 후 실행)
+        sido_id = instance.id
+        _on_commit(invalidate_sido_cache, sido_id)
         
-        # 2. TopoJSON 재생성 Task 실행 (비동기)
-        task = generate_sido_topojson.delay()
-        print(f"TopoJSON regeneration task queued: {task.id}")
+        # 2. TopoJSON 재생성 예약 (이미 대기 중인 재생성이 있으면 합쳐짐)
+        #    커밋 전에 예약하면 긴 트랜잭션에서 재생성이 커밋 전 데이터를 읽을 수 있으므로 커밋 후
+        _on_commit(_schedule_topojson_rebuild)
+
+        # 3. 해당 시도의 단계별 단순화 경계 재계산 (비동기)
+        #    커밋 전에 실행되면 Task가 이전 경계를 읽으므로 커밋 후 등록
+        #    (완료 시 Task가 해당 시도의 응답 캐시를 다시 무효화)
+        transaction.on_commit(lambda: build_sido_geometries.delay(sido_ids=[sido_id]))
         
     except Exception as e:
         print(f"Error in sido_post_save signal: {e}")
@@ -40,23 +51,65 @@ def sido_post_save(sender, instance, created, **kwargs):
 def sido_post_delete(sender, instance, **kwargs):
     """
     Sido 모델 삭제 후 신호 처리
-    - 캐시 무효화
-    - TopoJSON 재생성 Task 실행
+    - 시도 목록/상세 응답 캐시 무효화 (세대 번호 증가)
+    - TopoJSON 재생성 예약 (변경 묶음마다 한 번, 조용한 시간 후 실행)
+      재생성 전까지는 기존 파일을 계속 제공하고, 완료 시 _update_topojson_cache가 캐시 상태를 갱신
     """
     try:
         print(f"Sido post_delete signal triggered - ID: {instance.id}")
         
-        # 1. TopoJSON 관련 캐시 무효화
-        _invalidate_topojson_cache()
+        # 1. 응답 캐시 무효화 (커밋 후)
+        _on_commit(invalidate_sido_cache, instance.id)
         
-        # 2. TopoJSON 재생성 Task 실행 (비동기)
-        task = generate_sido_topojson.delay()
-        print(f"TopoJSON regeneration task queued after delete: {task.id}")
+        # 2. TopoJSON 재생성 예약 (이미 대기 중인 재생성이 있으면 합쳐짐, 커밋 후)
+        _on_commit(_schedule_topojson_rebuild)
         
     except Exception as e:
         print(f"Error in sido_post_delete signal: {e}")
 
 
+@receiver(post_save, sender=BusStop)
+@receiver(post_delete, sender=BusStop)
+def bus_stop_changed(sender, instance, **kwargs):
+    """
+    BusStop 개별 저장/삭제 후 인근 정류장 캐시 무효화 (데이터 버전 갱신)
+    - bulk_create 등 일괄 작업은 신호가 없으므로 import_bus_stops 명령어에서 직접 갱신
+    """
+    try:
+        bump_bus_stop_data_version()
+    except Exception as e:
+        print(f"Error in bus_stop_changed signal: {e}")
+
+
+def _on_commit(func, *args):
+    """
+    현재 트랜잭션 커밋 후 실행 (트랜잭션 밖이면 바로 실행)
+    커밋은 이미 끝났으므로 실패해도 저장 요청이 실패하지 않도록 예외는 기록만 함
+    """
+    def callback():
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"Error in {func.__name__} after commit: {e}")
+
+    transaction.on_commit(callback)
+
+
+def _schedule_topojson_rebuild(force=False):
+    """
+    TopoJSON 재생성 예약
+
+    Returns:
+        str | None: 새로 예약한 Task id (대기 중인 재생성에 합쳐졌으면 None)
+    """
+    task = schedule_sido_topojson_rebuild(force=force)
+    if task is None:
+        print("TopoJSON regeneration already pending, change coalesced")
+        return None
+    print(f"TopoJSON regeneration task scheduled: {task.id}")
+    return task.id
+
+
 def _invalidate_topojson_cache():
     """
     TopoJSON 관련 캐시를 무효화
@@ -66,6 +119,7 @@ def _invalidate_topojson_cache():
         cache_keys = [
             'sido_topojson_ready',
             'sido_topojson_file',
+            'sido_topojson_etag',
             'sido_topojson_time',
             'sido_topojson_feature_count'
         ]
@@ -88,13 +142,14 @@ def invalidate_topojson_cache_manually():
         # 1. 캐시 무효화
         _invalidate_topojson_cache()
         
-        # 2. 재생성 Task 실행
-        task = generate_sido_topojson.delay()
+        # 2. 재생성 예약 (조용한 시간 없이 바로, 대기 중인 재생성이 있으면 그 Task로 합쳐짐)
+        task_id = _schedule_topojson_rebuild(force=True)
         
         return {
             'status': 'success',
-            'message': 'TopoJSON 캐시가 무효화되고 재생성 작업이 시작되었습니다.',
-            'task_id': task.id
+            'message': 'TopoJSON 캐시가 무효화되고 재생성 작업이 시작되었습니다.'
+            if task_id else 'TopoJSON 캐시가 무효화되었습니다. 이미 예약된 재생성 작업에 반영됩니다.',
+            'task_id': task_id
         }
         
     except Exception as e:
@@ -0,0 +1,358 @@
+# backend/locations/spatial_index.py
+"""
+버스정류장 인메모리 격자 공간 인덱스 (NumPy)
+
+- 정류장 좌표를 격자 셀 순서로 정렬한 연속 배열 + 셀별 시작 위치(CSR) 배열로 구성
+- build_bus_stop_index 관리 명령어가 스냅샷(.npy 파일 모음)을 새 버전 디렉토리에 쓰고
+  포인터 파일(CURRENT)만 교체, 각 워커는 get_bus_stop_index()로 한 번만 memory-map 하여 공유
+- 반경 검색 / k-최근접 검색을 PostGIS 왕복 없이 수 마이크로초~수십 마이크로초에 처리
+"""
+import json
+import math
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+# 한국 전역을 덮는 격자 (0.01도 ≈ 1.1km)
+GRID_CELL_DEG = 0.01
+GRID_LAT_MIN, GRID_LAT_MAX = 32.0, 40.0
+GRID_LNG_MIN, GRID_LNG_MAX = 123.0, 133.0
+GRID_ROWS = int(round((GRID_LAT_MAX - GRID_LAT_MIN) / GRID_CELL_DEG))
+GRID_COLS = int(round((GRID_LNG_MAX - GRID_LNG_MIN) / GRID_CELL_DEG))
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_M / 180.0
+
+# k-최근접 검색 시 반경을 두 배씩 넓혀가는 시작/최대 반경
+KNN_START_RADIUS_M = 250
+KNN_MAX_RADIUS_M = 50000
+
+SNAPSHOT_ARRAYS = (
+    'lat', 'lng', 'cell_start',
+    'ids_blob', 'ids_offsets', 'names_blob', 'names_offsets', 'name_codes',
+)
+SNAPSHOT_META_FILE = 'meta.json'
+# 현재 스냅샷 버전 디렉토리 이름을 담은 파일 (이 파일 하나만 원자적으로 교체)
+SNAPSHOT_POINTER_FILE = 'CURRENT'
+SNAPSHOT_VERSION_PREFIX = 'v'
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """두 좌표(배열 가능) 사이의 대원 거리(m)"""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _cell_rows_cols(lats, lngs):
+    rows = np.floor((np.asarray(lats, dtype=np.float64) - GRID_LAT_MIN) / GRID_CELL_DEG).astype(np.int64)
+    cols = np.floor((np.asarray(lngs, dtype=np.float64) - GRID_LNG_MIN) / GRID_CELL_DEG).astype(np.int64)
+    return rows, cols
+
+
+def _radius_span(lat, radius_m):
+    """반경(m)을 덮는 위도/경도 방향 셀 개수"""
+    dlat = radius_m / METERS_PER_DEGREE_LAT
+    max_abs_lat = min(abs(lat) + dlat, 89.0)
+    dlng = dlat / math.cos(math.radians(max_abs_lat))
+    return int(math.ceil(dlat / GRID_CELL_DEG)), int(math.ceil(dlng / GRID_CELL_DEG))
+
+
+def _encode_strings(values):
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(value) for value in encoded])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8) if encoded else np.zeros(0, dtype=np.uint8)
+    return blob, offsets
+
+
+class BusStopGridIndex:
+    """
+    격자 셀 순서로 정렬된 정류장 배열
+
+    cell_start[c] ~ cell_start[c + 1] 구간이 셀 c(= row * GRID_COLS + col)의 정류장이며,
+    같은 row의 연속된 col 범위는 배열에서도 연속 구간이 된다.
+    """
+
+    def __init__(self, arrays, meta=None):
+        self.lat = arrays['lat']
+        self.lng = arrays['lng']
+        self.cell_start = arrays['cell_start']
+        self.ids_blob = arrays['ids_blob']
+        self.ids_offsets = arrays['ids_offsets']
+        self.names_blob = arrays['names_blob']
+        self.names_offsets = arrays['names_offsets']
+        self.name_codes = arrays['name_codes']
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.lat)
+
+    # ------------------------------------------------------------------
+    # 생성 / 스냅샷
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_records(cls, records):
+        """
+        (정류장번호, 정류장명, 위도, 경도) 목록으로 인덱스 생성
+        격자 범위 밖 좌표는 제외
+        """
+        records = [r for r in records if r[2] is not None and r[3] is not None]
+        lat = np.array([float(r[2]) for r in records], dtype=np.float64)
+        lng = np.array([float(r[3]) for r in records], dtype=np.float64)
+        rows, cols = _cell_rows_cols(lat, lng)
+        inside = (rows >= 0) & (rows < GRID_ROWS) & (cols >= 0) & (cols < GRID_COLS)
+
+        cells = rows[inside] * GRID_COLS + cols[inside]
+        kept = np.flatnonzero(inside)
+        order = np.argsort(cells, kind='stable')
+        cells = cells[order]
+        kept = kept[order]
+
+        cell_start = np.zeros(GRID_ROWS * GRID_COLS + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=GRID_ROWS * GRID_COLS), out=cell_start[1:])
+
+        ids = [records[i][0] for i in kept]
+        names = [records[i][1] for i in kept]
+        ids_blob, ids_offsets = _encode_strings(ids)
+        names_blob, names_offsets = _encode_strings(names)
+        if names:
+            _, name_codes = np.unique(np.array(names, dtype=object), return_inverse=True)
+        else:
+            name_codes = np.zeros(0)
+
+        arrays = {
+            'lat': lat[kept],
+            'lng': lng[kept],
+            'cell_start': cell_start,
+            'ids_blob': ids_blob,
+            'ids_offsets': ids_offsets,
+            'names_blob': names_blob,
+            'names_offsets': names_offsets,
+            'name_codes': name_codes.astype(np.int32),
+        }
+        meta = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'count': int(len(kept)),
+            'cell_deg': GRID_CELL_DEG,
+            'built_at': datetime.now().isoformat(),
+        }
+        return cls(arrays, meta)
+
+    def save(self, directory):
+        """
+        스냅샷을 directory 아래 새 버전 디렉토리에 쓴 뒤 포인터 파일(CURRENT)만 교체
+        (os.replace 한 번으로 바뀌므로 읽는 워커가 반쯤 쓰인 파일이나 빈 디렉토리를 보지 않음)
+        직전 버전은 아직 읽는 워커가 있을 수 있어 남기고, 그 이전 버전만 삭제
+
+        Returns:
+            Path: 새 버전 디렉토리
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        previous = snapshot_version(directory)
+
+        version = f'{SNAPSHOT_VERSION_PREFIX}{time.time_ns()}'
+        version_dir = directory / version
+        version_dir.mkdir()
+        for name in SNAPSHOT_ARRAYS:
+            np.save(version_dir / f'{name}.npy', np.ascontiguousarray(getattr(self, name)))
+        with open(version_dir / SNAPSHOT_META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+
+        tmp_pointer = directory / f'{SNAPSHOT_POINTER_FILE}.tmp'
+        tmp_pointer.write_text(version, encoding='utf-8')
+        os.replace(tmp_pointer, directory / SNAPSHOT_POINTER_FILE)
+
+        for path in directory.iterdir():
+            if path.is_dir() and path.name.startswith(SNAPSHOT_VERSION_PREFIX) and path.name not in (version, previous):
+                shutil.rmtree(path, ignore_errors=True)
+        return version_dir
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """스냅샷 로드 (기본: memory-map, 여러 워커가 페이지 캐시를 공유)"""
+        directory = Path(directory)
+        version = snapshot_version(directory)
+        if version is not None:
+            directory = directory / version
+        with open(directory / SNAPSHOT_META_FILE, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 인덱스 스냅샷 버전입니다: {meta.get('format_version')}")
+        mmap_mode = 'r' if mmap else None
+        arrays = {
+            name: np.load(directory / f'{name}.npy', mmap_mode=mmap_mode)
+            for name in SNAPSHOT_ARRAYS
+        }
+        return cls(arrays, meta)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def stop_id(self, index):
+        start, end = self.ids_offsets[index], self.ids_offsets[index + 1]
+        return bytes(self.ids_blob[start:end]).decode('utf-8')
+
+    def stop_name(self, index):
+        start, end = self.names_offsets[index], self.names_offsets[index + 1]
+        return bytes(self.names_blob[start:end]).decode('utf-8')
+
+    def _candidates(self, lat, lng, radius_m):
+        """반경을 덮는 셀들의 정류장 인덱스 (row마다 연속 구간 하나)"""
+        row_span, col_span = _radius_span(lat, radius_m)
+        rows, cols = _cell_rows_cols(lat, lng)
+        row, col = int(rows), int(cols)
+        r0, r1 = max(row - row_span, 0), min(row + row_span, GRID_ROWS - 1)
+        c0, c1 = max(col - col_span, 0), min(col + col_span, GRID_COLS - 1)
+        if r0 > r1 or c0 > c1:
+            return np.zeros(0, dtype=np.int64)
+
+        base = np.arange(r0, r1 + 1, dtype=np.int64) * GRID_COLS
+        starts = self.cell_start[base + c0]
+        ends = self.cell_start[base + c1 + 1]
+        return np.concatenate([np.arange(s, e) for s, e in zip(starts, ends) if e > s] or [np.zeros(0, dtype=np.int64)])
+
+    def query_radius(self, lat, lng, radius_m):
+        """
+        반경 내 정류장 검색
+
+        Returns:
+            tuple: (정류장 인덱스 배열, 거리(m) 배열) - 가까운 순
+        """
+        candidates = self._candidates(lat, lng, radius_m)
+        if len(candidates) == 0:
+            return candidates, np.zeros(0)
+        distances = haversine_m(lat, lng, self.lat[candidates], self.lng[candidates])
+        within = distances <= radius_m
+        candidates, distances = candidates[within], distances[within]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+    def query_knn(self, lat, lng, k, max_radius_m=KNN_MAX_RADIUS_M):
+        """
+        k-최근접 정류장 검색 (반경을 두 배씩 넓혀가며 k개 이상 찾으면 종료)
+
+        Returns:
+            tuple: (정류장 인덱스 배열, 거리(m) 배열) - 가까운 순, 최대 k개
+        """
+        radius = KNN_START_RADIUS_M
+        while True:
+            indices, distances = self.query_radius(lat, lng, radius)
+            if len(indices) >= k or radius >= max_radius_m:
+                return indices[:k], distances[:k]
+            radius = min(radius * 2, max_radius_m)
+
+    def pairs_within(self, lats, lngs, radius_m):
+        """
+        여러 지점에 대한 반경 내 (지점, 정류장) 쌍을 한 번에 계산 (완전 벡터화)
+
+        Returns:
+            tuple: (지점 인덱스 배열, 정류장 인덱스 배열, 거리(m) 배열)
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+        if len(lats) == 0:
+            return empty
+
+        row_span, col_span = _radius_span(float(np.max(np.abs(lats))), radius_m)
+        rows, cols = _cell_rows_cols(lats, lngs)
+        point_parts, stop_parts, distance_parts = [], [], []
+
+        for d_row in range(-row_span, row_span + 1):
+            neighbor_rows = rows + d_row
+            valid_row = (neighbor_rows >= 0) & (neighbor_rows < GRID_ROWS)
+            c0 = np.clip(cols - col_span, 0, GRID_COLS - 1)
+            c1 = np.clip(cols + col_span, 0, GRID_COLS - 1)
+            valid = valid_row & (cols + col_span >= 0) & (cols - col_span < GRID_COLS)
+            points = np.flatnonzero(valid)
+            if len(points) == 0:
+                continue
+
+            # 한 row 안에서 c0~c1 셀은 배열상 연속 구간 [start, end)
+            base = neighbor_rows[points] * GRID_COLS
+            starts = self.cell_start[base + c0[points]]
+            ends = self.cell_start[base + c1[points] + 1]
+            counts = ends - starts
+            total = int(counts.sum())
+            if total == 0:
+                continue
+
+            point_idx = np.repeat(points, counts)
+            offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+            stop_idx = np.repeat(starts, counts) + offsets
+
+            distances = haversine_m(lats[point_idx], lngs[point_idx], self.lat[stop_idx], self.lng[stop_idx])
+            within = distances <= radius_m
+            point_parts.append(point_idx[within])
+            stop_parts.append(stop_idx[within])
+            distance_parts.append(distances[within])
+
+        if not point_parts:
+            return empty
+        return np.concatenate(point_parts), np.concatenate(stop_parts), np.concatenate(distance_parts)
+
+
+def bus_stop_records_from_db():
+    """bus_stops 테이블의 (정류장번호, 정류장명, 위도, 경도) 목록"""
+    from .models import BusStop
+
+    rows = (
+        BusStop.objects
+        .filter(위치__isnull=False)
+        .values_list('정류장번호', '정류장명', '위치')
+        .iterator(chunk_size=10000)
+    )
+    return [(번호, 이름, 위치.y, 위치.x) for 번호, 이름, 위치 in rows]
+
+
+def get_bus_stop_index_dir():
+    return Path(getattr(settings, 'BUS_STOP_INDEX_DIR', Path(settings.BASE_DIR) / 'data' / 'bus_stop_index'))
+
+
+def snapshot_version(directory):
+    """포인터 파일이 가리키는 현재 스냅샷 버전 (없으면 None)"""
+    try:
+        return (Path(directory) / SNAPSHOT_POINTER_FILE).read_text(encoding='utf-8').strip() or None
+    except OSError:
+        return None
+
+
+_index_lock = threading.Lock()
+_loaded_index = None
+_loaded_version = None
+
+
+def get_bus_stop_index():
+    """
+    프로세스당 한 번 로드되는 정류장 인덱스 (스냅샷이 다시 만들어지면 자동으로 다시 로드)
+
+    Returns:
+        BusStopGridIndex | None: 스냅샷이 없으면 None
+    """
+    global _loaded_index, _loaded_version
+    directory = get_bus_stop_index_dir()
+    version = snapshot_version(directory)
+    if version is None:
+        return None
+
+    if _loaded_index is not None and _loaded_version == version:
+        return _loaded_index
+
+    with _index_lock:
+        if _loaded_index is None or _loaded_version != version:
+            _loaded_index = BusStopGridIndex.load(directory / version)
+            _loaded_version = version
+    return _loaded_index
@@ -1,5 +1,6 @@
 # backend/locations/tasks.py
-import json
+import gzip
+import hashlib
 import os
 from pathlib import Path
 from datetime import datetime
@@ -13,26 +14,123 @@ except ImportError:
         def decorator(func):
             return func
         return decorator
+try:
+    import brotli
+except ImportError:
+    # brotli가 없으면 .br 압축본 없이 .gz만 생성
+    brotli = None
 from django.conf import settings
 from django.contrib.gis.db.models.functions import AsGeoJSON, Transform
 from django.contrib.gis.geos import GEOSGeometry
 from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Value
 
-from .models import Sido
+from . import rebuild
+from .caching import invalidate_sido_cache
+from .geo import SimplifyPreserveTopology
+from .models import SIDO_SIMPLIFY_TOLERANCES, Sido, SidoGeometry
+from .renderers import checked_raw_json, dumps_json, parse_fragments, raw_json
+from .topojson import encode_topology
 
 
 @shared_task(bind=True, name='locations.generate_sido_topojson')
 def generate_sido_topojson(self) -> Dict[str, Any]:
     """
     Sido 데이터를 기반으로 TopoJSON 파일을 생성하는 Celery Task
+    (재생성 lock을 잡지 못하면 이미 실행 중인 재생성이 있으므로 건너뜀)
     
     Returns:
         Dict[str, Any]: 작업 결과 정보
     """
+    # 예약된 rebuild_sido_topojson Task는 그대로 두어야 하므로 pending 상태는 유지
+    if not rebuild.acquire_rebuild(clear_pending=False):
+        return {
+            'status': 'skipped',
+            'message': '이미 TopoJSON 재생성이 진행 중입니다.'
+        }
+    try:
+        return _build_sido_topojson(
+            progress=lambda step: self.update_state(state='PROGRESS', meta={'step': step})
+        )
+    finally:
+        rebuild.release_rebuild()
+
+
+@shared_task(name='locations.rebuild_sido_topojson')
+def rebuild_sido_topojson(force=False) -> Dict[str, Any]:
+    """
+    시도 변경 묶음(burst)마다 한 번 실행되는 TopoJSON 재생성 Task
+    - schedule_sido_topojson_rebuild()로만 예약 (대기 중인 Task는 항상 최대 1개)
+    - 마지막 변경 후 조용한 시간이 지나지 않았으면 남은 시간만큼 다시 미룸
+    - 다른 재생성이 실행 중이면 끝난 뒤로 미룸 (실행 중인 재생성도 최대 1개)
+
+    Args:
+        force: True면 조용한 시간을 기다리지 않음 (수동 재생성)
+    """
+    try:
+        wait = rebuild.seconds_until_due(force)
+        if wait > 0:
+            rebuild_sido_topojson.apply_async(kwargs={'force': force}, countdown=wait)
+            return {
+                'status': 'deferred',
+                'message': '시도 데이터 변경이 이어지고 있어 재생성을 미뤘습니다.',
+                'countdown': wait
+            }
+
+        if not rebuild.acquire_rebuild():
+            rebuild_sido_topojson.apply_async(kwargs={'force': force}, countdown=rebuild.QUIET_SECONDS)
+            return {
+                'status': 'deferred',
+                'message': '이미 TopoJSON 재생성이 진행 중이어서 완료 후로 미뤘습니다.',
+                'countdown': rebuild.QUIET_SECONDS
+            }
+    except Exception as e:
+        # 다시 예약하지 못했으므로 pending을 풀어 이후 변경이 없는 Task에 합쳐지지 않도록 함
+        try:
+            rebuild.clear_pending()
+        except Exception:
+            pass
+        return {
+            'status': 'error',
+            'message': f'TopoJSON 재생성 예약 처리 중 오류 발생: {str(e)}'
+        }
+
+    try:
+        return _build_sido_topojson()
+    finally:
+        rebuild.release_rebuild()
+
+
+def schedule_sido_topojson_rebuild(force=False):
+    """
+    시도 데이터 변경을 기록하고, 대기 중인 재생성이 없을 때만 재생성 Task 예약
+
+    Args:
+        force: True면 조용한 시간 없이 바로 재생성 (수동 재생성)
+
+    Returns:
+        AsyncResult | None: 새로 예약한 Task (이미 대기 중이면 None)
+    """
+    if not rebuild.mark_changed():
+        return None
+    countdown = 0 if force else rebuild.QUIET_SECONDS
+    return rebuild_sido_topojson.apply_async(kwargs={'force': force}, countdown=countdown)
+
+
+def _build_sido_topojson(progress=None) -> Dict[str, Any]:
+    """
+    TopoJSON 파일 생성 본체
+
+    Args:
+        progress: 단계 이름을 받는 콜백 (Celery 진행 상태 보고용)
+    """
+    if progress is None:
+        progress = lambda step: None
+
     try:
         # 1. DB에서 모든 Sido 데이터 조회
-        self.update_state(state='PROGRESS', meta={'step': 'fetching_data'})
+        progress('fetching_data')
         
         # GeoJSON으로 변환하면서 조회 (SRID 4326으로 변환)
         queryset = Sido.objects.all().annotate(
@@ -45,32 +143,27 @@ def generate_sido_topojson(self) -> Dict[str, Any]:
             if not sido.geom_geojson:
                 continue
                 
-            try:
-                # GeoJSON 파싱
-                geojson_geom = json.loads(sido.geom_geojson)
-                
-                # Feature 생성
-                feature = {
-                    "type": "Feature",
-                    "id": str(sido.id),
-                    "properties": {
-                        "id": sido.id,
-                        "name": sido.name,
-                        "bjcd": sido.bjcd,
-                        "ufid": sido.ufid,
-                        "divi": sido.divi,
-                        "scls": sido.scls,
-                        "fmta": sido.fmta,
-                        "created_at": sido.created_at.isoformat() if sido.created_at else None,
-                        "updated_at": sido.updated_at.isoformat() if sido.updated_at else None,
-                    },
-                    "geometry": geojson_geom
-                }
-                features.append(feature)
-                
-            except (json.JSONDecodeError, AttributeError) as e:
-                print(f"Error processing Sido {sido.id}: {e}")
-                continue
+            # DB가 만든 GeoJSON은 파싱하지 않고 그대로 삽입 (orjson.Fragment)
+            geojson_geom = raw_json(sido.geom_geojson)
+            
+            # Feature 생성
+            feature = {
+                "type": "Feature",
+                "id": str(sido.id),
+                "properties": {
+                    "id": sido.id,
+                    "name": sido.name,
+                    "bjcd": sido.bjcd,
+                    "ufid": sido.ufid,
+                    "divi": sido.divi,
+                    "scls": sido.scls,
+                    "fmta": sido.fmta,
+                    "created_at": sido.created_at.isoformat() if sido.created_at else None,
+                    "updated_at": sido.updated_at.isoformat() if sido.updated_at else None,
+                },
+                "geometry": geojson_geom
+            }
+            features.append(feature)
         
         # FeatureCollection 생성
         geojson_data = {
@@ -78,17 +171,17 @@ def generate_sido_topojson(self) -> Dict[str, Any]:
             "features": features
         }
         
-        self.update_state(state='PROGRESS', meta={'step': 'converting_to_topojson'})
+        progress('converting_to_topojson')
         
         # 2. GeoJSON을 TopoJSON으로 변환
         topojson_data = _geojson_to_topojson(geojson_data)
         
-        self.update_state(state='PROGRESS', meta={'step': 'saving_file'})
+        progress('saving_file')
         
         # 3. 파일 저장
         output_path = _save_topojson_file(topojson_data)
         
-        self.update_state(state='PROGRESS', meta={'step': 'updating_cache'})
+        progress('updating_cache')
         
         # 4. 캐시 업데이트
         _update_topojson_cache(output_path, len(features))
@@ -126,6 +219,7 @@ def clear_topojson_cache():
         cache_keys = [
             'sido_topojson_ready',
             'sido_topojson_file',
+            'sido_topojson_etag',
             'sido_topojson_time',
             'sido_topojson_error',
             'sido_topojson_feature_count'
@@ -146,6 +240,79 @@ def clear_topojson_cache():
         }
 
 
+@shared_task(name='locations.build_sido_geometries')
+def build_sido_geometries(sido_ids=None) -> Dict[str, Any]:
+    """
+    시도 경계를 EPSG:4326 변환 + 단계별(SIDO_SIMPLIFY_TOLERANCES) 단순화하여
+    sido_geometries 테이블에 미리 저장하는 Celery Task
+
+    Args:
+        sido_ids: 일부 시도만 갱신할 때 id 목록 (None이면 전체)
+    """
+    try:
+        saved, rebuilt_ids = _build_sido_geometries(sido_ids)
+        # 커밋된 뒤 무효화: 재계산 전에 이전 단계 경계로 채워진 응답 캐시를 버림
+        for sido_id in rebuilt_ids:
+            invalidate_sido_cache(sido_id)
+        return {
+            'status': 'success',
+            'message': '시도 경계 단순화 데이터가 갱신되었습니다.',
+            'saved_geometries': saved,
+            'levels': list(SIDO_SIMPLIFY_TOLERANCES),
+        }
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': f'시도 경계 단순화 중 오류 발생: {str(e)}'
+        }
+
+
+def _build_sido_geometries(sido_ids=None):
+    """
+    단계별 GeoJSON을 upsert하고, 더 이상 없는 시도의 행은 삭제
+
+    Returns:
+        tuple: (저장된 경계 수, 갱신/삭제된 시도 id 집합)
+    """
+    queryset = Sido.objects.all()
+    if sido_ids is not None:
+        queryset = queryset.filter(id__in=sido_ids)
+    existing_ids = set(queryset.values_list('id', flat=True))
+
+    saved = 0
+    with transaction.atomic():
+        for tolerance in SIDO_SIMPLIFY_TOLERANCES:
+            expression = Transform('geom', 4326)
+            if tolerance > 0:
+                expression = SimplifyPreserveTopology(expression, Value(tolerance))
+            rows = (
+                queryset
+                .annotate(geom_geojson=AsGeoJSON(expression))
+                .values_list('id', 'geom_geojson')
+            )
+            geometries = [
+                SidoGeometry(sido_id=sido_id, tolerance=tolerance, geojson=geojson)
+                for sido_id, geojson in rows
+                if geojson
+            ]
+            SidoGeometry.objects.bulk_create(
+                geometries,
+                update_conflicts=True,
+                unique_fields=['sido', 'tolerance'],
+                update_fields=['geojson', 'updated_at'],
+                batch_size=50
+            )
+            saved += len(geometries)
+
+        stale = SidoGeometry.objects.exclude(sido_id__in=existing_ids)
+        if sido_ids is not None:
+            stale = stale.filter(sido_id__in=sido_ids)
+        stale_ids = set(stale.values_list('sido_id', flat=True).distinct())
+        stale.delete()
+
+    return saved, existing_ids | stale_ids
+
+
 def _geojson_to_topojson(geojson_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     GeoJSON을 TopoJSON으로 변환 (Mapshaper 사용)
@@ -159,11 +326,10 @@ def _geojson_to_topojson(geojson_data: Dict[str, Any]) -> Dict[str, Any]:
     try:
         import subprocess
         import tempfile
-        import json
         
         # 임시 파일 생성
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.geojson', delete=False) as geojson_file:
-            json.dump(geojson_data, geojson_file, ensure_ascii=False)
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.geojson', delete=False) as geojson_file:
+            geojson_file.write(dumps_json(geojson_data))
             geojson_path = geojson_file.name
         
         # TopoJSON 임시 파일 경로
@@ -190,8 +356,11 @@ def _geojson_to_topojson(geojson_data: Dict[str, Any]) -> Dict[str, Any]:
                 raise Exception(f"Mapshaper 실행 오류: {result.stderr}")
             
             # 변환된 TopoJSON 파일 읽기
-            with open(topojson_path, 'r', encoding='utf-8') as f:
-                topojson_result = json.load(f)
+            # 외부 프로그램 출력이므로 한 번 파싱하여 검증한 뒤, 저장 시에는 다시 인코딩하지 않고 그대로 삽입
+            with open(topojson_path, 'rb') as f:
+                topojson_result, parsed = checked_raw_json(f.read())
+            if not isinstance(parsed, dict) or parsed.get('type') != 'Topology':
+                raise Exception("Mapshaper 출력이 TopoJSON Topology가 아닙니다")
             
             return topojson_result
             
@@ -218,75 +387,61 @@ def _geojson_to_topojson(geojson_data: Dict[str, Any]) -> Dict[str, Any]:
 
 def _simple_geojson_to_topojson(geojson_data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    topojson 라이브러리 없이 간단한 TopoJSON 형태로 변환
-    실제로는 GeoJSON과 동일하지만 TopoJSON 구조를 모방
+    mapshaper 없이 Python(NumPy) 인코더로 TopoJSON 변환
+    인접 시도 간 공유 경계를 하나의 arc로 합치고 좌표를 양자화/델타 인코딩
     """
-    return {
-        "type": "Topology",
-        "objects": {
-            "sido": {
-                "type": "GeometryCollection",
-                "geometries": geojson_data["features"]
-            }
-        },
-        "arcs": [],
-        "bbox": _calculate_bbox(geojson_data["features"]),
-        "transform": {
-            "scale": [1, 1],
-            "translate": [0, 0]
-        }
-    }
-
-
-def _calculate_bbox(features: list) -> list:
-    """
-    Feature들의 경계 상자를 계산
-    """
-    if not features:
-        return [0, 0, 0, 0]
-    
-    min_lon = min_lat = float('inf')
-    max_lon = max_lat = float('-inf')
-    
-    for feature in features:
-        geom = feature.get('geometry', {})
-        if geom.get('type') == 'MultiPolygon':
-            for polygon in geom.get('coordinates', []):
-                for ring in polygon:
-                    for coord in ring:
-                        lon, lat = coord[0], coord[1]
-                        min_lon = min(min_lon, lon)
-                        max_lon = max(max_lon, lon)
-                        min_lat = min(min_lat, lat)
-                        max_lat = max(max_lat, lat)
-    
-    return [min_lon, min_lat, max_lon, max_lat]
+    # NumPy 인코더는 좌표가 필요하므로 이 경로에서만 geometry를 파싱
+    return encode_topology(parse_fragments(geojson_data), object_name='sido')
 
 
 def _save_topojson_file(topojson_data: Dict[str, Any]) -> Path:
     """
     TopoJSON 데이터를 파일로 저장
-    
+    - 요청마다 다시 파싱/압축하지 않도록 압축본(.gz, brotli 설치 시 .br)도 함께 저장
+    - 임시 파일에 쓴 뒤 교체하여 읽는 중인 요청이 반쯤 쓰인 파일을 보지 않도록 함
+
     Args:
         topojson_data: TopoJSON 데이터
-        
+
     Returns:
         Path: 저장된 파일 경로
     """
     # 디렉토리 생성
     output_dir = Path(settings.STATIC_ROOT) / "data" / "locations"
     output_dir.mkdir(parents=True, exist_ok=True)
-    
+
     # 파일 경로
     output_path = output_dir / "sido_topo.json"
-    
-    # JSON 파일로 저장
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(topojson_data, f, ensure_ascii=False, indent=2)
-    
+
+    # 공백 없는 JSON (그대로 응답 본문으로 전송됨)
+    content = dumps_json(topojson_data)
+
+    variants = {output_path: content}
+    variants[output_path.with_name(output_path.name + '.gz')] = gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        variants[output_path.with_name(output_path.name + '.br')] = brotli.compress(content)
+    else:
+        # brotli가 없어진 경우 이전 .br이 새 원본과 어긋나지 않도록 삭제
+        output_path.with_name(output_path.name + '.br').unlink(missing_ok=True)
+
+    for path, data in variants.items():
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
     return output_path
 
 
+def topojson_etag(file_path: Path) -> str:
+    """파일 내용 해시 (ETag 값)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()[:32]
+
+
 def _update_topojson_cache(file_path: Path, feature_count: int):
     """
     TopoJSON 관련 캐시 상태 업데이트
@@ -300,6 +455,7 @@ def _update_topojson_cache(file_path: Path, feature_count: int):
     # 캐시 업데이트
     cache.set('sido_topojson_ready', True, timeout=None)
     cache.set('sido_topojson_file', str(file_path), timeout=None)
+    cache.set('sido_topojson_etag', topojson_etag(file_path), timeout=None)
     cache.set('sido_topojson_time', now.isoformat(), timeout=None)
     cache.set('sido_topojson_feature_count', feature_count, timeout=None)
     
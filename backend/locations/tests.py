@@ -1,8 +1,25 @@
+import csv
 import json
-from django.test import TestCase
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
 from rest_framework.test import APIClient
-from django.contrib.gis.geos import MultiPolygon, Polygon
-from locations.models import Sido
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from locations import caching, geohash, nearby
+from listings.models import Listing
+from locations.bus_stop_loader import split_csv_chunks
+from locations.models import BusStop, Sido
+from users.models import UserProfile
+from locations.renderers import ORJSONRenderer, checked_raw_json, prerendered, raw_json, render_cacheable
+from locations.resolver import RegionResolver, shapely
+from locations.spatial_index import BusStopGridIndex, haversine_m, snapshot_version
+from locations.topojson import encode_topology
+from locations.views import _topojson_variant
 
 
 class SidoAPITestCase(TestCase):
@@ -69,3 +86,385 @@ class SidoAPITestCase(TestCase):
         names = [f["properties"]["name"] for f in data["features"]]
         self.assertIn("부산광역시", names)
         self.assertNotIn("서울특별시", names)
+
+
+class BusStopGridIndexTestCase(SimpleTestCase):
+    def setUp(self):
+        self.records = [
+            ("1", "강남역", 37.4979, 127.0276),
+            ("2", "역삼역", 37.5006, 127.0364),
+            ("3", "선릉역", 37.5045, 127.0490),
+            ("4", "부산역", 35.1151, 129.0415),
+            ("5", "범위밖", 10.0, 10.0),
+        ]
+        self.index = BusStopGridIndex.from_records(self.records)
+
+    def _ids(self, indices):
+        return [self.index.stop_id(i) for i in indices]
+
+    def test_out_of_grid_records_are_skipped(self):
+        self.assertEqual(len(self.index), 4)
+
+    def test_query_radius_matches_brute_force(self):
+        """반경 검색 결과가 전수 거리 계산과 같은지 (가까운 순)"""
+        lat, lng = 37.4990, 127.0300
+        indices, distances = self.index.query_radius(lat, lng, 1500)
+        expected = sorted(
+            (haversine_m(lat, lng, r[2], r[3]), r[0])
+            for r in self.records
+            if haversine_m(lat, lng, r[2], r[3]) <= 1500
+        )
+        self.assertEqual(self._ids(indices), [stop_id for _, stop_id in expected])
+
+    def test_query_knn_expands_radius(self):
+        """가까운 정류장이 멀리 있어도 반경을 넓혀 k개를 찾는지"""
+        indices, _ = self.index.query_knn(35.0, 129.0, 1)
+        self.assertEqual(self._ids(indices), ["4"])
+
+    def test_pairs_within(self):
+        points, stops, _ = self.index.pairs_within([37.4979, 35.1151], [127.0276, 129.0415], 100)
+        pairs = sorted(zip(points.tolist(), self._ids(stops)))
+        self.assertEqual(pairs, [(0, "1"), (1, "4")])
+
+    def test_snapshot_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.index.save(f"{tmp}/index")
+            loaded = BusStopGridIndex.load(f"{tmp}/index")
+            self.assertEqual(len(loaded), 4)
+            self.assertEqual(
+                [loaded.stop_name(i) for i in range(len(loaded))],
+                [self.index.stop_name(i) for i in range(len(self.index))],
+            )
+
+    def test_snapshot_save_swaps_pointer_and_keeps_previous_version(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = f"{tmp}/index"
+            versions = [self.index.save(directory).name for _ in range(3)]
+            self.assertEqual(len(set(versions)), 3)
+            self.assertEqual(snapshot_version(directory), versions[-1])
+            # 직전 버전은 읽는 중인 워커를 위해 남기고 그 이전 버전만 삭제
+            self.assertEqual(
+                sorted(p for p in os.listdir(directory) if p.startswith("v")),
+                sorted(versions[-2:]),
+            )
+            self.assertEqual(len(BusStopGridIndex.load(directory)), 4)
+
+
+class BusStopImportTestCase(TestCase):
+    FIELDNAMES = ['정류장번호', '정류장명', '위도', '경도', '정보수집일', '모바일단축번호', '도시코드', '도시명', '관리도시명']
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write_csv(self, rows):
+        path = os.path.join(self.tmp.name, 'bus_stops.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.FIELDNAMES)
+            for stop_id, name, lat, lng in rows:
+                writer.writerow([stop_id, name, lat, lng, '2024-01-01', '', '11', '서울', '서울'])
+        return path
+
+    def _import(self, rows, *args):
+        call_command('import_bus_stops', self._write_csv(rows), '--incremental', *args, stdout=StringIO())
+
+    def test_incremental_upserts_changed_rows_and_deletes_missing(self):
+        self._import([('1', '강남역', 37.4979, 127.0276), ('2', '역삼역', 37.5006, 127.0364)])
+        untouched = BusStop.objects.get(정류장번호='2').수정일시
+
+        self._import([('2', '역삼역', 37.5006, 127.0364), ('3', '선릉역', 37.5045, 127.0490)])
+        self.assertEqual(sorted(BusStop.objects.values_list('정류장번호', flat=True)), ['2', '3'])
+        # 해시가 같은 행은 다시 쓰지 않음
+        self.assertEqual(BusStop.objects.get(정류장번호='2').수정일시, untouched)
+
+        self._import([('2', '역삼역 (중앙)', 37.5006, 127.0364), ('3', '선릉역', 37.5045, 127.0490)])
+        self.assertEqual(BusStop.objects.get(정류장번호='2').정류장명, '역삼역 (중앙)')
+        self.assertGreater(BusStop.objects.get(정류장번호='2').수정일시, untouched)
+
+    def test_delete_marks_nearby_listings_for_refresh(self):
+        self._import([('1', '강남역', 37.4979, 127.0276), ('4', '부산역', 35.1151, 129.0415)])
+        profile = UserProfile.objects.create(user=get_user_model().objects.create(username='owner'))
+        near, far = (
+            Listing.objects.create(
+                등록사용자ID=profile, 매물타입='sale', 주택종류='apartment',
+                주소='테스트 주소', 위도=Decimal(lat), 경도=Decimal(lng),
+            )
+            for lat, lng in (('37.49800000', '127.02770000'), ('37.56650000', '126.97800000'))
+        )
+        Listing.objects.update(버스정류장갱신일시='2024-01-01T00:00:00Z')
+
+        self._import([('4', '부산역', 35.1151, 129.0415)])
+        self.assertIsNone(Listing.objects.get(pk=near.pk).버스정류장갱신일시)
+        self.assertIsNotNone(Listing.objects.get(pk=far.pk).버스정류장갱신일시)
+
+        # --keep-missing 이면 삭제/표시하지 않음
+        Listing.objects.update(버스정류장갱신일시='2024-01-01T00:00:00Z')
+        self._import([], '--keep-missing')
+        self.assertEqual(BusStop.objects.count(), 1)
+        self.assertIsNotNone(Listing.objects.get(pk=near.pk).버스정류장갱신일시)
+
+
+class CsvChunkSplitTestCase(SimpleTestCase):
+    def test_chunks_cover_body_on_line_boundaries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'stops.csv')
+            lines = ['정류장번호,정류장명'] + [f'{i},정류장{i}' for i in range(100)]
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+
+            fieldnames, chunks = split_csv_chunks(path, 4)
+            self.assertEqual(fieldnames, ['정류장번호', '정류장명'])
+            self.assertEqual(len(chunks), 4)
+            with open(path, 'rb') as f:
+                body = b''
+                for start, end in chunks:
+                    f.seek(start)
+                    part = f.read(end - start)
+                    self.assertTrue(part.endswith(b'\n'))
+                    body += part
+            self.assertEqual(body.decode('utf-8').splitlines(), lines[1:])
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class BusStopNearbyAPITestCase(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = APIClient()
+        for stop_id, name, lat, lng in (
+            ("A", "강남역", 37.4980, 127.0277),      # 약 14m
+            ("B", "강남역 북쪽", 37.4990, 127.0276),  # 약 122m
+            ("C", "역삼 입구", 37.5010, 127.0276),    # 약 345m
+            ("D", "먼 정류장", 37.5060, 127.0276),    # 약 900m
+        ):
+            BusStop.objects.create(정류장번호=stop_id, 정류장명=name, 위치=Point(lng, lat, srid=4326))
+
+    def _nearby(self, lat, lng, **params):
+        response = self.client.get("/api/bus-stops/nearby/", {"lat": lat, "lng": lng, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["stops"]
+
+    def test_radius_filter_ordering_and_limit(self):
+        stops = self._nearby(37.4979, 127.0276, radius=400)
+        self.assertEqual([stop["stop_id"] for stop in stops], ["A", "B", "C"])
+        self.assertEqual([stop["distance_m"] for stop in stops], sorted(stop["distance_m"] for stop in stops))
+        self.assertTrue(all(stop["distance_m"] <= 400 for stop in stops))
+
+        stops = self._nearby(37.4979, 127.0276, radius=1000, limit=2)
+        self.assertEqual([stop["stop_id"] for stop in stops], ["A", "B"])
+
+    def test_cell_cache_reused_until_data_version_changes(self):
+        # 두 검색 지점은 같은 geohash 셀
+        self.assertEqual(geohash.encode(37.4979, 127.0276, 6), geohash.encode(37.4984, 127.0280, 6))
+        self._nearby(37.4979, 127.0276)
+
+        # 신호 없는 변경은 셀 캐시에 반영되지 않음 → 같은 셀의 다른 지점도 캐시된 후보 사용
+        BusStop.objects.filter(정류장번호="A").update(정류장명="이름 변경")
+        self.assertEqual(self._nearby(37.4984, 127.0280)[0]["stop_name"], "강남역")
+
+        nearby.bump_bus_stop_data_version()
+        self.assertEqual(self._nearby(37.4984, 127.0280)[0]["stop_name"], "이름 변경")
+
+    def test_cache_timeout_follows_import_time(self):
+        now = 1_700_000_000
+        self.assertEqual(nearby.nearby_cache_timeout(now * 1000, now=now), nearby.BUS_STOP_IMPORT_INTERVAL_SECONDS)
+        self.assertEqual(
+            nearby.nearby_cache_timeout((now - 23 * 60 * 60) * 1000, now=now), 60 * 60
+        )
+        self.assertEqual(nearby.nearby_cache_timeout(0, now=now), nearby.NEARBY_CACHE_MIN_TIMEOUT_SECONDS)
+
+
+class GeohashTestCase(SimpleTestCase):
+    def test_encode(self):
+        self.assertEqual(geohash.encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(geohash.encode(37.4979, 127.0276, 6), "wydm6d")
+
+    def test_bounds_contains_point(self):
+        min_lat, min_lng, max_lat, max_lng = geohash.bounds(geohash.encode(37.4979, 127.0276, 6))
+        self.assertTrue(min_lat <= 37.4979 <= max_lat)
+        self.assertTrue(min_lng <= 127.0276 <= max_lng)
+
+
+class TopoJSONEncoderTestCase(SimpleTestCase):
+    def _feature(self, name, coordinates):
+        return {
+            "type": "Feature",
+            "id": name,
+            "properties": {"name": name},
+            "geometry": {"type": "Polygon", "coordinates": coordinates},
+        }
+
+    def _decode_ring(self, topology, arc_ids):
+        scale = topology["transform"]["scale"]
+        translate = topology["transform"]["translate"]
+        ring = []
+        for position, arc_id in enumerate(arc_ids):
+            x = y = 0
+            points = []
+            for dx, dy in topology["arcs"][arc_id if arc_id >= 0 else ~arc_id]:
+                x, y = x + dx, y + dy
+                points.append((round(x * scale[0] + translate[0], 6), round(y * scale[1] + translate[1], 6)))
+            if arc_id < 0:
+                points.reverse()
+            ring.extend(points if position == 0 else points[1:])
+        return ring
+
+    def test_shared_border_is_one_arc(self):
+        """인접한 두 폴리곤의 공유 경계는 arc 하나를 서로 반대 방향으로 참조"""
+        topology = encode_topology({
+            "type": "FeatureCollection",
+            "features": [
+                self._feature("A", [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]),
+                self._feature("B", [[[1, 0], [2, 0], [2, 1], [1, 1], [1, 0]]]),
+            ],
+        }, object_name="sido", quantization=1001)
+
+        self.assertEqual(topology["type"], "Topology")
+        geometries = topology["objects"]["sido"]["geometries"]
+        self.assertEqual(len(topology["arcs"]), 3)
+        arcs_a = set(geometries[0]["arcs"][0])
+        arcs_b = set(geometries[1]["arcs"][0])
+        self.assertEqual(len({a if a >= 0 else ~a for a in arcs_a} & {b if b >= 0 else ~b for b in arcs_b}), 1)
+        self.assertEqual(geometries[1]["properties"], {"name": "B"})
+
+        ring_a = self._decode_ring(topology, geometries[0]["arcs"][0])
+        self.assertEqual(ring_a[0], ring_a[-1])
+        self.assertEqual(set(ring_a), {(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)})
+
+
+class TopoJSONVariantTestCase(SimpleTestCase):
+    def setUp(self):
+        from pathlib import Path
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "sido_topo.json"
+        for name in ("sido_topo.json", "sido_topo.json.gz", "sido_topo.json.br"):
+            (Path(self.tmpdir.name) / name).write_bytes(b"{}")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_prefers_brotli(self):
+        self.assertEqual(_topojson_variant(self.path, "gzip, deflate, br")[1], "br")
+
+    def test_skips_encodings_with_q_zero(self):
+        self.assertEqual(_topojson_variant(self.path, "gzip, br;q=0")[1], "gzip")
+        self.assertEqual(_topojson_variant(self.path, "br;q=0, gzip;q=0")[1], None)
+        self.assertEqual(_topojson_variant(self.path, "*;q=0")[1], None)
+
+    def test_higher_q_wins(self):
+        self.assertEqual(_topojson_variant(self.path, "br;q=0.5, gzip;q=1.0")[1], "gzip")
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class SidoCacheGenerationTestCase(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_invalidate_changes_list_and_own_detail_keys_only(self):
+        list_key = caching.list_cache_key("sig")
+        detail_1 = caching.detail_cache_key(1, "sig")
+        detail_2 = caching.detail_cache_key(2, "sig")
+
+        caching.invalidate_sido_cache(1)
+
+        self.assertNotEqual(caching.list_cache_key("sig"), list_key)
+        self.assertNotEqual(caching.detail_cache_key(1, "sig"), detail_1)
+        self.assertEqual(caching.detail_cache_key(2, "sig"), detail_2)
+
+    def test_invalidate_keeps_unrelated_entries(self):
+        from django.core.cache import cache
+        cache.set("listing_tile:v1:1:2:3", b"tile")
+        caching.invalidate_sido_cache(1)
+        self.assertEqual(cache.get("listing_tile:v1:1:2:3"), b"tile")
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class SingleFlightCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return {"calls": self.calls}
+
+    def test_computes_once_while_fresh(self):
+        self.assertEqual(caching.get_or_compute("k", self.compute), {"calls": 1})
+        self.assertEqual(caching.get_or_compute("k", self.compute), {"calls": 1})
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_value_served_while_another_request_recomputes(self):
+        from django.core.cache import cache
+        cache.set("k", {"value": "stale", "delta": 0.1, "expires_at": 0}, 60)
+        cache.add("k:lock", "other", 60)
+        self.assertEqual(caching.get_or_compute("k", self.compute), "stale")
+        self.assertEqual(self.calls, 0)
+
+        cache.delete("k:lock")
+        self.assertEqual(caching.get_or_compute("k", self.compute), {"calls": 1})
+
+    def test_early_refresh_probability(self):
+        entry = {"delta": 1.0, "expires_at": 1000.0}
+        self.assertFalse(caching._should_recompute(entry, now=0.0))
+        self.assertTrue(caching._should_recompute(entry, now=1000.0))
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    def test_geojson_fragment_spliced_and_cached_bytes_passed_through(self):
+        data = {
+            "type": "Feature",
+            "properties": {"name": "서울특별시"},
+            "geometry": raw_json('{"type":"Point","coordinates":[127.0,37.5]}'),
+        }
+        rendered = ORJSONRenderer().render(data)
+        self.assertEqual(
+            json.loads(rendered),
+            {
+                "type": "Feature",
+                "properties": {"name": "서울특별시"},
+                "geometry": {"type": "Point", "coordinates": [127.0, 37.5]},
+            },
+        )
+        # 캐시된 값은 다시 인코딩하지 않고 같은 바이트로 출력
+        self.assertEqual(ORJSONRenderer().render(prerendered(render_cacheable(data))), rendered)
+
+    def test_checked_raw_json_rejects_invalid_json(self):
+        value, parsed = checked_raw_json(b'{"type":"Topology","arcs":[]}')
+        self.assertEqual(parsed, {"type": "Topology", "arcs": []})
+        self.assertEqual(json.loads(ORJSONRenderer().render({"t": value})), {"t": parsed})
+        with self.assertRaises(ValueError):
+            checked_raw_json(b'not json')
+
+
+@unittest.skipIf(shapely is None, "shapely가 설치되지 않음")
+class RegionResolverTestCase(SimpleTestCase):
+    def setUp(self):
+        seoul = shapely.MultiPolygon([shapely.box(126, 37, 127, 38), shapely.box(125, 33, 125.5, 33.5)])
+        gyeonggi = shapely.box(127, 37, 128, 38)
+        self.resolver = RegionResolver(
+            [(1, "서울특별시", shapely.to_wkb(seoul)), (2, "경기도", shapely.to_wkb(gyeonggi))],
+            [
+                (10, "서울", "강남구", "역삼동"),
+                (11, "경기", "수원시 장안구", "연무동"),
+                (12, "경기", "성남시", "역삼동"),
+            ],
+        )
+
+    def test_resolve_sido_ids(self):
+        sido_ids = self.resolver.resolve_sido_ids(
+            [37.5, 37.5, 33.2, 37.5, 40.0, float("nan")],
+            [126.5, 127.5, 125.2, 127.0, 127.0, 127.0],
+        )
+        # 경계선 위의 점은 id가 작은 시도, 경계 밖/좌표 없음은 -1
+        self.assertEqual(sido_ids.tolist(), [1, 2, 1, 1, -1, -1])
+
+    def test_resolve_region_by_address_within_sido(self):
+        self.assertEqual(
+            self.resolver.resolve(37.5, 126.5, "서울특별시 강남구 테헤란로 1 (역삼동)"), (1, 10)
+        )
+        self.assertEqual(self.resolver.resolve(37.5, 127.5, "경기도 수원시 장안구 연무동 1"), (2, 11))
+        # 시군구가 맞지 않으면 지역 없음
+        self.assertEqual(self.resolver.resolve(37.5, 127.5, "경기도 수원시 연무동"), (2, None))
@@ -0,0 +1,286 @@
+# backend/locations/topojson.py
+"""
+GeoJSON FeatureCollection → TopoJSON 인코더 (NumPy, mapshaper 없이 동작)
+
+1. 좌표 양자화: bbox 기준 정수 격자(quantization × quantization)로 변환, 연속 중복점 제거
+2. 접점(junction) 탐지: 같은 좌표가 서로 다른 이웃 쌍과 함께 나타나면 접점
+   (인접한 시도가 공유하는 경계는 양쪽에서 같은 이웃 쌍을 가지므로 접점이 아님)
+3. 링/선을 접점에서 잘라 arc 생성, 정방향/역방향이 같은 arc는 하나로 합침 (역방향 참조는 ~index)
+4. arc 좌표는 델타 인코딩
+
+출력은 TopoJSON 명세(https://github.com/topojson/topojson-specification)를 따른다.
+"""
+import numpy as np
+
+DEFAULT_QUANTIZATION = 1_000_000
+
+
+class _Lines:
+    """인코딩할 선/링 목록 (양자화 전 좌표)"""
+
+    def __init__(self):
+        self.coordinates = []
+        self.closed = []
+
+    def add(self, coordinates, closed):
+        self.coordinates.append(np.asarray(coordinates, dtype=np.float64)[:, :2])
+        self.closed.append(closed)
+        return len(self.coordinates) - 1
+
+
+def _collect_geometry(geometry, lines, points):
+    """
+    GeoJSON geometry를 선/링 id로 치환한 중간 표현으로 변환
+
+    Returns:
+        dict | None: {"type", "lines"} 또는 {"type", "points"}
+    """
+    if not geometry:
+        return None
+    geometry_type = geometry.get('type')
+    coordinates = geometry.get('coordinates')
+
+    if geometry_type == 'Polygon':
+        return {'type': geometry_type, 'lines': [lines.add(ring, True) for ring in coordinates]}
+    if geometry_type == 'MultiPolygon':
+        return {
+            'type': geometry_type,
+            'lines': [[lines.add(ring, True) for ring in polygon] for polygon in coordinates],
+        }
+    if geometry_type == 'LineString':
+        return {'type': geometry_type, 'lines': lines.add(coordinates, False)}
+    if geometry_type == 'MultiLineString':
+        return {'type': geometry_type, 'lines': [lines.add(line, False) for line in coordinates]}
+    if geometry_type == 'Point':
+        points.append(np.asarray([coordinates[:2]], dtype=np.float64))
+        return {'type': geometry_type, 'points': len(points) - 1}
+    if geometry_type == 'MultiPoint':
+        points.append(np.asarray([c[:2] for c in coordinates], dtype=np.float64).reshape(-1, 2))
+        return {'type': geometry_type, 'points': len(points) - 1}
+    return None
+
+
+def _quantize(coordinates, translate, scale, closed):
+    """정수 격자 좌표로 변환 후 연속 중복점 제거 (링은 닫힌 형태 유지, 퇴화하면 None)"""
+    quantized = np.rint((coordinates - translate) / scale).astype(np.int64)
+    if len(quantized) == 0:
+        return None
+    keep = np.ones(len(quantized), dtype=bool)
+    keep[1:] = np.any(quantized[1:] != quantized[:-1], axis=1)
+    quantized = quantized[keep]
+
+    if closed:
+        if len(quantized) > 1 and np.array_equal(quantized[0], quantized[-1]):
+            quantized = quantized[:-1]
+        # 서로 다른 꼭짓점이 3개 미만이면 면적이 없는 링
+        if len(quantized) < 3:
+            return None
+        return quantized  # 열린 형태 (마지막 닫는 점 제외)
+    return quantized if len(quantized) >= 2 else None
+
+
+def _junction_keys(lines, keys):
+    """
+    접점 좌표 키 배열
+
+    Args:
+        lines: [(양자화 좌표, closed) 또는 None, ...]
+        keys: 각 선의 좌표 키 배열 목록
+    """
+    point_keys, prev_keys, next_keys, endpoints = [], [], [], []
+    for line, line_keys in zip(lines, keys):
+        if line is None:
+            continue
+        _, closed = line
+        if closed:
+            point_keys.append(line_keys)
+            prev_keys.append(np.roll(line_keys, 1))
+            next_keys.append(np.roll(line_keys, -1))
+        else:
+            # 선의 양 끝은 항상 접점, 내부 점만 이웃 비교
+            endpoints.extend([line_keys[0], line_keys[-1]])
+            point_keys.append(line_keys[1:-1])
+            prev_keys.append(line_keys[:-2])
+            next_keys.append(line_keys[2:])
+
+    if not point_keys:
+        return np.unique(np.asarray(endpoints, dtype=np.int64))
+
+    point_keys = np.concatenate(point_keys)
+    prev_keys = np.concatenate(prev_keys)
+    next_keys = np.concatenate(next_keys)
+    low = np.minimum(prev_keys, next_keys)
+    high = np.maximum(prev_keys, next_keys)
+
+    order = np.lexsort((high, low, point_keys))
+    point_keys, low, high = point_keys[order], low[order], high[order]
+    distinct = np.ones(len(point_keys), dtype=bool)
+    distinct[1:] = (
+        (point_keys[1:] != point_keys[:-1]) | (low[1:] != low[:-1]) | (high[1:] != high[:-1])
+    )
+    unique_keys, pair_counts = np.unique(point_keys[distinct], return_counts=True)
+    junctions = unique_keys[pair_counts > 1]
+    return np.union1d(junctions, np.asarray(endpoints, dtype=np.int64))
+
+
+def _rotate_to_min(ring, ring_keys):
+    start = int(np.argmin(ring_keys))
+    return np.roll(ring, -start, axis=0)
+
+
+class _ArcIndex:
+    """정방향/역방향 동일 arc를 하나로 합치는 arc 목록"""
+
+    def __init__(self):
+        self.arcs = []
+        self._index = {}
+
+    def add(self, arc, reversed_arc):
+        key = arc.tobytes()
+        if key in self._index:
+            return self._index[key]
+        reversed_key = reversed_arc.tobytes()
+        if reversed_key in self._index:
+            return ~self._index[reversed_key]
+        self._index[key] = len(self.arcs)
+        self.arcs.append(arc)
+        return len(self.arcs) - 1
+
+
+def _cut_line(line, line_keys, junctions, arc_index):
+    """선/링을 접점에서 잘라 arc 인덱스 목록 반환"""
+    coordinates, closed = line
+    is_junction = np.isin(line_keys, junctions)
+    positions = np.flatnonzero(is_junction)
+
+    if closed:
+        if len(positions) == 0:
+            # 접점 없는 링(섬 등): 시작점을 정규화하여 같은 링은 방향과 무관하게 한 arc로
+            forward = _rotate_to_min(coordinates, line_keys)
+            backward = _rotate_to_min(coordinates[::-1], line_keys[::-1])
+            forward = np.vstack([forward, forward[:1]])
+            backward = np.vstack([backward, backward[:1]])
+            return [arc_index.add(forward, backward)]
+
+        # 첫 접점에서 시작하도록 회전 후 닫기
+        start = positions[0]
+        coordinates = np.vstack([np.roll(coordinates, -start, axis=0), coordinates[start:start + 1]])
+        positions = np.append(positions - start, len(coordinates) - 1)
+
+    indices = []
+    for begin, end in zip(positions[:-1], positions[1:]):
+        arc = coordinates[begin:end + 1]
+        indices.append(arc_index.add(arc, arc[::-1]))
+    return indices
+
+
+def _delta_encode(arc):
+    encoded = arc.copy()
+    encoded[1:] -= arc[:-1]
+    return encoded.tolist()
+
+
+def encode_topology(feature_collection, object_name='collection', quantization=DEFAULT_QUANTIZATION):
+    """
+    GeoJSON FeatureCollection을 TopoJSON Topology로 변환
+
+    Args:
+        feature_collection: {"type": "FeatureCollection", "features": [...]}
+        object_name: objects 안의 GeometryCollection 이름
+        quantization: 축별 격자 수 (클수록 정밀, 델타 값이 커짐)
+
+    Returns:
+        dict: TopoJSON Topology
+    """
+    features = feature_collection.get('features', [])
+    lines = _Lines()
+    points = []
+    collected = [_collect_geometry(feature.get('geometry'), lines, points) for feature in features]
+
+    all_coordinates = lines.coordinates + points
+    all_coordinates = [c for c in all_coordinates if len(c)]
+    if all_coordinates:
+        stacked = np.concatenate(all_coordinates)
+        x0, y0 = stacked.min(axis=0)
+        x1, y1 = stacked.max(axis=0)
+    else:
+        x0 = y0 = x1 = y1 = 0.0
+
+    translate = np.array([x0, y0])
+    scale = np.array([
+        (x1 - x0) / (quantization - 1) if x1 > x0 else 1.0,
+        (y1 - y0) / (quantization - 1) if y1 > y0 else 1.0,
+    ])
+
+    quantized_lines = []
+    line_keys = []
+    for coordinates, closed in zip(lines.coordinates, lines.closed):
+        quantized = _quantize(coordinates, translate, scale, closed)
+        if quantized is None:
+            quantized_lines.append(None)
+            line_keys.append(None)
+            continue
+        quantized_lines.append((quantized, closed))
+        line_keys.append(quantized[:, 0] * quantization + quantized[:, 1])
+
+    junctions = _junction_keys(quantized_lines, line_keys)
+    arc_index = _ArcIndex()
+    line_arcs = [
+        _cut_line(line, keys, junctions, arc_index) if line is not None else None
+        for line, keys in zip(quantized_lines, line_keys)
+    ]
+
+    def rings_arcs(ring_ids):
+        # 외곽 링이 퇴화하면 폴리곤 전체를 버림, 내부 링은 개별적으로 버림
+        if not ring_ids or line_arcs[ring_ids[0]] is None:
+            return None
+        return [line_arcs[ring_id] for ring_id in ring_ids if line_arcs[ring_id] is not None]
+
+    geometries = []
+    for feature, geometry in zip(features, collected):
+        output = {'type': None}
+        if geometry is not None:
+            geometry_type = geometry['type']
+            if geometry_type == 'Polygon':
+                arcs = rings_arcs(geometry['lines'])
+                if arcs:
+                    output = {'type': 'Polygon', 'arcs': arcs}
+            elif geometry_type == 'MultiPolygon':
+                arcs = [a for a in (rings_arcs(polygon) for polygon in geometry['lines']) if a]
+                if arcs:
+                    output = {'type': 'MultiPolygon', 'arcs': arcs}
+            elif geometry_type == 'LineString':
+                if line_arcs[geometry['lines']] is not None:
+                    output = {'type': 'LineString', 'arcs': line_arcs[geometry['lines']]}
+            elif geometry_type == 'MultiLineString':
+                arcs = [line_arcs[i] for i in geometry['lines'] if line_arcs[i] is not None]
+                if arcs:
+                    output = {'type': 'MultiLineString', 'arcs': arcs}
+            else:
+                quantized = np.rint((points[geometry['points']] - translate) / scale).astype(np.int64)
+                if geometry_type == 'Point':
+                    output = {'type': 'Point', 'coordinates': quantized[0].tolist()}
+                else:
+                    output = {'type': 'MultiPoint', 'coordinates': quantized.tolist()}
+
+        if feature.get('id') is not None:
+            output['id'] = feature['id']
+        if feature.get('properties') is not None:
+            output['properties'] = feature['properties']
+        geometries.append(output)
+
+    return {
+        'type': 'Topology',
+        'bbox': [float(x0), float(y0), float(x1), float(y1)],
+        'transform': {
+            'scale': [float(scale[0]), float(scale[1])],
+            'translate': [float(x0), float(y0)],
+        },
+        'objects': {
+            object_name: {
+                'type': 'GeometryCollection',
+                'geometries': geometries,
+            },
+        },
+        'arcs': [_delta_encode(arc) for arc in arc_index.arcs],
+    }
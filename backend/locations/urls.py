@@ -1,11 +1,17 @@
 # backend/locations/urls.py
 from django.urls import path
-from rest_framework.routers import DefaultRouter
-from .views import SidoViewSet, topojson_sido_api, topojson_sido_status_api
+from rest_framework.routers import DefaultRouter, SimpleRouter
+from .views import BusStopViewSet, SidoViewSet, topojson_sido_api, topojson_sido_status_api
 
 router = DefaultRouter()
 router.register(r'sido', SidoViewSet, basename='sido')
 
+# 버스정류장 API는 시도/TopoJSON API와 별개로 /api/ 아래에 바로 포함 (config/urls.py)
+# /api/ 루트 뷰는 listings 라우터가 제공하므로 루트 뷰 없는 SimpleRouter 사용
+bus_stop_router = SimpleRouter()
+bus_stop_router.register(r'bus-stops', BusStopViewSet, basename='bus-stop')
+bus_stop_urlpatterns = bus_stop_router.urls
+
 urlpatterns = [
     # TopoJSON API 엔드포인트
     path('topojson/sido/', topojson_sido_api, name='topojson_sido'),
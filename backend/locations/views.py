@@ -1,44 +1,49 @@
 # backend/locations/views.py
 import hashlib
-import json
+import math
 from datetime import datetime
 from pathlib import Path
 
 from django.conf import settings
 from django.contrib.gis.db.models.functions import AsGeoJSON, Transform
-from django.db.models import Value
-from django.contrib.gis.db.models import GeometryField
-from django.db.models import Func
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.core.cache import cache
-from django.http import JsonResponse, HttpResponse
+from django.http import FileResponse, JsonResponse, HttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from .models import Sido
+from .caching import detail_cache_key, get_or_compute, list_cache_key
+from .geo import SimplifyPreserveTopology
+from .models import Sido, SidoGeometry, snap_simplify_tolerance
+from .nearby import (
+    DEFAULT_LIMIT,
+    DEFAULT_RADIUS_M,
+    MAX_LIMIT,
+    MAX_RADIUS_M,
+    find_nearby_bus_stops,
+)
+from .renderers import ORJSONRenderer, prerendered, render_cacheable
 from .serializers import SidoSerializer, DEFAULT_SIMPLIFY_TOLERANCE
-from .tasks import generate_sido_topojson, clear_topojson_cache
+from .tasks import topojson_etag, generate_sido_topojson, clear_topojson_cache
 from .signals import invalidate_topojson_cache_manually
 
-CACHE_DETAIL_PREFIX = "sido_detail_cache"
-CACHE_LIST_PREFIX = "sido_list_cache"
-CACHE_TIMEOUT_SECONDS = 60 * 60
-
-
-# ✅ PostGIS ST_SimplifyPreserveTopology 직접 래퍼
-class SimplifyPreserveTopology(Func):
-    function = "ST_SimplifyPreserveTopology"
-    output_field = GeometryField()
+# 미리 압축된 TopoJSON 파일 (선호 순서)
+TOPOJSON_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
 
 
 class SidoViewSet(viewsets.ModelViewSet):
     """
     시/도 단일 Feature 조회 + 전체 조회 + CRUD
+    (저장/삭제 후 응답 캐시 무효화와 TopoJSON 재생성은 signal에서 처리됨)
     """
     queryset = Sido.objects.all()
     serializer_class = SidoSerializer
     permission_classes = [AllowAny]
+    # geometry는 orjson.Fragment(DB GeoJSON 문자열)이므로 ORJSONRenderer로만 출력
+    renderer_classes = [ORJSONRenderer]
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -46,58 +51,51 @@ class SidoViewSet(viewsets.ModelViewSet):
             return queryset
         if self.action in {"list", "retrieve"}:
             tolerance = self._get_simplify_tolerance()
+            # 사전 계산된 단계(sido_geometries)를 우선 사용, 아직 없으면 즉석 변환/단순화
+            # (PostgreSQL COALESCE는 앞 인자가 NULL이 아니면 뒤 인자를 계산하지 않음)
+            precomputed = SidoGeometry.objects.filter(
+                sido=OuterRef("pk"), tolerance=tolerance
+            ).values("geojson")[:1]
             transformed = Transform("geom", 4326)
             if tolerance > 0:
                 transformed = SimplifyPreserveTopology(transformed, Value(tolerance))
-            queryset = queryset.annotate(geom_geojson=AsGeoJSON(transformed))
+            queryset = queryset.defer("geom").annotate(
+                geom_geojson=Coalesce(Subquery(precomputed), AsGeoJSON(transformed))
+            )
         return queryset
 
     def retrieve(self, request, *args, **kwargs):
         pk = kwargs.get("pk")
-        cache_key = self._build_cache_key(CACHE_DETAIL_PREFIX, request, identifier=pk)
-
-        data = self._get_from_cache(cache_key)
-        if data:
-            return Response(data)
+        try:
+            # "05"와 "5"가 같은 세대 번호를 쓰도록 정규화
+            pk = int(pk)
+        except (TypeError, ValueError):
+            pass
+        cache_key = detail_cache_key(pk, self._query_params_signature(request))
 
-        instance = self.get_object()
-        serializer = self.get_serializer(instance, context={"request": request})
-        data = serializer.data
+        def compute():
+            instance = self.get_object()
+            serializer = self.get_serializer(instance, context={"request": request})
+            return render_cacheable(serializer.data)
 
-        self._set_cache(cache_key, data)
-        return Response(data)
+        return Response(prerendered(get_or_compute(cache_key, compute)))
 
     def list(self, request, *args, **kwargs):
-        cache_key = self._build_cache_key(CACHE_LIST_PREFIX, request)
-
-        data = self._get_from_cache(cache_key)
-        if data:
-            return Response(data)
-
-        queryset = self.filter_queryset(self.get_queryset())
-        items = list(queryset)
-        serializer = self.get_serializer(items, many=True, context={"request": request})
-        payload = {
-            "type": "FeatureCollection",
-            "features": serializer.data,
-            "total_count": len(items),
-        }
-
-        self._set_cache(cache_key, payload)
-        return Response(payload)
-
-    # ✅ 캐시 관련
-    def _get_from_cache(self, key):
-        from django.core.cache import cache
-        return cache.get(key)
+        cache_key = list_cache_key(self._query_params_signature(request))
 
-    def _set_cache(self, key, value):
-        from django.core.cache import cache
-        cache.set(key, value, CACHE_TIMEOUT_SECONDS)
+        def compute():
+            queryset = self.filter_queryset(self.get_queryset())
+            items = list(queryset)
+            serializer = self.get_serializer(items, many=True, context={"request": request})
+            return render_cacheable({
+                "type": "FeatureCollection",
+                "features": serializer.data,
+                "total_count": len(items),
+            })
 
-    def clear_cache(self):
-        from django.core.cache import cache
-        cache.clear()
+        # 만료 시 동시 요청이 모두 DB를 조회하지 않도록 한 요청만 재계산 (locations.caching)
+        # 캐시에는 렌더링된 바이트를 저장하여 응답마다 다시 인코딩하지 않음
+        return Response(prerendered(get_or_compute(cache_key, compute)))
 
     # ✅ simplify tolerance 파라미터 파싱
     def _get_simplify_tolerance(self, request=None):
@@ -115,6 +113,10 @@ class SidoViewSet(viewsets.ModelViewSet):
                 tolerance = max(float(raw_value), 0.0)
             except (TypeError, ValueError):
                 tolerance = DEFAULT_SIMPLIFY_TOLERANCE
+            if math.isnan(tolerance):
+                tolerance = DEFAULT_SIMPLIFY_TOLERANCE
+        # 임의의 값 대신 사전 계산된 단계로 맞춤
+        tolerance = snap_simplify_tolerance(tolerance)
         self._simplify_tolerance = tolerance
         return tolerance
 
@@ -123,42 +125,13 @@ class SidoViewSet(viewsets.ModelViewSet):
             return "no_params"
         items = []
         for key, values in request.query_params.lists():
+            if key == "simplify":
+                # 같은 단계로 맞춰지는 값은 같은 캐시를 사용
+                values = [str(self._get_simplify_tolerance(request))]
             items.append(f"{key}={'|'.join(sorted(values))}")
         serialized = "&".join(sorted(items))
         return hashlib.md5(serialized.encode("utf-8")).hexdigest()
 
-    def _build_cache_key(self, prefix, request, identifier=None):
-        parts = [prefix]
-        if identifier is not None:
-            parts.append(f"id_{identifier}")
-        parts.append(f"params_{self._query_params_signature(request)}")
-        return "_".join(parts)
-
-    # ✅ CRUD 후 캐시 무효화
-    def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
-        self.clear_cache()
-        # TopoJSON 재생성은 signal에서 처리됨
-        return response
-
-    def update(self, request, *args, **kwargs):
-        response = super().update(request, *args, **kwargs)
-        self.clear_cache()
-        # TopoJSON 재생성은 signal에서 처리됨
-        return response
-
-    def partial_update(self, request, *args, **kwargs):
-        response = super().partial_update(request, *args, **kwargs)
-        self.clear_cache()
-        # TopoJSON 재생성은 signal에서 처리됨
-        return response
-
-    def destroy(self, request, *args, **kwargs):
-        response = super().destroy(request, *args, **kwargs)
-        self.clear_cache()
-        # TopoJSON 재생성은 signal에서 처리됨
-        return response
-
     @action(detail=False, methods=['post'], url_path='regenerate-topojson')
     def regenerate_topojson(self, request):
         """
@@ -174,10 +147,124 @@ class SidoViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class BusStopViewSet(viewsets.GenericViewSet):
+    """
+    버스정류장 조회
+
+    - nearby: 지점 주변 반경 내 정류장 (geohash 셀 캐시)
+    """
+    permission_classes = [AllowAny]
+
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """
+        반경 내 버스정류장 (가까운 순)
+        GET /api/bus-stops/nearby/?lat=37.4979&lng=127.0276&radius=500&limit=20
+        """
+        params = request.query_params
+        try:
+            lat = float(params['lat'])
+            lng = float(params['lng'])
+        except (KeyError, ValueError):
+            return Response(
+                {'error': 'lat and lng are required numbers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return Response(
+                {'error': 'lat/lng out of range'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            radius = int(params.get('radius', DEFAULT_RADIUS_M))
+            limit = int(params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            return Response(
+                {'error': 'radius and limit must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 0 < radius <= MAX_RADIUS_M:
+            return Response(
+                {'error': f'radius must be between 1 and {MAX_RADIUS_M}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = min(max(limit, 1), MAX_LIMIT)
+
+        stops = find_nearby_bus_stops(lat, lng, radius_m=radius, limit=limit)
+        return Response({
+            'count': len(stops),
+            'radius': radius,
+            'stops': stops,
+        })
+
+
+def _accept_encoding_qvalues(accept_encoding):
+    """
+    Accept-Encoding 헤더 → {인코딩: q값} ("*"는 명시되지 않은 인코딩에 적용)
+    q값을 해석할 수 없으면 0으로 간주
+    """
+    qvalues = {}
+    for token in accept_encoding.lower().split(','):
+        encoding, _, params = token.partition(';')
+        encoding = encoding.strip()
+        if not encoding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        qvalues[encoding] = q
+    return qvalues
+
+
+def _topojson_variant(file_path, accept_encoding):
+    """
+    Accept-Encoding에 맞는 미리 압축된 파일 선택
+    (q값이 높은 순, 같으면 TOPOJSON_ENCODINGS 순서, q=0인 인코딩은 제외)
+
+    Returns:
+        tuple: (파일 경로, Content-Encoding 또는 None)
+    """
+    qvalues = _accept_encoding_qvalues(accept_encoding)
+    wildcard = qvalues.get('*', 0.0)
+    candidates = []
+    for preference, (encoding, suffix) in enumerate(TOPOJSON_ENCODINGS):
+        q = qvalues.get(encoding, wildcard)
+        if q > 0:
+            candidates.append((-q, preference, encoding, suffix))
+    for _, _, encoding, suffix in sorted(candidates):
+        candidate = file_path.with_name(file_path.name + suffix)
+        if candidate.exists():
+            return candidate, encoding
+    return file_path, None
+
+
+def _etag_matches(if_none_match, etag):
+    """If-None-Match의 태그 중 하나라도 같은 내용(인코딩 무관)이면 True"""
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag.strip('"').split('-')[0] == etag:
+            return True
+    return False
+
+
 def topojson_sido_api(request):
     """
     TopoJSON API 엔드포인트
     GET /api/topojson/sido
+
+    - 디스크의 파일을 그대로 전송 (파싱/재인코딩 없음), 압축본(.br/.gz)이 있으면 우선 사용
+    - 메타데이터는 응답 헤더(X-TopoJSON-*)로 전달
+    - ETag / If-None-Match 지원 (내용 해시 기준)
     """
     try:
         # 1. 캐시에서 상태 확인
@@ -203,30 +290,39 @@ def topojson_sido_api(request):
                 'message': 'TopoJSON 파일을 찾을 수 없습니다.',
                 'ready': False
             }, status=503)
-        
-        # 3. 파일 읽기 및 반환
-        try:
-            with open(file_path_obj, 'r', encoding='utf-8') as f:
-                topojson_data = json.load(f)
-            
-            # 메타데이터 추가
-            response_data = {
-                'status': 'success',
-                'ready': True,
-                'generated_at': cache.get('sido_topojson_time'),
-                'feature_count': cache.get('sido_topojson_feature_count', 0),
-                'file_path': str(file_path),
-                'data': topojson_data
-            }
-            
-            return JsonResponse(response_data, status=200)
-            
-        except (json.JSONDecodeError, IOError) as e:
-            return JsonResponse({
-                'status': 'error',
-                'message': f'TopoJSON 파일 읽기 오류: {str(e)}',
-                'ready': False
-            }, status=500)
+
+        etag = cache.get('sido_topojson_etag')
+        if not etag:
+            # 캐시가 비워진 경우 한 번만 해시를 다시 계산
+            etag = topojson_etag(file_path_obj)
+            cache.set('sido_topojson_etag', etag, timeout=None)
+
+        # 3. 조건부 요청: 내용이 같으면 본문 없이 304
+        variant_path, encoding = _topojson_variant(
+            file_path_obj, request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        tagged = f'"{etag}-{encoding}"' if encoding else f'"{etag}"'
+        if _etag_matches(request.META.get('HTTP_IF_NONE_MATCH', ''), etag):
+            response = HttpResponse(status=304)
+        else:
+            # 4. 파일 그대로 스트리밍
+            try:
+                response = FileResponse(open(variant_path, 'rb'), content_type='application/json')
+            except IOError as e:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f'TopoJSON 파일 읽기 오류: {str(e)}',
+                    'ready': False
+                }, status=500)
+            if encoding:
+                response['Content-Encoding'] = encoding
+
+        response['ETag'] = tagged
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = 'no-cache'
+        response['X-TopoJSON-Generated-At'] = cache.get('sido_topojson_time') or ''
+        response['X-TopoJSON-Feature-Count'] = str(cache.get('sido_topojson_feature_count', 0))
+        return response
         
     except Exception as e:
         return JsonResponse({